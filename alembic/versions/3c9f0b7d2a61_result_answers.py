@@ -0,0 +1,74 @@
+"""result_answers
+
+Revision ID: 3c9f0b7d2a61
+Revises: ee782e3fd6f3
+Create Date: 2026-10-18 14:02:37.514920
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9f0b7d2a61"
+down_revision: Union[str, None] = "ee782e3fd6f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS_AHEAD = 2
+
+
+def _month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    year, month_index = divmod(month.month - 1 + months, 12)
+
+    return month.replace(year=month.year + year, month=month_index + 1)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "result_answers",
+        sa.Column("result_id", sa.UUID(), nullable=False),
+        sa.Column("question_id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("question_position", sa.SmallInteger(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("company_id", sa.UUID(), nullable=False),
+        sa.Column("quiz_id", sa.UUID(), nullable=False),
+        sa.Column("user_answer", sa.ARRAY(sa.String(length=255)), nullable=True),
+        sa.Column("is_correct", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("result_id", "question_id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index(
+        "ix_result_answers_company_id_created_at",
+        "result_answers",
+        ["company_id", "created_at"],
+    )
+    op.create_index(
+        "ix_result_answers_user_id_created_at",
+        "result_answers",
+        ["user_id", "created_at"],
+    )
+
+    current_month = _month_start(datetime.now(timezone.utc))
+    for offset in range(PARTITIONS_AHEAD + 1):
+        month = _add_months(current_month, offset)
+        op.execute(
+            f'CREATE TABLE "result_answers_y{month.year:04d}m{month.month:02d}" '
+            f"PARTITION OF result_answers "
+            f"FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{_add_months(month, 1).isoformat()}')"
+        )
+
+
+def downgrade() -> None:
+    # dropping the parent drops every attached partition with it
+    op.drop_table("result_answers")
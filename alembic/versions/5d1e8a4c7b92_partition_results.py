@@ -0,0 +1,167 @@
+"""partition_results
+
+Revision ID: 5d1e8a4c7b92
+Revises: 3c9f0b7d2a61
+Create Date: 2026-10-18 15:21:09.640183
+
+Copies every row of results into the new partitioned table in one transaction,
+which holds an exclusive lock on results until it commits. Submissions fail
+meanwhile, so run it in a maintenance window sized to the results table.
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d1e8a4c7b92"
+down_revision: Union[str, None] = "3c9f0b7d2a61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS_AHEAD = 2
+RESULT_COLUMNS = (
+    "id, created_at, updated_at, quiz_id, score, total_questions, "
+    "correct_answers, company_member_id"
+)
+
+
+def _month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    year, month_index = divmod(month.month - 1 + months, 12)
+
+    return month.replace(year=month.year + year, month=month_index + 1)
+
+
+def _create_results_table(*constraints, created_at_nullable=False, **kwargs) -> None:
+    op.create_table(
+        "results",
+        sa.Column("quiz_id", sa.UUID(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("total_questions", sa.Integer(), nullable=False),
+        sa.Column("correct_answers", sa.Integer(), nullable=True),
+        sa.Column("company_member_id", sa.UUID(), nullable=True),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=created_at_nullable,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["company_member_id"], ["company_members.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["quiz_id"], ["quizzes.id"], ondelete="CASCADE"),
+        *constraints,
+        **kwargs,
+    )
+    op.create_index(
+        "ix_results_company_member_id_quiz_id_created_at",
+        "results",
+        ["company_member_id", "quiz_id", "created_at"],
+        postgresql_include=["score", "correct_answers", "total_questions"],
+    )
+
+
+def _rename_legacy_results(*indexes: str) -> None:
+    op.rename_table("results", "results_legacy")
+    for index in indexes:
+        op.execute(f"ALTER INDEX {index} RENAME TO results_legacy_{index[8:]}")
+    op.execute(
+        "ALTER INDEX ix_results_company_member_id_quiz_id_created_at "
+        "RENAME TO ix_results_legacy_company_member_id_quiz_id_created_at"
+    )
+
+
+def upgrade() -> None:
+    _rename_legacy_results("results_pkey", "results_id_key")
+    _create_results_table(
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+
+    # one partition per month from the oldest result up to PARTITIONS_AHEAD
+    oldest = op.get_bind().scalar(sa.text("SELECT min(created_at) FROM results_legacy"))
+    current_month = _month_start(datetime.now(timezone.utc))
+    month = _month_start(oldest) if oldest else current_month
+    while month <= _add_months(current_month, PARTITIONS_AHEAD):
+        op.execute(
+            f'CREATE TABLE "results_y{month.year:04d}m{month.month:02d}" '
+            f"PARTITION OF results "
+            f"FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+
+    op.execute(
+        f"INSERT INTO results ({RESULT_COLUMNS}) "
+        f"SELECT id, coalesce(created_at, updated_at, now()), updated_at, quiz_id, "
+        f"score, total_questions, correct_answers, company_member_id "
+        f"FROM results_legacy"
+    )
+    op.drop_table("results_legacy")
+
+    op.create_table(
+        "result_rollups",
+        sa.Column("company_member_id", sa.UUID(), nullable=False),
+        sa.Column("quiz_id", sa.UUID(), nullable=False),
+        sa.Column("month", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("score_sum", sa.Float(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("correct_answers", sa.Integer(), nullable=False),
+        sa.Column("total_questions", sa.Integer(), nullable=False),
+        sa.Column("last_attempt_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["company_member_id"], ["company_members.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["quiz_id"], ["quizzes.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("id"),
+    )
+    op.create_index(
+        "ix_result_rollups_member_quiz_month",
+        "result_rollups",
+        ["company_member_id", "quiz_id", "month"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_result_rollups_member_quiz_month", table_name="result_rollups")
+    op.drop_table("result_rollups")
+
+    _rename_legacy_results("results_pkey")
+    _create_results_table(sa.PrimaryKeyConstraint("id"), created_at_nullable=True)
+    op.create_unique_constraint("results_id_key", "results", ["id"])
+    # rows of detached partitions are not brought back
+    op.execute(
+        f"INSERT INTO results ({RESULT_COLUMNS}) "
+        f"SELECT {RESULT_COLUMNS} FROM results_legacy"
+    )
+    op.drop_table("results_legacy")
@@ -0,0 +1,42 @@
+"""result_rollups_detached
+
+Revision ID: 6d2f8b4e0c57
+Revises: 9e3a7c5b1d28
+Create Date: 2026-10-20 11:38:09.274551
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6d2f8b4e0c57"
+down_revision: Union[str, None] = "9e3a7c5b1d28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "result_rollups",
+        sa.Column("detached", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    # months whose results partition is no longer attached to results
+    op.execute(
+        "UPDATE result_rollups SET detached = true WHERE NOT EXISTS ("
+        "SELECT 1 FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = 'results' AND child.relname = 'results_' || "
+        "to_char(result_rollups.month AT TIME ZONE 'UTC', '\"y\"YYYY\"m\"MM'))"
+    )
+    # readers no longer look up the last rolled-up month
+    op.drop_index("ix_result_rollups_month", table_name="result_rollups")
+
+
+def downgrade() -> None:
+    op.create_index("ix_result_rollups_month", "result_rollups", ["month"])
+    op.drop_column("result_rollups", "detached")
@@ -0,0 +1,59 @@
+"""keyset_pagination_indexes
+
+Revision ID: 7634655b20db
+Revises: a30151d1ee04
+Create Date: 2026-10-18 11:02:17.640913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7634655b20db"
+down_revision: Union[str, None] = "a30151d1ee04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_created_at_id",
+            "users",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_companies_created_at_id",
+            "companies",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_quizzes_company_id_created_at_id",
+            "quizzes",
+            ["company_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_user_notifications_unread_user_id_created_at_id",
+            "user_notifications",
+            ["user_id", "created_at", "id"],
+            postgresql_where=sa.text("is_read = false"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_user_notifications_unread_user_id_created_at_id",
+        table_name="user_notifications",
+    )
+    op.drop_index("ix_quizzes_company_id_created_at_id", table_name="quizzes")
+    op.drop_index("ix_companies_created_at_id", table_name="companies")
+    op.drop_index("ix_users_created_at_id", table_name="users")
@@ -0,0 +1,51 @@
+"""quiz_reminder_notifications
+
+Revision ID: 8a2f6c3e9d14
+Revises: 5d1e8a4c7b92
+Create Date: 2026-10-18 16:48:52.117406
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8a2f6c3e9d14"
+down_revision: Union[str, None] = "5d1e8a4c7b92"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("user_notifications", sa.Column("quiz_id", sa.UUID(), nullable=True))
+    op.create_foreign_key(
+        "user_notifications_quiz_id_fkey",
+        "user_notifications",
+        "quizzes",
+        ["quiz_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_user_notifications_user_id_quiz_id_created_at",
+            "user_notifications",
+            ["user_id", "quiz_id", "created_at"],
+            postgresql_where=sa.text("quiz_id IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_user_notifications_user_id_quiz_id_created_at",
+        table_name="user_notifications",
+    )
+    op.drop_constraint(
+        "user_notifications_quiz_id_fkey", "user_notifications", type_="foreignkey"
+    )
+    op.drop_column("user_notifications", "quiz_id")
@@ -0,0 +1,47 @@
+"""result_answers_question_text
+
+Revision ID: 9e3a7c5b1d28
+Revises: f2b9c6d4a813
+Create Date: 2026-10-20 10:12:44.608315
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e3a7c5b1d28"
+down_revision: Union[str, None] = "f2b9c6d4a813"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# detached partitions are plain tables and need the column to be attached back
+DETACHED_PARTITIONS = sa.text(
+    "SELECT relname FROM pg_class "
+    "WHERE relkind = 'r' AND relname ~ '^result_answers_y[0-9]{4}m[0-9]{2}$' "
+    "AND NOT relispartition"
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "result_answers", sa.Column("question_text", sa.String(1000), nullable=True)
+    )
+    for (table_name,) in op.get_bind().execute(DETACHED_PARTITIONS):
+        op.add_column(
+            table_name, sa.Column("question_text", sa.String(1000), nullable=True)
+        )
+    # answers of questions that were since replaced or deleted stay NULL
+    op.execute(
+        "UPDATE result_answers SET question_text = questions.question_text "
+        "FROM questions WHERE questions.id = result_answers.question_id"
+    )
+
+
+def downgrade() -> None:
+    for (table_name,) in op.get_bind().execute(DETACHED_PARTITIONS):
+        op.drop_column(table_name, "question_text")
+    op.drop_column("result_answers", "question_text")
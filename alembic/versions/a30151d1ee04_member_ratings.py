@@ -0,0 +1,71 @@
+"""member_ratings
+
+Revision ID: a30151d1ee04
+Revises: 4b351f96eab3
+Create Date: 2026-10-18 10:12:41.208335
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a30151d1ee04"
+down_revision: Union[str, None] = "4b351f96eab3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "member_ratings",
+        sa.Column("company_member_id", sa.UUID(), nullable=False),
+        sa.Column("quiz_id", sa.UUID(), nullable=True),
+        sa.Column("score_sum", sa.Float(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("correct_answers", sa.Integer(), nullable=False),
+        sa.Column("total_questions", sa.Integer(), nullable=False),
+        sa.Column("last_attempt_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["company_member_id"], ["company_members.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["quiz_id"], ["quizzes.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("id"),
+    )
+    op.create_index(
+        "ix_member_ratings_member_total",
+        "member_ratings",
+        ["company_member_id"],
+        unique=True,
+        postgresql_where=sa.text("quiz_id IS NULL"),
+    )
+    op.create_index(
+        "ix_member_ratings_member_quiz",
+        "member_ratings",
+        ["company_member_id", "quiz_id"],
+        unique=True,
+        postgresql_where=sa.text("quiz_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_member_ratings_member_quiz", table_name="member_ratings")
+    op.drop_index("ix_member_ratings_member_total", table_name="member_ratings")
+    op.drop_table("member_ratings")
@@ -0,0 +1,84 @@
+"""notification_messages
+
+Revision ID: b7d4e1f9a023
+Revises: 8a2f6c3e9d14
+Create Date: 2026-10-18 19:12:40.532817
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d4e1f9a023"
+down_revision: Union[str, None] = "8a2f6c3e9d14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_messages",
+        sa.Column("template", sa.String(length=50), nullable=False),
+        sa.Column("params", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("id"),
+    )
+    op.add_column(
+        "user_notifications", sa.Column("message_id", sa.UUID(), nullable=True)
+    )
+    op.create_foreign_key(
+        "user_notifications_message_id_fkey",
+        "user_notifications",
+        "notification_messages",
+        ["message_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.alter_column(
+        "user_notifications", "text", existing_type=sa.VARCHAR(), nullable=True
+    )
+    # reminders are rendered from the quiz name on read
+    op.execute("UPDATE user_notifications SET text = NULL WHERE quiz_id IS NOT NULL")
+
+
+def downgrade() -> None:
+    op.execute(
+        "UPDATE user_notifications AS n "
+        "SET text = format('You should complete %s quiz again!', q.name) "
+        "FROM quizzes AS q "
+        "WHERE n.text IS NULL AND n.message_id IS NULL AND q.id = n.quiz_id"
+    )
+    op.execute(
+        "UPDATE user_notifications AS n "
+        "SET text = format("
+        "'In %s company, a new quiz ''%s'' has been created. Take it now!', "
+        "m.params ->> 'company_name', m.params ->> 'quiz_name') "
+        "FROM notification_messages AS m "
+        "WHERE n.text IS NULL AND m.id = n.message_id AND m.template = 'new_quiz'"
+    )
+    op.alter_column(
+        "user_notifications", "text", existing_type=sa.VARCHAR(), nullable=False
+    )
+    op.drop_constraint(
+        "user_notifications_message_id_fkey", "user_notifications", type_="foreignkey"
+    )
+    op.drop_column("user_notifications", "message_id")
+    op.drop_table("notification_messages")
@@ -0,0 +1,72 @@
+"""created_at_not_null
+
+Revision ID: c4e8a1d7f250
+Revises: b7d4e1f9a023
+Create Date: 2026-10-19 09:41:05.218734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e8a1d7f250"
+down_revision: Union[str, None] = "b7d4e1f9a023"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    "users",
+    "companies",
+    "actions",
+    "company_members",
+    "quizzes",
+    "questions",
+    "user_notifications",
+    "member_ratings",
+    "result_rollups",
+    "notification_messages",
+)
+
+
+def upgrade() -> None:
+    for table_name in TABLES:
+        op.execute(
+            f"UPDATE {table_name} SET created_at = COALESCE(updated_at, now()) "
+            "WHERE created_at IS NULL"
+        )
+
+    # every statement commits on its own: VALIDATE scans the table under a
+    # SHARE UPDATE EXCLUSIVE lock only, and the validated check lets SET NOT
+    # NULL skip its scan, so the ACCESS EXCLUSIVE lock is held only briefly
+    with op.get_context().autocommit_block():
+        for table_name in TABLES:
+            op.execute(
+                f"ALTER TABLE {table_name} "
+                f"ADD CONSTRAINT {table_name}_created_at_not_null "
+                "CHECK (created_at IS NOT NULL) NOT VALID"
+            )
+            op.execute(
+                f"ALTER TABLE {table_name} "
+                f"VALIDATE CONSTRAINT {table_name}_created_at_not_null"
+            )
+            op.alter_column(
+                table_name,
+                "created_at",
+                existing_type=sa.DateTime(timezone=True),
+                nullable=False,
+            )
+            op.drop_constraint(f"{table_name}_created_at_not_null", table_name)
+
+
+def downgrade() -> None:
+    for table_name in reversed(TABLES):
+        op.alter_column(
+            table_name,
+            "created_at",
+            existing_type=sa.DateTime(timezone=True),
+            nullable=True,
+        )
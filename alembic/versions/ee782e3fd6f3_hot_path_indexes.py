@@ -0,0 +1,202 @@
+"""hot_path_indexes
+
+Revision ID: ee782e3fd6f3
+Revises: 7634655b20db
+Create Date: 2026-10-18 12:41:05.318277
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "ee782e3fd6f3"
+down_revision: Union[str, None] = "7634655b20db"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    "ix_results_company_member_id_quiz_id_created_at",
+    "uq_company_members_user_id_company_id",
+    "ix_company_members_company_id",
+    "ix_actions_company_id_status",
+    "ix_actions_user_id_status",
+    "ix_quizzes_company_id_name",
+    "ix_questions_quiz_id",
+)
+MEMBER_RATING_COLUMNS = (
+    "id, company_member_id, quiz_id, score_sum, attempts, correct_answers, "
+    "total_questions, last_attempt_at"
+)
+
+
+def _merge_duplicate_members() -> None:
+    # the highest role wins, then the oldest membership; results move to the
+    # kept row and its member_ratings are recomputed from them
+    op.execute(
+        "CREATE TEMPORARY TABLE company_member_duplicates ON COMMIT DROP AS "
+        "SELECT id, keep_id FROM ("
+        "SELECT id, first_value(id) OVER ("
+        "PARTITION BY user_id, company_id "
+        "ORDER BY role = 'OWNER' DESC, role = 'ADMIN' DESC, created_at, id"
+        ") AS keep_id FROM company_members"
+        ") AS members WHERE id <> keep_id"
+    )
+    op.execute(
+        "UPDATE results SET company_member_id = d.keep_id "
+        "FROM company_member_duplicates AS d WHERE results.company_member_id = d.id"
+    )
+    op.execute(
+        "DELETE FROM member_ratings WHERE company_member_id IN "
+        "(SELECT keep_id FROM company_member_duplicates)"
+    )
+    for quiz_column, group_by in (
+        ("NULL::uuid", "company_member_id"),
+        ("quiz_id", "company_member_id, quiz_id"),
+    ):
+        op.execute(
+            f"INSERT INTO member_ratings ({MEMBER_RATING_COLUMNS}) "
+            f"SELECT gen_random_uuid(), company_member_id, {quiz_column}, "
+            "sum(score), count(id), coalesce(sum(correct_answers), 0), "
+            "sum(total_questions), max(created_at) FROM results "
+            "WHERE company_member_id IN "
+            "(SELECT DISTINCT keep_id FROM company_member_duplicates) "
+            f"GROUP BY {group_by}"
+        )
+    op.execute(
+        "DELETE FROM company_members WHERE id IN "
+        "(SELECT id FROM company_member_duplicates)"
+    )
+
+
+def _drop_invalid_indexes() -> None:
+    # a failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind
+    invalid_indexes = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname, t.relname FROM pg_index AS i "
+            "JOIN pg_class AS c ON c.oid = i.indexrelid "
+            "JOIN pg_class AS t ON t.oid = i.indrelid "
+            "WHERE NOT i.indisvalid AND c.relname = ANY(:names)"
+        ),
+        {"names": list(INDEXES)},
+    )
+    for index_name, table_name in invalid_indexes.all():
+        op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    _merge_duplicate_members()
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        _drop_invalid_indexes()
+        op.create_index(
+            "ix_results_company_member_id_quiz_id_created_at",
+            "results",
+            ["company_member_id", "quiz_id", "created_at"],
+            postgresql_include=["score", "correct_answers", "total_questions"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "uq_company_members_user_id_company_id",
+            "company_members",
+            ["user_id", "company_id"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_company_members_company_id",
+            "company_members",
+            ["company_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_actions_company_id_status",
+            "actions",
+            ["company_id", "status"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_actions_user_id_status",
+            "actions",
+            ["user_id", "status"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_quizzes_company_id_name",
+            "quizzes",
+            ["company_id", "name"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_questions_quiz_id",
+            "questions",
+            ["quiz_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+    op.execute(
+        "ALTER TABLE company_members "
+        "ADD CONSTRAINT uq_company_members_user_id_company_id "
+        "UNIQUE USING INDEX uq_company_members_user_id_company_id"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE company_members "
+        "DROP CONSTRAINT IF EXISTS uq_company_members_user_id_company_id"
+    )
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "uq_company_members_user_id_company_id",
+            table_name="company_members",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_questions_quiz_id",
+            table_name="questions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_quizzes_company_id_name",
+            table_name="quizzes",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_actions_user_id_status",
+            table_name="actions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_actions_company_id_status",
+            table_name="actions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_company_members_company_id",
+            table_name="company_members",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_results_company_member_id_quiz_id_created_at",
+            table_name="results",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
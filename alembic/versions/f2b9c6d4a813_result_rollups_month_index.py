@@ -0,0 +1,26 @@
+"""result_rollups_month_index
+
+Revision ID: f2b9c6d4a813
+Revises: c4e8a1d7f250
+Create Date: 2026-10-19 14:07:52.381946
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b9c6d4a813"
+down_revision: Union[str, None] = "c4e8a1d7f250"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_result_rollups_month", "result_rollups", ["month"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_result_rollups_month", table_name="result_rollups")
@@ -24,6 +24,10 @@ class Settings(BaseSettings):
     TOKEN_EXPIRATION: int
     ISSUER: str
 
+    AUTH0_JWKS_TTL: int = 600
+    AUTH0_JWKS_REFRESH_MARGIN: int = 60
+    AUTH0_JWKS_MIN_REFETCH_INTERVAL: int = 10
+
     API_ALGORITHM: str
     API_AUDIENCE: str
     API_SECRET: str
@@ -31,6 +35,41 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str
     CELERY_RESULT_BACKEND: str
 
+    COUNT_CACHE_TTL: int = 60
+    COUNT_ESTIMATE_THRESHOLD: int = 100000
+
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+
+    USER_CACHE_TTL: int = 60
+    USER_CACHE_LOCAL_TTL: int = 5
+    USER_CACHE_SIZE: int = 1024
+    CACHE_INVALIDATION_RETRY_SECONDS: int = 1
+
+    ANSWER_KEY_CACHE_TTL: int = 3600
+    ANSWER_KEY_CACHE_LOCAL_TTL: int = 30
+    ANSWER_KEY_CACHE_SIZE: int = 256
+
+    ANSWER_DETAIL_FLUSH_INTERVAL: float = 0.5
+    ANSWER_DETAIL_BATCH_SIZE: int = 200
+    ANSWER_DETAIL_MAX_PENDING: int = 10000
+
+    RESULT_ANSWERS_FLUSH_INTERVAL: float = 1.0
+    RESULT_ANSWERS_BATCH_SIZE: int = 2000
+    RESULT_ANSWERS_MAX_PENDING: int = 100000
+    RESULT_ANSWERS_PARTITIONS_AHEAD: int = 2
+    RESULT_ANSWERS_RETENTION_MONTHS: int = 24
+
+    RESULTS_PARTITIONS_AHEAD: int = 2
+    RESULTS_HOT_MONTHS: int = 12
+    RESULTS_DETACH_ROLLED_UP: bool = False
+
+    REMINDER_SHARDS: int = 32
+    REMINDER_WINDOW_SECONDS: int = 3600
+    QUIZ_DUE_POLL_SECONDS: int = 60
+    QUIZ_DUE_BATCH_SIZE: int = 500
+    QUIZ_REMINDER_REPEAT_HOURS: int = 24
+
     model_config = SettingsConfigDict(
         env_file=find_dotenv(filename=".env", usecwd=True),
         env_file_encoding="utf-8",
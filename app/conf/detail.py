@@ -34,6 +34,7 @@ class Messages(Enum):
     YOU_CAN_NOT_INVITE_YOUR_SELF = "You can't invite yourself"
     BAD_REQUEST = "Bad request"
     INVALID_FILE_TYPE = "Invalid file type"
+    INVALID_CURSOR = "Invalid cursor"
 
     def __str__(self):
         return self.value
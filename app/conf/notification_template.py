@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class NotificationTemplate(str, Enum):
+    NEW_QUIZ = "new_quiz"
+    QUIZ_REMINDER = "quiz_reminder"
+
+
+NOTIFICATION_TEMPLATES = {
+    NotificationTemplate.NEW_QUIZ: "In {company_name} company, a new quiz '{quiz_name}' has been created. Take it now!",
+    NotificationTemplate.QUIZ_REMINDER: "You should complete {quiz_name} quiz again!",
+}
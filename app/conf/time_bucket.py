@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class TimeBucket(str, Enum):
+    DAY = "day"
+    WEEK = "week"
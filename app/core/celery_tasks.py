@@ -1,50 +1,170 @@
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
 
+from app.conf.config import settings
 from app.db.connection import get_session
-from app.models.company_member import CompanyMember
-from app.models.user_notification_model import UserNotification
-from app.models.quiz_model import Quiz
+from app.models.result_answer_model import ResultAnswer
 from app.models.result_model import Result
-from app.models.user_model import User
+from app.repository.notification_repository import NotificationRepository
+from app.repository.partition_repository import (
+    PartitionRepository,
+    add_months,
+    month_start,
+)
+from app.repository.result_repository import ResultRepository
+from app.services.redis_service import redis_service
+from app.utils.call_services import get_result_service
+from app.utils.quiz_due import DueQuiz, quiz_due_index
+from app.utils.redis_keys import REMINDER_RUN_TTL, reminder_run_key
 
 
-async def notifications_quiz_task():
+UUID_SPACE = 2**128
+
+
+def reminder_shard_range(
+    shard: int, shards: int
+) -> Tuple[uuid.UUID, Optional[uuid.UUID]]:
+    # user ids are random uuid4 values, so equal ranges hold similar user counts
+    min_user_id = uuid.UUID(int=shard * UUID_SPACE // shards)
+    if shard + 1 == shards:
+        return min_user_id, None
+
+    return min_user_id, uuid.UUID(int=(shard + 1) * UUID_SPACE // shards)
+
+
+async def pending_reminder_shards_task(run_date: str) -> List[int]:
+    finished = await redis_service.redis_hgetall(reminder_run_key(run_date))
+
+    return [
+        shard for shard in range(settings.REMINDER_SHARDS) if str(shard) not in finished
+    ]
+
+
+async def quiz_reminders_shard_task(run_date: str, shard: int) -> None:
+    key = reminder_run_key(run_date)
+    if await redis_service.redis_hget(key, str(shard)) is not None:
+        return
+
     async for session in get_session():
-        query = (
-            select(User, CompanyMember, Result, Quiz)
-            .join(CompanyMember, User.id == CompanyMember.user_id)
-            .join(Result, CompanyMember.id == Result.company_member_id)
-            .join(Quiz, Result.quiz_id == Quiz.id)
-            .order_by(Result.quiz_id, Result.created_date.desc())
+        notification_repository = NotificationRepository(session)
+        created = await notification_repository.create_quiz_reminders(
+            *reminder_shard_range(shard, settings.REMINDER_SHARDS)
         )
-        result = await session.execute(query)
-        rows = result.fetchall()
 
-        user_notifications = {}
+    await redis_service.redis_hset(key, str(shard), created, REMINDER_RUN_TTL)
 
-        for user, company_member, result, quiz in rows:
-            if user.id not in user_notifications:
-                user_notifications[user.id] = []
 
-            if quiz.id not in user_notifications[user.id]:
-                query_quiz_frequency = select(Quiz.frequency_days).where(
-                    Quiz.id == quiz.id
+async def send_due_quiz_reminders_task() -> int:
+    batch_size = settings.QUIZ_DUE_BATCH_SIZE
+    repeat_after = timedelta(hours=settings.QUIZ_REMINDER_REPEAT_HOURS)
+    sent = 0
+    async for session in get_session():
+        notification_repository = NotificationRepository(session)
+        while True:
+            now = datetime.now(timezone.utc).timestamp()
+            due_quizzes = await quiz_due_index.pop_due(now, batch_size)
+            if not due_quizzes:
+                break
+
+            try:
+                reminded = await notification_repository.create_due_quiz_reminders(
+                    [(entry.user_id, entry.quiz_id) for entry in due_quizzes]
                 )
-                result_quiz_frequency = await session.execute(query_quiz_frequency)
-                quiz_frequency_days = result_quiz_frequency.scalar()
+            except SQLAlchemyError:
+                # popped entries go back unless a new result rescheduled them meanwhile
+                await quiz_due_index.schedule(due_quizzes, only_new=True)
+                raise
+
+            # pairs without a reminder were retaken or no longer exist
+            await quiz_due_index.schedule(
+                [
+                    DueQuiz(user_id, quiz_id, now + repeat_after.total_seconds())
+                    for user_id, quiz_id in reminded
+                ],
+                only_new=True,
+            )
+            sent += len(reminded)
+            if len(due_quizzes) < batch_size:
+                break
 
-                created_date = result.created_date.replace(tzinfo=None)
-                time_passed = datetime.utcnow().replace(tzinfo=None) - created_date
-                is_time_passed = time_passed.days >= quiz_frequency_days
+    return sent
 
-                if is_time_passed:
-                    message = f"You should complete {quiz.name} quiz again!"
-                    user_notification = UserNotification(user_id=user.id, text=message)
-                    user_notifications[user.id].append(user_notification)
 
-        for notifications in user_notifications.values():
-            session.add_all(notifications)
+async def rebuild_quiz_due_task() -> None:
+    async for session in get_session():
+        result_repository = ResultRepository(session)
+        batch = []
+        async for row in result_repository.stream_next_due(
+            settings.QUIZ_DUE_BATCH_SIZE
+        ):
+            batch.append(DueQuiz(row.user_id, row.quiz_id, float(row.due_at)))
+            if len(batch) == settings.QUIZ_DUE_BATCH_SIZE:
+                await quiz_due_index.schedule(batch, only_new=True)
+                batch = []
+        # only missing pairs are added, so scheduled repeats are kept
+        await quiz_due_index.schedule(batch, only_new=True)
+
 
-        await session.commit()
+async def backfill_member_ratings_task():
+    async for session in get_session():
+        result_repository = ResultRepository(session)
+        await result_repository.backfill_member_ratings()
+
+
+async def maintain_result_answer_partitions_task():
+    async for session in get_session():
+        partition_repository = PartitionRepository(session)
+        table_name = ResultAnswer.__tablename__
+        await partition_repository.ensure_monthly_partitions(
+            table_name, settings.RESULT_ANSWERS_PARTITIONS_AHEAD
+        )
+        cutoff = add_months(
+            month_start(datetime.now(timezone.utc)),
+            -settings.RESULT_ANSWERS_RETENTION_MONTHS,
+        )
+        await partition_repository.detach_partitions_before(table_name, cutoff)
+
+
+async def ensure_partitions_task():
+    async for session in get_session():
+        partition_repository = PartitionRepository(session)
+        await partition_repository.ensure_monthly_partitions(
+            Result.__tablename__, settings.RESULTS_PARTITIONS_AHEAD
+        )
+        await partition_repository.ensure_monthly_partitions(
+            ResultAnswer.__tablename__, settings.RESULT_ANSWERS_PARTITIONS_AHEAD
+        )
+
+
+async def maintain_results_partitions_task():
+    async for session in get_session():
+        partition_repository = PartitionRepository(session)
+        result_repository = ResultRepository(session)
+        table_name = Result.__tablename__
+        await partition_repository.ensure_monthly_partitions(
+            table_name, settings.RESULTS_PARTITIONS_AHEAD
+        )
+        cutoff = add_months(
+            month_start(datetime.now(timezone.utc)), -settings.RESULTS_HOT_MONTHS
+        )
+
+        rolled_up = await result_repository.get_rolled_up_months()
+        months = await partition_repository.get_partition_months(table_name)
+        for month in sorted(months.values()):
+            if add_months(month, 1) <= cutoff and month not in rolled_up:
+                await result_repository.rollup_month(month)
+
+        if settings.RESULTS_DETACH_ROLLED_UP:
+            await result_repository.mark_rollups_detached(cutoff)
+            await partition_repository.detach_partitions_before(table_name, cutoff)
+
+
+async def rebuild_leaderboards_task():
+    async for session in get_session():
+        result_service = await get_result_service(session)
+        scopes = await result_service.result_repository.get_leaderboard_scopes()
+        for company_id, quiz_id in scopes:
+            await result_service.rebuild_leaderboard(company_id, quiz_id)
@@ -5,3 +5,6 @@ from app.conf.config import settings
 redis_url = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}"
 
 redis_connection = redis.from_url(redis_url, decode_responses=True)
+
+# values stored as compact binary (e.g. answer detail) must be read undecoded
+redis_binary_connection = redis.from_url(redis_url)
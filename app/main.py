@@ -1,8 +1,11 @@
 import time
+from contextlib import asynccontextmanager
+
 import uvicorn
 from loguru import logger
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.conf.config import settings
 
@@ -19,8 +22,26 @@ from app.routers import (
     notifications,
 )
 from app.exept.exceptions_handler import register_exception_handler
+from app.utils.answer_detail_buffer import answer_detail_buffer
+from app.utils.cache_invalidation import cache_invalidation
+from app.utils.result_answer_writer import result_answer_writer
+from app.core.celery_tasks import ensure_partitions_task
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await ensure_partitions_task()
+    except (SQLAlchemyError, OSError) as error:
+        logger.warning(f"partitions unavailable: {error}")
+    cache_invalidation.start()
+    yield
+    await cache_invalidation.stop()
+    await answer_detail_buffer.stop()
+    await result_answer_writer.stop()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 logger.add("app.log", rotation="50 MB", compression="zip", level="INFO")
 
@@ -5,4 +5,8 @@ from app.models.action_model import BaseModel
 from app.models.company_member import BaseModel
 from app.models.quiz_model import BaseModel
 from app.models.result_model import BaseModel
+from app.models.notification_message_model import BaseModel
 from app.models.user_notification_model import BaseModel
+from app.models.member_rating_model import BaseModel
+from app.models.result_answer_model import Base
+from app.models.result_rollup_model import BaseModel
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Enum
+from sqlalchemy import Column, ForeignKey, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.conf.invite import InvitationStatus, InvitationType
@@ -18,3 +18,8 @@ class CompanyAction(BaseModel):
     )
     status = Column(Enum(InvitationStatus), nullable=False)
     type = Column(Enum(InvitationType), nullable=False)
+
+    __table_args__ = (
+        Index("ix_actions_company_id_status", "company_id", "status"),
+        Index("ix_actions_user_id_status", "user_id", "status"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Enum
+from sqlalchemy import Column, ForeignKey, Enum, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.conf.invite import MemberStatus
@@ -17,3 +17,10 @@ class CompanyMember(BaseModel):
         nullable=False,
     )
     role = Column(Enum(MemberStatus), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "company_id", name="uq_company_members_user_id_company_id"
+        ),
+        Index("ix_company_members_company_id", "company_id"),
+    )
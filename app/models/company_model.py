@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey
+from sqlalchemy import Column, String, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -18,3 +18,5 @@ class Company(BaseModel):
         "User", back_populates="companies_owned", cascade="all, delete"
     )
     actions = relationship("CompanyAction", backref="company", cascade="all, delete")
+
+    __table_args__ = (Index("ix_companies_created_at_id", "created_at", "id"),)
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.models.base_model import BaseModel
+
+
+class MemberRating(BaseModel):
+    __tablename__ = "member_ratings"
+
+    company_member_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("company_members.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # NULL quiz_id holds the member-wide totals across all quizzes
+    quiz_id = Column(
+        UUID(as_uuid=True), ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=True
+    )
+    score_sum = Column(Float, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    correct_answers = Column(Integer, nullable=False, default=0)
+    total_questions = Column(Integer, nullable=False, default=0)
+    last_attempt_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index(
+            "ix_member_ratings_member_total",
+            "company_member_id",
+            unique=True,
+            postgresql_where=quiz_id.is_(None),
+        ),
+        Index(
+            "ix_member_ratings_member_quiz",
+            "company_member_id",
+            "quiz_id",
+            unique=True,
+            postgresql_where=quiz_id.is_not(None),
+        ),
+    )
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.models.base_model import BaseModel
+
+
+class NotificationMessage(BaseModel):
+    __tablename__ = "notification_messages"
+
+    template = Column(String(50), nullable=False)
+    params = Column(JSONB, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ARRAY, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, ARRAY, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -22,6 +22,11 @@ class Quiz(BaseModel):
         "Question", back_populates="quiz", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        Index("ix_quizzes_company_id_created_at_id", "company_id", "created_at", "id"),
+        Index("ix_quizzes_company_id_name", "company_id", "name"),
+    )
+
 
 class Question(BaseModel):
     __tablename__ = "questions"
@@ -33,3 +38,5 @@ class Question(BaseModel):
         UUID(as_uuid=True), ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False
     )
     quiz = relationship("Quiz", back_populates="questions")
+
+    __table_args__ = (Index("ix_questions_quiz_id", "quiz_id"),)
@@ -0,0 +1,35 @@
+from sqlalchemy import (
+    ARRAY,
+    Boolean,
+    Column,
+    DateTime,
+    Index,
+    SmallInteger,
+    String,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.models.base_model import Base
+
+
+class ResultAnswer(Base):
+    __tablename__ = "result_answers"
+
+    result_id = Column(UUID(as_uuid=True), primary_key=True)
+    question_id = Column(UUID(as_uuid=True), primary_key=True)
+    # partition key, so it has to be part of the primary key
+    created_at = Column(DateTime(timezone=True), primary_key=True)
+    question_position = Column(SmallInteger, nullable=False)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    company_id = Column(UUID(as_uuid=True), nullable=False)
+    quiz_id = Column(UUID(as_uuid=True), nullable=False)
+    # copied at submission, questions are replaced when a quiz is edited
+    question_text = Column(String(1000))
+    user_answer = Column(ARRAY(String(255)))
+    is_correct = Column(Boolean, nullable=False)
+
+    __table_args__ = (
+        Index("ix_result_answers_company_id_created_at", "company_id", "created_at"),
+        Index("ix_result_answers_user_id_created_at", "user_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
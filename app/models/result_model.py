@@ -1,7 +1,10 @@
+import uuid
+
 from sqlalchemy.dialects.postgresql import UUID
 
-from sqlalchemy import Column, ForeignKey, Float, Integer
+from sqlalchemy import Column, DateTime, ForeignKey, Float, Integer, Index
 from sqlalchemy.orm import relationship, backref
+from sqlalchemy.sql import func
 
 from app.models.base_model import BaseModel
 
@@ -9,6 +12,17 @@ from app.models.base_model import BaseModel
 class Result(BaseModel):
     __tablename__ = "results"
 
+    # results are partitioned by month on created_at, and the partition key
+    # has to be part of the primary key
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+        nullable=False,
+    )
     quiz_id = Column(
         UUID(as_uuid=True), ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False
     )
@@ -22,3 +36,14 @@ class Result(BaseModel):
     company_member = relationship(
         "CompanyMember", backref=backref("results", cascade="all, delete-orphan")
     )
+
+    __table_args__ = (
+        Index(
+            "ix_results_company_member_id_quiz_id_created_at",
+            "company_member_id",
+            "quiz_id",
+            "created_at",
+            postgresql_include=["score", "correct_answers", "total_questions"],
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
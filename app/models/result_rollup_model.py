@@ -0,0 +1,48 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    false,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.models.base_model import BaseModel
+
+
+class ResultRollup(BaseModel):
+    __tablename__ = "result_rollups"
+
+    company_member_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("company_members.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    quiz_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("quizzes.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # first instant (UTC) of the rolled-up results partition
+    month = Column(DateTime(timezone=True), nullable=False)
+    score_sum = Column(Float, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    correct_answers = Column(Integer, nullable=False, default=0)
+    total_questions = Column(Integer, nullable=False, default=0)
+    last_attempt_at = Column(DateTime(timezone=True))
+    # set with the detach of the month's partition; readers only take
+    # detached months from here, attached ones still hold every result
+    detached = Column(Boolean, nullable=False, default=False, server_default=false())
+
+    __table_args__ = (
+        Index(
+            "ix_result_rollups_member_quiz_month",
+            "company_member_id",
+            "quiz_id",
+            "month",
+            unique=True,
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean
+from sqlalchemy import Column, String, Boolean, Index
 from sqlalchemy.orm import relationship
 
 from app.models.base_model import BaseModel
@@ -20,3 +20,5 @@ class User(BaseModel):
     notifications = relationship(
         "UserNotification", back_populates="user", cascade="all, delete"
     )
+
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
@@ -1,6 +1,6 @@
 from sqlalchemy.dialects.postgresql import UUID
 
-from sqlalchemy import Column, Boolean, ForeignKey, String
+from sqlalchemy import Column, Boolean, ForeignKey, String, Index
 from sqlalchemy.orm import relationship
 
 from app.models.base_model import BaseModel
@@ -9,8 +9,37 @@ from app.models.base_model import BaseModel
 class UserNotification(BaseModel):
     __tablename__ = "user_notifications"
 
-    text = Column(String, nullable=False)
+    # set on single notifications, fan-outs are rendered from message or quiz
+    text = Column(String, nullable=True)
     is_read = Column(Boolean, nullable=False, default=False)
 
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     user = relationship("User", back_populates="notifications")
+    # set on quiz reminders, so a quiz is not reminded twice a day
+    quiz_id = Column(
+        UUID(as_uuid=True), ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=True
+    )
+    quiz = relationship("Quiz")
+    message_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("notification_messages.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    message = relationship("NotificationMessage")
+
+    __table_args__ = (
+        Index(
+            "ix_user_notifications_unread_user_id_created_at_id",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=is_read == False,
+        ),
+        Index(
+            "ix_user_notifications_user_id_quiz_id_created_at",
+            "user_id",
+            "quiz_id",
+            "created_at",
+            postgresql_where=quiz_id.is_not(None),
+        ),
+    )
@@ -1,16 +1,16 @@
 import uuid
 from typing import List
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_
 
 from app.models.company_member import CompanyMember
 from app.models.company_model import Company
-from app.models.result_model import Result
+from app.models.member_rating_model import MemberRating
 from app.models.user_model import User
 from app.models.action_model import CompanyAction
 from app.conf.invite import InvitationStatus
 from app.repository.base_repository import BaseRepository
-from app.schemas.actions import CompanyMemberSchema
+from app.schemas.actions import CompanyMemberSchema, GetActionsResponseSchema
 
 
 class ActionRepository(BaseRepository):
@@ -18,23 +18,13 @@ class ActionRepository(BaseRepository):
         super().__init__(session=session, model=CompanyAction)
 
     async def get_members(self, company_id: uuid.UUID) -> List[CompanyMemberSchema]:
-        subquery = (
-            select(
-                Result.company_member_id,
-                func.max(Result.created_at).label("last_quiz_attempt"),
-            )
-            .join(CompanyMember, Result.company_member_id == CompanyMember.id)
-            .group_by(Result.company_member_id)
-            .subquery()
-        )
-
         query = (
             select(
                 CompanyAction,
                 User,
                 Company,
                 CompanyMember,
-                subquery.c.last_quiz_attempt,
+                MemberRating.last_attempt_at.label("last_quiz_attempt"),
             )
             .distinct()
             .join(User, CompanyAction.user_id == User.id)
@@ -46,7 +36,13 @@ class ActionRepository(BaseRepository):
                     CompanyAction.user_id == CompanyMember.user_id,
                 ),
             )
-            .outerjoin(subquery, subquery.c.company_member_id == CompanyMember.id)
+            .outerjoin(
+                MemberRating,
+                and_(
+                    MemberRating.company_member_id == CompanyMember.id,
+                    MemberRating.quiz_id.is_(None),
+                ),
+            )
             .filter(CompanyMember.company_id == company_id)
         )
         result = await self.session.execute(query)
@@ -62,17 +58,23 @@ class ActionRepository(BaseRepository):
 
         return role.role
 
-    @staticmethod
-    async def get_relatives_query(
-        id_: uuid.UUID, status: InvitationStatus, is_company: bool
-    ):
+    async def get_relatives(
+        self, id_: uuid.UUID, status: InvitationStatus, is_company: bool
+    ) -> List[GetActionsResponseSchema]:
         id_column = CompanyAction.company_id if is_company else CompanyAction.user_id
 
         query = (
-            select(CompanyAction, User, Company)
+            select(
+                CompanyAction.id,
+                CompanyAction.user_id,
+                CompanyAction.company_id,
+                User.username.label("user_username"),
+                Company.name.label("company_name"),
+            )
             .join(User, CompanyAction.user_id == User.id)
             .join(Company, CompanyAction.company_id == Company.id)
             .filter(id_column == id_, CompanyAction.status == status)
         )
+        result = await self.session.execute(query)
 
-        return query
+        return result.mappings().all()
@@ -1,9 +1,17 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence, Tuple
 from datetime import datetime
 
-from sqlalchemy import update, delete, select, func
+from loguru import logger
+from redis.exceptions import RedisError
+from sqlalchemy import update, delete, select, func, tuple_, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.base import ExecutableOption
+
+from app.conf.config import settings
 from app.models.base_model import Base
+from app.services.redis_service import redis_service
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.redis_keys import count_key, count_field
 
 
 class BaseRepository:
@@ -16,6 +24,7 @@ class BaseRepository:
         self.session.add(row)
         await self.session.commit()
         await self.session.refresh(row)
+        await self.invalidate_count()
 
         return row
 
@@ -23,6 +32,7 @@ class BaseRepository:
         rows = [self.model(**row) for row in data]
         self.session.bulk_save_objects(rows)
         await self.session.commit()
+        await self.invalidate_count()
 
         return rows
 
@@ -35,19 +45,96 @@ class BaseRepository:
 
     async def get_many(self, skip: int = 1, limit: int = 50, **params) -> List[Base]:
         offset = (skip - 1) * limit
-        query = select(self.model).filter_by(**params).offset(offset).limit(limit)
+        query = (
+            select(self.model)
+            .filter_by(**params)
+            .order_by(self.model.created_at, self.model.id)
+            .offset(offset)
+            .limit(limit)
+        )
         result = await self.session.execute(query)
         db_rows = result.scalars().all()
 
         return db_rows
 
+    async def get_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        options: Sequence[ExecutableOption] = (),
+        **params,
+    ) -> Tuple[List[Base], Optional[str]]:
+        query = select(self.model).options(*options).filter_by(**params)
+        if cursor:
+            created_at, row_id = decode_cursor(cursor)
+            query = query.filter(
+                tuple_(self.model.created_at, self.model.id)
+                > tuple_(created_at, row_id)
+            )
+        query = query.order_by(self.model.created_at, self.model.id).limit(limit + 1)
+        result = await self.session.execute(query)
+        db_rows = result.scalars().all()
+
+        next_cursor = None
+        if len(db_rows) > limit:
+            db_rows = db_rows[:limit]
+            last_row = db_rows[-1]
+            next_cursor = encode_cursor(last_row.created_at, last_row.id)
+
+        return db_rows, next_cursor
+
     async def get_count(self, **params) -> int:
-        query = select(func.count()).select_from(self.model)
+        query = select(func.count()).select_from(self.model).filter_by(**params)
         result = await self.session.execute(query)
         user_count = result.scalar()
 
         return user_count
 
+    async def get_estimated_count(self) -> int:
+        query = text(
+            "SELECT reltuples::bigint FROM pg_class "
+            "WHERE oid = to_regclass(:table_name)"
+        )
+        result = await self.session.execute(
+            query, {"table_name": self.model.__tablename__}
+        )
+        estimated_count = result.scalar()
+
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        return max(estimated_count or 0, 0)
+
+    async def get_cached_count(self, **params) -> int:
+        key = count_key(self.model.__tablename__)
+        field = count_field(params)
+        try:
+            cached_count = await redis_service.redis_hget(key, field)
+            if cached_count is not None:
+                return int(cached_count)
+        except RedisError as error:
+            logger.warning(f"Count cache unavailable: {error}")
+
+        count = None
+        if not params and settings.COUNT_ESTIMATE_THRESHOLD:
+            estimated_count = await self.get_estimated_count()
+            if estimated_count >= settings.COUNT_ESTIMATE_THRESHOLD:
+                count = estimated_count
+
+        if count is None:
+            count = await self.get_count(**params)
+
+        try:
+            await redis_service.redis_hset(key, field, count, settings.COUNT_CACHE_TTL)
+        except RedisError as error:
+            logger.warning(f"Count cache unavailable: {error}")
+
+        return count
+
+    async def invalidate_count(self) -> None:
+        try:
+            await redis_service.redis_delete(count_key(self.model.__tablename__))
+        except RedisError as error:
+            logger.warning(f"Count cache unavailable: {error}")
+
     async def update_one(self, model_id: int, data: Dict) -> Base:
         query = (
             update(self.model)
@@ -67,5 +154,6 @@ class BaseRepository:
         )
         res = await self.session.execute(query)
         await self.session.commit()
+        await self.invalidate_count()
 
         return res.scalar_one()
@@ -9,7 +9,7 @@ from app.models.result_model import Result
 from app.models.user_model import User
 from app.repository.base_repository import BaseRepository
 from app.models.company_model import Company
-from app.schemas.actions import CompanyMemberSchema
+from app.schemas.actions import CompanyMemberSchema, GetAdminsResponseSchema
 from app.schemas.companies import CompanySchema
 from app.schemas.results import ResultSchema
 
@@ -124,14 +124,22 @@ class CompanyRepository(BaseRepository):
         member.role = role
         await self.session.commit()
 
-    async def get_admins(self, company_id: uuid.UUID) -> List[CompanyMember]:
-        query = select(CompanyMember).filter(
-            CompanyMember.company_id == company_id,
-            CompanyMember.role == MemberStatus.ADMIN,
+    async def get_admins(self, company_id: uuid.UUID) -> List[GetAdminsResponseSchema]:
+        query = (
+            select(
+                CompanyMember.id,
+                CompanyMember.user_id,
+                User.username.label("user_username"),
+            )
+            .join(User, CompanyMember.user_id == User.id)
+            .filter(
+                CompanyMember.company_id == company_id,
+                CompanyMember.role == MemberStatus.ADMIN,
+            )
         )
         result = await self.session.execute(query)
 
-        return result.scalars().all()
+        return result.mappings().all()
 
     async def get_company_members_result_data(
         self, company_id: uuid.UUID
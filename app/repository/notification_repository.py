@@ -1,32 +1,52 @@
 import uuid
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import select, update
+from sqlalchemy import select, update, func, false, literal, tuple_, desc
+from sqlalchemy.dialects.postgresql import insert, UUID
+from sqlalchemy.orm import joinedload
 
+from app.conf.notification_template import NotificationTemplate
+
+from app.models.company_member import CompanyMember
+from app.models.notification_message_model import NotificationMessage
+from app.models.quiz_model import Quiz
+from app.models.result_model import Result
+from app.models.result_rollup_model import ResultRollup
 from app.models.user_notification_model import UserNotification
-from app.models.user_model import User
 from app.repository.base_repository import BaseRepository
+from app.repository.result_repository import attempt_history
+
+# fan-outs and reminders have no text of their own, it is rendered from these
+NOTIFICATION_TEXT_OPTIONS = (
+    joinedload(UserNotification.message),
+    joinedload(UserNotification.quiz),
+)
 
 
 class NotificationRepository(BaseRepository):
     def __init__(self, session):
         super().__init__(session=session, model=UserNotification)
 
-    async def create_notifications_for_users(
-        self, users: List[User], message: str
-    ) -> None:
-        notifications = []
-
-        for user in users:
-            notification = UserNotification(
-                text=message,
-                user_id=user.id,
-            )
-            notifications.append(notification)
+    async def create_company_notifications(
+        self, company_id: uuid.UUID, template: NotificationTemplate, params: Dict
+    ) -> int:
+        # members share one message row instead of a copy of the text each
+        message = NotificationMessage(template=template.value, params=params)
+        self.session.add(message)
+        await self.session.flush()
+        members = select(
+            func.gen_random_uuid(),
+            CompanyMember.user_id,
+            literal(message.id, UUID(as_uuid=True)),
+            false(),
+        ).filter(CompanyMember.company_id == company_id)
+        query = insert(UserNotification).from_select(
+            ["id", "user_id", "message_id", "is_read"], members
+        )
+        result = await self.session.execute(query)
+        await self.session.commit()
 
-        if notifications:
-            self.session.add_all(notifications)
-            await self.session.commit()
+        return result.rowcount
 
     async def create_notification_for_user(
         self, user_id: uuid.UUID, message: str
@@ -35,16 +55,137 @@ class NotificationRepository(BaseRepository):
         self.session.add(notification)
         await self.session.commit()
 
+    @staticmethod
+    def _quiz_reminders_insert(
+        user_quiz_ids: Optional[List[Tuple[uuid.UUID, uuid.UUID]]] = None,
+        min_user_id: Optional[uuid.UUID] = None,
+        max_user_id: Optional[uuid.UUID] = None,
+    ):
+        def source_filters(quiz_id_column):
+            filters = []
+            if min_user_id:
+                filters.append(CompanyMember.user_id >= min_user_id)
+            if max_user_id:
+                filters.append(CompanyMember.user_id < max_user_id)
+            if user_quiz_ids is not None:
+                filters.append(
+                    quiz_id_column.in_({quiz_id for _, quiz_id in user_quiz_ids})
+                )
+                filters.append(
+                    tuple_(CompanyMember.user_id, quiz_id_column).in_(user_quiz_ids)
+                )
+
+            return filters
+
+        attempts = attempt_history(
+            select(CompanyMember.user_id, Result.quiz_id, Result.created_at)
+            .join(CompanyMember, CompanyMember.id == Result.company_member_id)
+            .filter(*source_filters(Result.quiz_id)),
+            select(
+                CompanyMember.user_id,
+                ResultRollup.quiz_id,
+                ResultRollup.last_attempt_at,
+            )
+            .join(CompanyMember, CompanyMember.id == ResultRollup.company_member_id)
+            .filter(*source_filters(ResultRollup.quiz_id)),
+        )
+        latest_results = (
+            select(attempts.c.user_id, attempts.c.quiz_id, attempts.c.created_at)
+            .distinct(attempts.c.user_id, attempts.c.quiz_id)
+            .order_by(
+                attempts.c.user_id, attempts.c.quiz_id, desc(attempts.c.created_at)
+            )
+            .subquery()
+        )
+        reminded_today = select(UserNotification.id).filter(
+            UserNotification.user_id == latest_results.c.user_id,
+            UserNotification.quiz_id == latest_results.c.quiz_id,
+            UserNotification.created_at >= func.date_trunc("day", func.now()),
+        )
+        reminders = (
+            select(
+                func.gen_random_uuid(),
+                latest_results.c.user_id,
+                latest_results.c.quiz_id,
+                false(),
+            )
+            .select_from(latest_results)
+            .join(Quiz, Quiz.id == latest_results.c.quiz_id)
+            .filter(
+                latest_results.c.created_at
+                <= func.now() - func.make_interval(0, 0, 0, Quiz.frequency_days),
+                ~reminded_today.exists(),
+            )
+        )
+
+        return insert(UserNotification).from_select(
+            ["id", "user_id", "quiz_id", "is_read"], reminders
+        )
+
+    async def create_quiz_reminders(
+        self,
+        min_user_id: Optional[uuid.UUID] = None,
+        max_user_id: Optional[uuid.UUID] = None,
+    ) -> int:
+        query = self._quiz_reminders_insert(
+            min_user_id=min_user_id, max_user_id=max_user_id
+        )
+        result = await self.session.execute(query)
+        await self.session.commit()
+
+        return result.rowcount
+
+    async def create_due_quiz_reminders(
+        self, user_quiz_ids: List[Tuple[uuid.UUID, uuid.UUID]]
+    ) -> List:
+        # pairs come from the due index, so each one is checked against its latest
+        # result before a reminder is written
+        query = self._quiz_reminders_insert(user_quiz_ids).returning(
+            UserNotification.user_id, UserNotification.quiz_id
+        )
+        result = await self.session.execute(query)
+        reminded = result.all()
+        await self.session.commit()
+
+        return reminded
+
+    async def get_notification(
+        self, notification_id: uuid.UUID
+    ) -> Optional[UserNotification]:
+        query = (
+            select(UserNotification)
+            .options(*NOTIFICATION_TEXT_OPTIONS)
+            .filter(UserNotification.id == notification_id)
+        )
+        result = await self.session.execute(query)
+
+        return result.scalar_one_or_none()
+
     async def get_unread_notifications_for_user(
         self, user_id: uuid.UUID
     ) -> List[UserNotification]:
-        query = select(UserNotification).filter(
-            UserNotification.is_read == False, UserNotification.user_id == user_id
+        query = (
+            select(UserNotification)
+            .options(*NOTIFICATION_TEXT_OPTIONS)
+            .filter(
+                UserNotification.is_read == False, UserNotification.user_id == user_id
+            )
         )
         result = await self.session.execute(query)
 
         return result.scalars().all()
 
+    async def get_unread_page(
+        self, user_id: uuid.UUID, cursor: Optional[str], limit: int
+    ) -> Tuple[List[UserNotification], Optional[str]]:
+        return await self.get_page(
+            cursor=cursor,
+            limit=limit,
+            options=NOTIFICATION_TEXT_OPTIONS,
+            user_id=user_id,
+            is_read=False,
+        )
+
     async def mark_notifications_as_read(
         self, notifications: List[UserNotification]
     ) -> None:
@@ -0,0 +1,100 @@
+import re
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    year, month_index = divmod(month.month - 1 + months, 12)
+
+    return month.replace(year=month.year + year, month=month_index + 1)
+
+
+def partition_name(table_name: str, month: datetime) -> str:
+    return f"{table_name}_y{month.year:04d}m{month.month:02d}"
+
+
+class PartitionRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_partitions(self, table_name: str) -> List[str]:
+        query = text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table_name ORDER BY child.relname"
+        )
+        result = await self.session.execute(query, {"table_name": table_name})
+
+        return list(result.scalars().all())
+
+    async def create_partition(self, table_name: str, month: datetime) -> str:
+        name = partition_name(table_name, month)
+        await self.session.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table_name}" '
+                f"FOR VALUES FROM ('{month.isoformat()}') "
+                f"TO ('{add_months(month, 1).isoformat()}')"
+            )
+        )
+
+        return name
+
+    async def ensure_monthly_partitions(
+        self, table_name: str, months_ahead: int
+    ) -> List[str]:
+        current_month = month_start(datetime.now(timezone.utc))
+        names = [
+            await self.create_partition(table_name, add_months(current_month, offset))
+            for offset in range(months_ahead + 1)
+        ]
+        await self.session.commit()
+
+        return names
+
+    async def attach_partition(
+        self, table_name: str, partition: str, month: datetime
+    ) -> None:
+        await self.session.execute(
+            text(
+                f'ALTER TABLE "{table_name}" ATTACH PARTITION "{partition}" '
+                f"FOR VALUES FROM ('{month.isoformat()}') "
+                f"TO ('{add_months(month, 1).isoformat()}')"
+            )
+        )
+        await self.session.commit()
+
+    async def get_partition_months(self, table_name: str) -> Dict[str, datetime]:
+        pattern = re.compile(rf"^{re.escape(table_name)}_y(\d{{4}})m(\d{{2}})$")
+        months = {}
+        for partition in await self.get_partitions(table_name):
+            match = pattern.match(partition)
+            if match:
+                months[partition] = datetime(
+                    int(match[1]), int(match[2]), 1, tzinfo=timezone.utc
+                )
+
+        return months
+
+    async def detach_partitions_before(
+        self, table_name: str, cutoff: datetime
+    ) -> List[str]:
+        detached = []
+        months = await self.get_partition_months(table_name)
+        for partition, month in months.items():
+            if add_months(month, 1) <= cutoff:
+                await self.session.execute(
+                    text(f'ALTER TABLE "{table_name}" DETACH PARTITION "{partition}"')
+                )
+                detached.append(partition)
+
+        await self.session.commit()
+
+        return detached
@@ -1,11 +1,15 @@
 import uuid
 from typing import List
 
-from sqlalchemy import delete, select, func
+from sqlalchemy import and_, delete, desc, select
 from sqlalchemy.orm import joinedload
 
 from app.repository.base_repository import BaseRepository
+from app.models.company_member import CompanyMember
 from app.models.quiz_model import Quiz, Question
+from app.models.result_model import Result
+from app.models.result_rollup_model import ResultRollup
+from app.repository.result_repository import attempt_history
 from app.schemas.quizzes import QuizSchema
 
 
@@ -14,13 +18,7 @@ class QuizRepository(BaseRepository):
         super().__init__(session=session, model=Quiz)
 
     async def get_count_quizzes(self, company_id: uuid.UUID) -> int:
-        query = (
-            select(func.count()).select_from(Quiz).where(Quiz.company_id == company_id)
-        )
-        result = await self.session.execute(query)
-        quiz_count = result.scalar()
-
-        return quiz_count
+        return await self.get_cached_count(company_id=company_id)
 
     async def create_quiz(
         self, quiz_data: QuizSchema, company_id: uuid.UUID
@@ -63,6 +61,46 @@ class QuizRepository(BaseRepository):
 
         return result.scalars().all()
 
+    async def get_quiz_for_member(self, quiz_id: uuid.UUID, user_id: uuid.UUID):
+        query = (
+            select(
+                Quiz.id,
+                Quiz.company_id,
+                Quiz.frequency_days,
+                CompanyMember.id.label("company_member_id"),
+            )
+            .outerjoin(
+                CompanyMember,
+                and_(
+                    CompanyMember.company_id == Quiz.company_id,
+                    CompanyMember.user_id == user_id,
+                ),
+            )
+            .filter(Quiz.id == quiz_id)
+        )
+        result = await self.session.execute(query)
+
+        return result.one_or_none()
+
+    async def get_latest_attempts(self, quiz_id: uuid.UUID) -> List:
+        history = attempt_history(
+            select(Result.company_member_id, Result.created_at).filter(
+                Result.quiz_id == quiz_id
+            ),
+            select(ResultRollup.company_member_id, ResultRollup.last_attempt_at).filter(
+                ResultRollup.quiz_id == quiz_id
+            ),
+        )
+        query = (
+            select(CompanyMember.user_id, history.c.created_at)
+            .join(CompanyMember, CompanyMember.id == history.c.company_member_id)
+            .distinct(history.c.company_member_id)
+            .order_by(history.c.company_member_id, desc(history.c.created_at))
+        )
+        result = await self.session.execute(query)
+
+        return result.all()
+
     async def toggle_quiz_active_status(
         self, quiz_id: uuid.UUID, new_status: bool
     ) -> None:
@@ -0,0 +1,74 @@
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, List, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.result_answer_model import ResultAnswer
+
+
+class ResultAnswerRecord(NamedTuple):
+    result_id: uuid.UUID
+    question_id: uuid.UUID
+    created_at: datetime
+    question_position: int
+    user_id: uuid.UUID
+    company_id: uuid.UUID
+    quiz_id: uuid.UUID
+    question_text: str
+    user_answer: Optional[List[str]]
+    is_correct: bool
+
+
+class ResultAnswerRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def copy_answers(self, records: List[ResultAnswerRecord]) -> None:
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            ResultAnswer.__tablename__,
+            records=records,
+            columns=list(ResultAnswerRecord._fields),
+        )
+        await self.session.commit()
+
+    async def stream_answers(
+        self,
+        batch_size: int,
+        company_id: Optional[uuid.UUID] = None,
+        user_id: Optional[uuid.UUID] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> AsyncIterator:
+        query = (
+            select(
+                ResultAnswer.result_id,
+                ResultAnswer.user_id,
+                ResultAnswer.company_id,
+                ResultAnswer.quiz_id,
+                ResultAnswer.question_text,
+                ResultAnswer.user_answer,
+                ResultAnswer.is_correct,
+            )
+            .order_by(
+                ResultAnswer.created_at,
+                ResultAnswer.result_id,
+                ResultAnswer.question_position,
+            )
+            .execution_options(yield_per=batch_size)
+        )
+        if company_id:
+            query = query.filter(ResultAnswer.company_id == company_id)
+        if user_id:
+            query = query.filter(ResultAnswer.user_id == user_id)
+        if start:
+            query = query.filter(ResultAnswer.created_at >= start)
+        if end:
+            query = query.filter(ResultAnswer.created_at <= end)
+
+        result = await self.session.stream(query)
+        async for row in result:
+            yield row
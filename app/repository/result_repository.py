@@ -1,40 +1,408 @@
 import uuid
-from typing import Optional, List
+from datetime import datetime
+from typing import AsyncIterator, Optional, List, Dict, NamedTuple, Set, Tuple
 
-from sqlalchemy import select, func, desc, and_
+from sqlalchemy import (
+    select,
+    func,
+    desc,
+    delete,
+    update,
+    cast,
+    null,
+    literal,
+    union_all,
+    Float,
+    DateTime,
+    Select,
+    Subquery,
+)
+from sqlalchemy.dialects.postgresql import insert, UUID
 
 from app.models.company_member import CompanyMember
 from app.models.company_model import Company
+from app.models.member_rating_model import MemberRating
 from app.models.quiz_model import Quiz
 from app.models.result_model import Result
-from app.models.user_model import User
+from app.models.result_rollup_model import ResultRollup
 from app.repository.base_repository import BaseRepository
+from app.repository.partition_repository import add_months
 from app.schemas.results import UserQuizResultSchema
 
 
+def attempt_history(results: Select, rollups: Select) -> Subquery:
+    # a rolled-up month is read from result_rollups only once its partition
+    # is detached, until then results still holds every attempt of it
+    return union_all(
+        select(results.subquery()), rollups.filter(ResultRollup.detached)
+    ).subquery()
+
+
+class MemberScores(NamedTuple):
+    company_score: float
+    quiz_score: float
+
+
 class ResultRepository(BaseRepository):
     def __init__(self, session):
         super().__init__(session=session, model=Result)
 
-    async def calculate_rating(self, company_member_id: uuid.UUID) -> float:
-        total_score_query = select(func.sum(self.model.score)).filter(
-            self.model.company_member_id == company_member_id
+    async def _upsert_member_rating(
+        self, result: Result, quiz_id: Optional[uuid.UUID]
+    ) -> float:
+        query = insert(MemberRating).values(
+            company_member_id=result.company_member_id,
+            quiz_id=quiz_id,
+            score_sum=result.score,
+            attempts=1,
+            correct_answers=result.correct_answers,
+            total_questions=result.total_questions,
+            last_attempt_at=result.created_at,
+        )
+        if quiz_id is None:
+            index_elements = [MemberRating.company_member_id]
+            index_where = MemberRating.quiz_id.is_(None)
+        else:
+            index_elements = [MemberRating.company_member_id, MemberRating.quiz_id]
+            index_where = MemberRating.quiz_id.is_not(None)
+
+        query = query.on_conflict_do_update(
+            index_elements=index_elements,
+            index_where=index_where,
+            set_={
+                "score_sum": MemberRating.score_sum + query.excluded.score_sum,
+                "attempts": MemberRating.attempts + 1,
+                "correct_answers": MemberRating.correct_answers
+                + query.excluded.correct_answers,
+                "total_questions": MemberRating.total_questions
+                + query.excluded.total_questions,
+                "last_attempt_at": query.excluded.last_attempt_at,
+                "updated_at": func.now(),
+            },
+        ).returning(MemberRating.score_sum / MemberRating.attempts)
+        rating = await self.session.execute(query)
+
+        return rating.scalar_one()
+
+    async def create_result(self, data: Dict) -> Tuple[Result, MemberScores]:
+        # RETURNING brings back the server defaults, so no refresh is needed
+        inserted = await self.session.scalars(insert(Result).returning(Result), [data])
+        result = inserted.one()
+        scores = MemberScores(
+            company_score=await self._upsert_member_rating(result, None),
+            quiz_score=await self._upsert_member_rating(result, result.quiz_id),
+        )
+        await self.session.commit()
+
+        return result, scores
+
+    async def backfill_member_ratings(self) -> None:
+        await self.session.execute(delete(MemberRating))
+
+        history = attempt_history(
+            select(
+                Result.company_member_id,
+                Result.quiz_id,
+                Result.score.label("score_sum"),
+                literal(1).label("attempts"),
+                Result.correct_answers,
+                Result.total_questions,
+                Result.created_at.label("last_attempt_at"),
+            ).filter(Result.company_member_id.is_not(None)),
+            select(
+                ResultRollup.company_member_id,
+                ResultRollup.quiz_id,
+                ResultRollup.score_sum,
+                ResultRollup.attempts,
+                ResultRollup.correct_answers,
+                ResultRollup.total_questions,
+                ResultRollup.last_attempt_at,
+            ),
+        )
+        for group_by_quiz in (False, True):
+            quiz_column = history.c.quiz_id if group_by_quiz else cast(null(), UUID)
+            group_by = [history.c.company_member_id]
+            if group_by_quiz:
+                group_by.append(history.c.quiz_id)
+
+            aggregates = select(
+                func.gen_random_uuid(),
+                history.c.company_member_id,
+                quiz_column,
+                func.sum(history.c.score_sum),
+                func.sum(history.c.attempts),
+                func.coalesce(func.sum(history.c.correct_answers), 0),
+                func.sum(history.c.total_questions),
+                func.max(history.c.last_attempt_at),
+            ).group_by(*group_by)
+            query = insert(MemberRating).from_select(
+                [
+                    "id",
+                    "company_member_id",
+                    "quiz_id",
+                    "score_sum",
+                    "attempts",
+                    "correct_answers",
+                    "total_questions",
+                    "last_attempt_at",
+                ],
+                aggregates,
+            )
+            await self.session.execute(query)
+
+        await self.session.commit()
+
+    async def get_rolled_up_months(self) -> Set[datetime]:
+        result = await self.session.execute(select(ResultRollup.month).distinct())
+
+        return set(result.scalars().all())
+
+    async def mark_rollups_detached(self, cutoff: datetime) -> None:
+        # not committed here, the partitions are detached in the same
+        # transaction so readers never count a month twice or miss it
+        await self.session.execute(
+            update(ResultRollup)
+            .filter(ResultRollup.month < cutoff, ResultRollup.detached.is_(False))
+            .values(detached=True)
+        )
+
+    async def rollup_month(self, month: datetime) -> None:
+        aggregates = (
+            select(
+                func.gen_random_uuid(),
+                Result.company_member_id,
+                Result.quiz_id,
+                literal(month, DateTime(timezone=True)),
+                func.sum(Result.score),
+                func.count(Result.id),
+                func.coalesce(func.sum(Result.correct_answers), 0),
+                func.sum(Result.total_questions),
+                func.max(Result.created_at),
+            )
+            .filter(
+                Result.company_member_id.is_not(None),
+                Result.created_at >= month,
+                Result.created_at < add_months(month, 1),
+            )
+            .group_by(Result.company_member_id, Result.quiz_id)
+        )
+        query = insert(ResultRollup).from_select(
+            [
+                "id",
+                "company_member_id",
+                "quiz_id",
+                "month",
+                "score_sum",
+                "attempts",
+                "correct_answers",
+                "total_questions",
+                "last_attempt_at",
+            ],
+            aggregates,
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[
+                ResultRollup.company_member_id,
+                ResultRollup.quiz_id,
+                ResultRollup.month,
+            ],
+            set_={
+                "score_sum": query.excluded.score_sum,
+                "attempts": query.excluded.attempts,
+                "correct_answers": query.excluded.correct_answers,
+                "total_questions": query.excluded.total_questions,
+                "last_attempt_at": query.excluded.last_attempt_at,
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(query)
+        await self.session.commit()
+
+    async def get_member_rating(
+        self, user_id: uuid.UUID, company_id: uuid.UUID
+    ) -> Optional[float]:
+        query = (
+            select(MemberRating.score_sum / MemberRating.attempts)
+            .join(CompanyMember, CompanyMember.id == MemberRating.company_member_id)
+            .filter(
+                CompanyMember.user_id == user_id,
+                CompanyMember.company_id == company_id,
+                MemberRating.quiz_id.is_(None),
+            )
         )
+        result = await self.session.execute(query)
 
-        total_results_query = select(func.count(self.model.id)).filter(
-            self.model.company_member_id == company_member_id
+        return result.scalar()
+
+    async def get_global_rating(self, user_id: uuid.UUID) -> Optional[float]:
+        query = (
+            select(func.avg(MemberRating.score_sum / MemberRating.attempts))
+            .join(CompanyMember, CompanyMember.id == MemberRating.company_member_id)
+            .filter(
+                CompanyMember.user_id == user_id,
+                MemberRating.quiz_id.is_(None),
+            )
         )
-        total_score = await self.session.execute(total_score_query)
-        total_results = await self.session.execute(total_results_query)
+        result = await self.session.execute(query)
 
-        total_score_value = total_score.scalars().first() or 0.0
-        total_results_value = total_results.scalars().first() or 0
+        return result.scalar()
 
-        average_score = (
-            total_score_value / total_results_value if total_results_value > 0 else 0.0
+    async def get_leaderboard_scores(
+        self, company_id: uuid.UUID, quiz_id: Optional[uuid.UUID] = None
+    ) -> List:
+        query = (
+            select(
+                CompanyMember.user_id,
+                (MemberRating.score_sum / MemberRating.attempts).label("score"),
+            )
+            .join(CompanyMember, CompanyMember.id == MemberRating.company_member_id)
+            .filter(CompanyMember.company_id == company_id)
         )
+        if quiz_id is None:
+            query = query.filter(MemberRating.quiz_id.is_(None))
+        else:
+            query = query.filter(MemberRating.quiz_id == quiz_id)
+        result = await self.session.execute(query)
 
-        return average_score
+        return result.all()
+
+    async def get_leaderboard_scopes(self) -> List:
+        query = (
+            select(CompanyMember.company_id, MemberRating.quiz_id)
+            .join(CompanyMember, CompanyMember.id == MemberRating.company_member_id)
+            .distinct()
+        )
+        result = await self.session.execute(query)
+
+        return result.all()
+
+    async def stream_next_due(self, batch_size: int) -> AsyncIterator:
+        history = attempt_history(
+            select(Result.company_member_id, Result.quiz_id, Result.created_at),
+            select(
+                ResultRollup.company_member_id,
+                ResultRollup.quiz_id,
+                ResultRollup.last_attempt_at,
+            ),
+        )
+        latest_results = (
+            select(CompanyMember.user_id, history.c.quiz_id, history.c.created_at)
+            .join(CompanyMember, CompanyMember.id == history.c.company_member_id)
+            .distinct(history.c.company_member_id, history.c.quiz_id)
+            .order_by(
+                history.c.company_member_id,
+                history.c.quiz_id,
+                desc(history.c.created_at),
+            )
+            .subquery()
+        )
+        query = (
+            select(
+                latest_results.c.user_id,
+                latest_results.c.quiz_id,
+                func.extract(
+                    "epoch",
+                    latest_results.c.created_at
+                    + func.make_interval(0, 0, 0, Quiz.frequency_days),
+                ).label("due_at"),
+            )
+            .join(Quiz, Quiz.id == latest_results.c.quiz_id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(query)
+        async for row in result:
+            yield row
+
+    async def get_cumulative_scores(
+        self,
+        company_member_id: uuid.UUID,
+        quiz_id: Optional[uuid.UUID] = None,
+        points: Optional[int] = None,
+    ) -> List:
+        results = select(
+            Result.created_at,
+            Result.id,
+            Result.correct_answers,
+            Result.total_questions,
+        ).filter(Result.company_member_id == company_member_id)
+        # a rolled-up month contributes one point per quiz
+        rollups = select(
+            ResultRollup.last_attempt_at,
+            ResultRollup.id,
+            ResultRollup.correct_answers,
+            ResultRollup.total_questions,
+        ).filter(ResultRollup.company_member_id == company_member_id)
+        if quiz_id:
+            results = results.filter(Result.quiz_id == quiz_id)
+            rollups = rollups.filter(ResultRollup.quiz_id == quiz_id)
+        history = attempt_history(results, rollups)
+
+        window = {
+            "order_by": (history.c.created_at, history.c.id),
+            "rows": (None, 0),
+        }
+        query = select(
+            history.c.created_at,
+            (
+                cast(func.sum(history.c.correct_answers).over(**window), Float)
+                / func.sum(history.c.total_questions).over(**window)
+            ).label("score"),
+        )
+
+        if not points:
+            result = await self.session.execute(query.order_by(*window["order_by"]))
+            return result.all()
+
+        # keep the last cumulative point of each of `points` equal-sized buckets
+        series = query.add_columns(
+            func.ntile(points).over(order_by=window["order_by"]).label("bucket")
+        ).subquery()
+        query = (
+            select(series.c.created_at, series.c.score)
+            .distinct(series.c.bucket)
+            .order_by(series.c.bucket, series.c.created_at.desc())
+        )
+        result = await self.session.execute(query)
+
+        return result.all()
+
+    async def get_company_bucketed_scores(
+        self, company_id: uuid.UUID, bucket: str
+    ) -> List:
+        # a rolled-up month falls into the bucket of its first day
+        history = attempt_history(
+            select(
+                CompanyMember.user_id,
+                Result.created_at,
+                Result.score.label("score_sum"),
+                literal(1).label("attempts"),
+            )
+            .join(CompanyMember, CompanyMember.id == Result.company_member_id)
+            .filter(CompanyMember.company_id == company_id),
+            select(
+                CompanyMember.user_id,
+                ResultRollup.month,
+                ResultRollup.score_sum,
+                ResultRollup.attempts,
+            )
+            .join(CompanyMember, CompanyMember.id == ResultRollup.company_member_id)
+            .filter(CompanyMember.company_id == company_id),
+        )
+        bucket_start = func.date_trunc(bucket, history.c.created_at).label("bucket")
+        query = (
+            select(
+                history.c.user_id,
+                bucket_start,
+                (func.sum(history.c.score_sum) / func.sum(history.c.attempts)).label(
+                    "average_score"
+                ),
+            )
+            .group_by(history.c.user_id, bucket_start)
+            .order_by(history.c.user_id, bucket_start)
+        )
+        result = await self.session.execute(query)
+
+        return result.all()
 
     async def get_last_result_for_user(
         self, company_member_id: uuid.UUID
@@ -49,87 +417,75 @@ class ResultRepository(BaseRepository):
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
-    async def get_latest_results_for_company_member(
-        self, user_id: uuid.UUID
-    ) -> List[Result]:
-        subquery = (
-            select(Result.quiz_id, func.max(Result.created_at).label("max_created_at"))
-            .join(CompanyMember)
-            .join(User)
-            .filter(User.id == user_id)
-            .group_by(Result.quiz_id)
-            .subquery()
+    async def get_latest_results_for_company_member(self, user_id: uuid.UUID) -> List:
+        history = attempt_history(
+            select(Result.quiz_id, Result.created_at)
+            .join(CompanyMember, CompanyMember.id == Result.company_member_id)
+            .filter(CompanyMember.user_id == user_id),
+            select(ResultRollup.quiz_id, ResultRollup.last_attempt_at)
+            .join(CompanyMember, CompanyMember.id == ResultRollup.company_member_id)
+            .filter(CompanyMember.user_id == user_id),
         )
-        query = select(Result).join(
-            subquery,
-            and_(
-                Result.quiz_id == subquery.c.quiz_id,
-                Result.created_at == subquery.c.max_created_at,
-            ),
+        query = (
+            select(history.c.quiz_id, history.c.created_at)
+            .distinct(history.c.quiz_id)
+            .order_by(history.c.quiz_id, desc(history.c.created_at))
         )
 
         result = await self.session.execute(query)
 
-        return result.scalars().all()
+        return result.all()
 
     async def get_quizzes_from_me(
         self, user_id: uuid.UUID
     ) -> List[UserQuizResultSchema]:
-        subquery = (
-            select(
-                Result.quiz_id,
-                func.max(Result.created_at).label("last_attempt"),
-                func.avg(Result.score).label("average_score"),
-            )
-            .join(CompanyMember, CompanyMember.id == Result.company_member_id)
-            .filter(CompanyMember.user_id == user_id)
-            .group_by(Result.quiz_id)
-            .subquery()
-        )
-
-        # Main query to retrieve quiz details along with last attempt and average score
         query = (
             select(
-                subquery.c.quiz_id,
+                MemberRating.quiz_id,
                 Quiz.name.label("quiz_name"),
                 Company.id.label("company_id"),
                 Company.name.label("company_name"),
-                subquery.c.last_attempt,
-                subquery.c.average_score,
+                MemberRating.last_attempt_at.label("last_attempt"),
+                (MemberRating.score_sum / MemberRating.attempts).label("average_score"),
             )
-            .join(Quiz, Quiz.id == subquery.c.quiz_id)
+            .join(CompanyMember, CompanyMember.id == MemberRating.company_member_id)
+            .join(Quiz, Quiz.id == MemberRating.quiz_id)
             .join(Company, Company.id == Quiz.company_id)
-            .order_by(subquery.c.last_attempt.desc())
+            .filter(CompanyMember.user_id == user_id)
+            .order_by(MemberRating.last_attempt_at.desc())
         )
 
         result = await self.session.execute(query)
 
         return result.mappings().all()
 
-    async def get_latest_results_for_company(
-        self, company_id: uuid.UUID
-    ) -> List[Result]:
-        subquery = (
+    async def get_latest_results_for_company(self, company_id: uuid.UUID) -> List:
+        history = attempt_history(
+            select(Result.company_member_id, Result.quiz_id, Result.created_at)
+            .join(CompanyMember, CompanyMember.id == Result.company_member_id)
+            .filter(CompanyMember.company_id == company_id),
             select(
-                CompanyMember.id.label("company_member_id"),
-                Result.quiz_id,
-                func.max(Result.created_at).label("max_created_at"),
+                ResultRollup.company_member_id,
+                ResultRollup.quiz_id,
+                ResultRollup.last_attempt_at,
             )
-            .join(Result, Result.company_member_id == CompanyMember.id)
-            .join(User, CompanyMember.user_id == User.id)
-            .filter(CompanyMember.company_id == company_id)
-            .group_by(CompanyMember.id, Result.quiz_id)
-            .subquery()
+            .join(CompanyMember, CompanyMember.id == ResultRollup.company_member_id)
+            .filter(CompanyMember.company_id == company_id),
         )
-        query = select(Result).join(
-            subquery,
-            and_(
-                Result.company_member_id == subquery.c.company_member_id,
-                Result.quiz_id == subquery.c.quiz_id,
-                Result.created_at == subquery.c.max_created_at,
-            ),
+        query = (
+            select(
+                history.c.company_member_id,
+                history.c.quiz_id,
+                history.c.created_at,
+            )
+            .distinct(history.c.company_member_id, history.c.quiz_id)
+            .order_by(
+                history.c.company_member_id,
+                history.c.quiz_id,
+                desc(history.c.created_at),
+            )
         )
 
         result = await self.session.execute(query)
 
-        return result.scalars().all()
+        return result.all()
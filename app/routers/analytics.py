@@ -1,12 +1,16 @@
 import uuid
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
+from app.conf.time_bucket import TimeBucket
 from app.schemas.results import (
     UserQuizResultSchema,
     CompanyMemberResultSchema,
+    CompanyMemberLastResultSchema,
     QuizResultSchema,
+    LeaderboardEntrySchema,
+    LeaderboardSchema,
 )
 from app.schemas.results import UserQuizResultSchema
 from app.schemas.users import UserSchema
@@ -22,12 +26,15 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
 )
 async def get_company_results(
     company_id: uuid.UUID,
+    bucket: TimeBucket = TimeBucket.DAY,
     current_user: UserSchema = Depends(AuthService.get_current_user),
     result_service: ResultService = Depends(get_result_service),
 ) -> CompanyMemberResultSchema:
     current_user_id = current_user.id
 
-    return await result_service.company_members_results(current_user_id, company_id)
+    return await result_service.company_members_results(
+        current_user_id, company_id, bucket=bucket
+    )
 
 
 @router.get("/my/quizzes/results", response_model=List[UserQuizResultSchema])
@@ -43,41 +50,92 @@ async def get_my_quizzes_latest_results(
 @router.get("/my/quiz/{quiz_id}", response_model=QuizResultSchema)
 async def get_my_quiz_results(
     quiz_id: uuid.UUID,
+    points: Optional[int] = Query(None, ge=1),
     current_user: UserSchema = Depends(AuthService.get_current_user),
     result_service: ResultService = Depends(get_result_service),
 ) -> QuizResultSchema:
     current_user_id = current_user.id
 
     return await result_service.my_quiz_results(
-        current_user_id=current_user_id, quiz_id=quiz_id
+        current_user_id=current_user_id, quiz_id=quiz_id, points=points
     )
 
 
 @router.get(
     "/company/{company_id}/member/{company_member_id}/results",
-    response_model=CompanyMemberResultSchema,
+    response_model=QuizResultSchema,
 )
 async def get_company_results_one_user(
     company_id: uuid.UUID,
     company_member_id: uuid.UUID,
+    points: Optional[int] = Query(None, ge=1),
     current_user: UserSchema = Depends(AuthService.get_current_user),
     result_service: ResultService = Depends(get_result_service),
-) -> CompanyMemberResultSchema:
+) -> QuizResultSchema:
     current_user_id = current_user.id
 
     return await result_service.company_member_results(
-        company_id, company_member_id, current_user_id
+        company_id, company_member_id, current_user_id, points=points
     )
 
 
 @router.get(
-    "/company/{company_id}/member_result_last", response_model=CompanyMemberResultSchema
+    "/company/{company_id}/member_result_last",
+    response_model=CompanyMemberLastResultSchema,
 )
 async def get_company_result_last(
     company_id: uuid.UUID,
     current_user: UserSchema = Depends(AuthService.get_current_user),
     result_service: ResultService = Depends(get_result_service),
-) -> CompanyMemberResultSchema:
+) -> CompanyMemberLastResultSchema:
     current_user_id = current_user.id
 
     return await result_service.company_members_result_last(company_id, current_user_id)
+
+
+@router.get("/company/{company_id}/leaderboard", response_model=LeaderboardSchema)
+async def get_company_leaderboard(
+    company_id: uuid.UUID,
+    quiz_id: Optional[uuid.UUID] = None,
+    limit: int = Query(10, ge=1, le=100),
+    current_user: UserSchema = Depends(AuthService.get_current_user),
+    result_service: ResultService = Depends(get_result_service),
+) -> LeaderboardSchema:
+    current_user_id = current_user.id
+
+    return await result_service.leaderboard_top(
+        current_user_id, company_id, quiz_id=quiz_id, limit=limit
+    )
+
+
+@router.get("/company/{company_id}/leaderboard/me", response_model=LeaderboardSchema)
+async def get_company_leaderboard_around_me(
+    company_id: uuid.UUID,
+    quiz_id: Optional[uuid.UUID] = None,
+    radius: int = Query(5, ge=0, le=50),
+    current_user: UserSchema = Depends(AuthService.get_current_user),
+    result_service: ResultService = Depends(get_result_service),
+) -> LeaderboardSchema:
+    current_user_id = current_user.id
+
+    return await result_service.leaderboard_around_me(
+        current_user_id, company_id, quiz_id=quiz_id, radius=radius
+    )
+
+
+@router.get(
+    "/company/{company_id}/leaderboard/user/{user_id}",
+    response_model=LeaderboardEntrySchema,
+)
+async def get_company_leaderboard_rank(
+    company_id: uuid.UUID,
+    user_id: uuid.UUID,
+    quiz_id: Optional[uuid.UUID] = None,
+    current_user: UserSchema = Depends(AuthService.get_current_user),
+    result_service: ResultService = Depends(get_result_service),
+) -> LeaderboardEntrySchema:
+    current_user_id = current_user.id
+
+    return await result_service.leaderboard_member_rank(
+        current_user_id, company_id, user_id, quiz_id=quiz_id
+    )
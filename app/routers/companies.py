@@ -1,5 +1,5 @@
 import uuid
-from typing import Dict
+from typing import Dict, Optional
 
 from fastapi import APIRouter, Depends
 
@@ -22,14 +22,24 @@ router = APIRouter(prefix="/companies", tags=["companies"])
 async def get_all_companies(
     skip: int = 1,
     limit: int = 10,
+    cursor: Optional[str] = None,
     company_service: CompanyService = Depends(get_company_service),
     current_user: UserSchema = Depends(AuthService.get_current_user),
 ):
-    companies = await company_service.get_companies(skip, limit, current_user)
+    if cursor is not None or skip == 1:
+        # the first page is served in keyset order, so it already carries a cursor
+        companies, next_cursor = await company_service.get_companies_page(
+            cursor, limit, current_user
+        )
+    else:
+        companies = await company_service.get_companies(skip, limit, current_user)
+        next_cursor = None
     total_count = await company_service.get_total_count()
     result = [CompanySchema.from_orm(company) for company in companies]
 
-    return CompaniesListResponse(companies=result, total_count=total_count)
+    return CompaniesListResponse(
+        companies=result, total_count=total_count, next_cursor=next_cursor
+    )
 
 
 @router.get("/{company_id}", response_model=CompanySchema)
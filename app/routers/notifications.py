@@ -1,7 +1,7 @@
 import uuid
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
 from app.schemas.notifications import NotificationSchema
 from app.schemas.users import UserSchema
@@ -14,12 +14,24 @@ router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 @router.get("/me", response_model=List[NotificationSchema])
 async def get_my_notifications(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = 50,
     current_user: UserSchema = Depends(AuthService.get_current_user),
     notification_service: NotificationService = Depends(get_notification_service),
 ) -> List[NotificationSchema]:
     current_user_id = current_user.id
 
-    return await notification_service.get_my_notifications(current_user_id)
+    if cursor is None:
+        return await notification_service.get_my_notifications(current_user_id)
+
+    notifications, next_cursor = await notification_service.get_my_notifications_page(
+        current_user_id, cursor, limit
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    return notifications
 
 
 @router.patch("/{notification_id}/mark_as_read", response_model=NotificationSchema)
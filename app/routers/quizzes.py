@@ -1,5 +1,5 @@
 import uuid
-from typing import Dict
+from typing import Dict, Optional
 
 from fastapi import APIRouter, Depends, status, File, UploadFile
 
@@ -21,13 +21,19 @@ router = APIRouter(prefix="/quizzes", tags=["quizzes"])
 @router.get("/company/{company_id}", response_model=QuizzesListResponse)
 async def get_quizzes(
     company_id: uuid.UUID,
+    cursor: Optional[str] = None,
+    limit: int = 50,
     quiz_service: QuizService = Depends(get_quizzes_service),
     current_user: UserSchema = Depends(AuthService.get_current_user),
 ) -> QuizzesListResponse:
-    quizzes = await quiz_service.get_quizzes(company_id)
+    quizzes, next_cursor = await quiz_service.get_quizzes_page(
+        company_id, cursor, limit
+    )
     total_count = await quiz_service.get_total_count(company_id)
 
-    return QuizzesListResponse(quizzes=quizzes, total_count=total_count)
+    return QuizzesListResponse(
+        quizzes=quizzes, total_count=total_count, next_cursor=next_cursor
+    )
 
 
 @router.post("/company/{company_id}", response_model=QuizSchema)
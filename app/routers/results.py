@@ -1,4 +1,6 @@
 import uuid
+from datetime import datetime
+from typing import Optional
 
 from fastapi import APIRouter, Depends
 
@@ -28,35 +30,41 @@ async def create_result(
 @router.get("/company/{company_id}/rating", response_model=float)
 async def get_company_rating(
     company_id: uuid.UUID,
+    use_cache: bool = True,
     current_user: UserSchema = Depends(AuthService.get_current_user),
     result_service: ResultService = Depends(get_result_service),
 ) -> float:
     current_user_id = current_user.id
 
-    return await result_service.get_company_rating(company_id, current_user_id)
+    return await result_service.get_company_rating(
+        current_user_id=current_user_id, company_id=company_id, use_cache=use_cache
+    )
 
 
 @router.get("/global_rating", response_model=float)
 async def get_global_rating(
+    use_cache: bool = True,
     current_user: UserSchema = Depends(AuthService.get_current_user),
     result_service: ResultService = Depends(get_result_service),
 ) -> float:
     current_user_id = current_user.id
 
-    return await result_service.get_global_rating(current_user_id)
+    return await result_service.get_global_rating(current_user_id, use_cache)
 
 
 @router.get("/export/company/{company_id}", response_model=ExportedFile)
 async def get_export_company(
     company_id: uuid.UUID,
     file_format: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
     current_user: UserSchema = Depends(AuthService.get_current_user),
     result_service: ResultService = Depends(get_result_service),
 ) -> ExportedFile:
     current_user_id = current_user.id
 
     return await result_service.company_answers_list(
-        company_id, file_format, current_user_id
+        company_id, file_format, current_user_id, start, end
     )
 
 
@@ -65,22 +73,28 @@ async def get_export_user(
     company_id: uuid.UUID,
     user_id: uuid.UUID,
     file_format: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
     current_user: UserSchema = Depends(AuthService.get_current_user),
     result_service: ResultService = Depends(get_result_service),
 ) -> ExportedFile:
     current_user_id = current_user.id
 
     return await result_service.user_answers_list(
-        company_id, user_id, file_format, current_user_id
+        company_id, user_id, file_format, current_user_id, start, end
     )
 
 
 @router.get("/export/me", response_model=ExportedFile)
 async def get_export_company(
     file_format: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
     current_user: UserSchema = Depends(AuthService.get_current_user),
     result_service: ResultService = Depends(get_result_service),
 ) -> ExportedFile:
     current_user_id = current_user.id
 
-    return await result_service.my_answers_list(current_user_id, file_format)
+    return await result_service.my_answers_list(
+        current_user_id, file_format, start, end
+    )
@@ -1,4 +1,5 @@
 import uuid
+from typing import Optional
 
 from fastapi import APIRouter, Depends
 from loguru import logger
@@ -32,14 +33,22 @@ async def verify_user_permission(
 async def get_all_users(
     skip: int = 1,
     limit: int = 10,
+    cursor: Optional[str] = None,
     user_service=Depends(get_user_service),
     current_user: UserSchema = Depends(AuthService.get_current_user),
 ):
-    users = await user_service.get_users(skip, limit)
+    if cursor is not None or skip == 1:
+        # the first page is served in keyset order, so it already carries a cursor
+        users, next_cursor = await user_service.get_users_page(cursor, limit)
+    else:
+        users = await user_service.get_users(skip, limit)
+        next_cursor = None
     total_count = await user_service.get_total_count()
     result = [UserSchema.from_orm(user) for user in users]
 
-    return UsersListResponse(users=result, total_count=total_count)
+    return UsersListResponse(
+        users=result, total_count=total_count, next_cursor=next_cursor
+    )
 
 
 @router.get(
@@ -55,6 +55,7 @@ class CompanyDetailResponse(CompanySchema):
 class CompaniesListResponse(BaseModel):
     companies: List[CompanySchema]
     total_count: int
+    next_cursor: Optional[str] = None
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -60,6 +60,7 @@ class QuizResponseSchema(BaseModel):
 class QuizzesListResponse(BaseModel):
     quizzes: List[QuizResponseSchema]
     total_count: int
+    next_cursor: Optional[str] = None
 
     model_config = ConfigDict(
         from_attributes=True,
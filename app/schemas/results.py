@@ -1,9 +1,12 @@
 import uuid
 from datetime import datetime
 
-from typing import List, Dict
+from typing import Annotated, List, Dict
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, StringConstraints
+
+# matches result_answers.user_answer
+MAX_ANSWER_LENGTH = 255
 
 
 class ResultSchema(BaseModel):
@@ -29,12 +32,18 @@ class CompanyMemberResultSchema(BaseModel):
     data: Dict[str, Dict[datetime, float]]
 
 
+class CompanyMemberLastResultSchema(BaseModel):
+    data: Dict[uuid.UUID, Dict[uuid.UUID, datetime]]
+
+
 class QuizResultSchema(BaseModel):
     data: Dict[datetime, float]
 
 
 class QuizRequest(BaseModel):
-    answers: Dict[uuid.UUID, List[str]]
+    answers: Dict[
+        uuid.UUID, List[Annotated[str, StringConstraints(max_length=MAX_ANSWER_LENGTH)]]
+    ]
 
 
 class CompanyRating(BaseModel):
@@ -43,6 +52,17 @@ class CompanyRating(BaseModel):
     rating: float
 
 
+class LeaderboardEntrySchema(BaseModel):
+    user_id: uuid.UUID
+    rank: int
+    score: float
+
+
+class LeaderboardSchema(BaseModel):
+    total: int
+    entries: List[LeaderboardEntrySchema]
+
+
 class ExportedFile(BaseModel):
     file: bytes
     filename: str
@@ -56,6 +56,7 @@ class UserDetailResponse(BaseUserSchema):
 class UsersListResponse(BaseModel):
     users: List[BaseUserSchema]
     total_count: int
+    next_cursor: Optional[str] = None
 
     model_config = ConfigDict(
         from_attributes=True,
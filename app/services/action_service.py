@@ -33,6 +33,8 @@ from app.schemas.actions import (
 from app.schemas.companies import CompanySchema
 from app.schemas.users import UserSchema
 from app.utils import companies_utils
+from app.utils.latest_result_cache import invalidate_latest_results
+from app.utils.leaderboard import leaderboard
 
 
 class ActionService:
@@ -356,6 +358,8 @@ class ActionService:
             raise ActionAlreadyAvailable()
 
         await self.company_repository.delete_company_member(company_id, current_user_id)
+        await leaderboard.remove_member(company_id, current_user_id)
+        await invalidate_latest_results(company_id)
 
         company_name = await self.company_repository.get_company_name(company_id)
         company_owner = await self.company_repository.get_company_owner(company_id)
@@ -376,6 +380,8 @@ class ActionService:
         company_id = action.company_id
 
         await self.company_repository.delete_company_member(company_id, action.user_id)
+        await leaderboard.remove_member(company_id, action.user_id)
+        await invalidate_latest_results(company_id)
 
         company_name = await self.company_repository.get_company_name(company_id)
         message = f"You were removed from the company {company_name}"
@@ -394,46 +400,27 @@ class ActionService:
 
         return company
 
-    # PROCESS QUERY RESULTS
-    async def process_query_results(self, results):
-        actions = []
-        for action, user, company in results.fetchall():
-            action_dto = GetActionsResponseSchema(
-                id=action.id,
-                user_id=user.id,
-                company_id=company.id,
-                user_username=await self.user_repository.get_user_username(user.id),
-                company_name=await self.company_repository.get_company_name(company.id),
-            )
-            actions.append(action_dto)
-
-        return actions
-
     # GET COMPANY INVITES
     async def get_company_invites(
         self, current_user_id: uuid.UUID, company_id: Optional[uuid.UUID] = None
     ) -> List[GetActionsResponseSchema]:
         await self._validate_company_get(current_user_id, company_id)
-        query = await self.action_repository.get_relatives_query(
+        invites = await self.action_repository.get_relatives(
             company_id, InvitationStatus.INVITED, True
         )
-        result = await self.session.execute(query)
-        invites = await self.process_query_results(result)
 
-        return invites
+        return [GetActionsResponseSchema(**invite) for invite in invites]
 
     # GET COMPANY REQUEST
     async def get_company_requests(
         self, current_user_id: uuid.UUID, company_id: Optional[uuid.UUID] = None
     ) -> List[GetActionsResponseSchema]:
         await self._validate_company_get(current_user_id, company_id)
-        query = await self.action_repository.get_relatives_query(
+        requests = await self.action_repository.get_relatives(
             company_id, InvitationStatus.REQUESTED, True
         )
-        result = await self.session.execute(query)
-        requests = await self.process_query_results(result)
 
-        return requests
+        return [GetActionsResponseSchema(**request) for request in requests]
 
     # GET COMPANY MEMBERS
     async def get_company_members(
@@ -462,25 +449,21 @@ class ActionService:
     async def get_my_requests(
         self, current_user_id: uuid.UUID
     ) -> List[GetActionsResponseSchema]:
-        query = await self.action_repository.get_relatives_query(
+        requests = await self.action_repository.get_relatives(
             current_user_id, InvitationStatus.REQUESTED, False
         )
-        result = await self.session.execute(query)
-        requests = await self.process_query_results(result)
 
-        return requests
+        return [GetActionsResponseSchema(**request) for request in requests]
 
     # GET MY INVITES
     async def get_my_invites(
         self, current_user_id: uuid.UUID
     ) -> List[GetActionsResponseSchema]:
-        query = await self.action_repository.get_relatives_query(
+        invites = await self.action_repository.get_relatives(
             current_user_id, InvitationStatus.INVITED, False
         )
-        result = await self.session.execute(query)
-        invites = await self.process_query_results(result)
 
-        return invites
+        return [GetActionsResponseSchema(**invite) for invite in invites]
 
     # VALIDATE ADMIN
     async def _validate_admin(
@@ -549,15 +532,5 @@ class ActionService:
         await self._validate_company_get(current_user_id, company_id)
 
         admins = await self.company_repository.get_admins(company_id)
-        admins_schemas = [
-            GetAdminsResponseSchema(
-                id=admin.id,
-                user_id=admin.user_id,
-                user_username=await self.user_repository.get_user_username(
-                    admin.user_id
-                ),
-            )
-            for admin in admins
-        ]
 
-        return admins_schemas
+        return [GetAdminsResponseSchema(**admin) for admin in admins]
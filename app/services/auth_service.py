@@ -10,8 +10,10 @@ from app.conf.detail import Messages
 from app.db.connection import get_session
 from app.repository.user_repository import UserRepository
 from app.schemas.auth import TokenModel
+from app.schemas.users import BaseUserSchema
 from app.utils import jwt_utils
 from app.utils import password_utils
+from app.utils.user_cache import user_cache
 from app.exept.custom_exceptions import (
     UserWithEmailNotFound,
     IncorrectPassword,
@@ -39,7 +41,7 @@ class AuthService:
             logger.info(Messages.USER_WITH_EMAIL_NOT_FOUND)
             raise UserWithEmailNotFound()
 
-        if not password_utils.validate_password(
+        if not await password_utils.validate_password(
             password=password,
             hashed_password=db_user.password,
         ):
@@ -66,7 +68,7 @@ class AuthService:
             raise UserAlreadyExists()
 
         password = data.get("password")
-        hashed_password = password_utils.hash_password(password=password)
+        hashed_password = await password_utils.hash_password(password=password)
 
         user_data = {
             "username": username,
@@ -85,8 +87,8 @@ class AuthService:
     async def get_current_user(
         token: HTTPAuthorizationCredentials = Depends(security),
         session: AsyncSession = Depends(get_session),
-    ) -> str:
-        decoded_token = jwt_utils.decode_jwt(token.credentials)
+    ) -> BaseUserSchema:
+        decoded_token = await jwt_utils.decode_jwt(token.credentials)
         if not decoded_token:
             logger.info(Messages.NOT_FOUND)
             raise NotFound()
@@ -98,13 +100,17 @@ class AuthService:
             raise UnAuthorized()
 
         user_email = decoded_token.get("email")
+        cached = await user_cache.get(user_email)
+        if cached.value:
+            return cached.value
+
         user_repository = UserRepository(session=session)
         current_user = await user_repository.get_one(email=user_email)
 
         if not current_user:
             username = user_email.split("@")[0]
             password = str(datetime.now())
-            hashed_password = password_utils.hash_password(password)
+            hashed_password = await password_utils.hash_password(password)
 
             user_data = {
                 "username": username,
@@ -115,4 +121,11 @@ class AuthService:
             await user_repository.create_one(user_data)
             current_user = await user_repository.get_one(email=user_email)
 
+        current_user = BaseUserSchema(
+            id=current_user.id,
+            username=current_user.username,
+            email=current_user.email,
+        )
+        await user_cache.set(user_email, current_user, cached)
+
         return current_user
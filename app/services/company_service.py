@@ -1,5 +1,5 @@
 import uuid
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -17,6 +17,8 @@ from app.schemas.companies import (
     CompanyResponseSchema,
 )
 from app.schemas.users import UserSchema
+from app.utils.latest_result_cache import invalidate_latest_results
+from app.utils.leaderboard import leaderboard
 
 
 class CompanyService:
@@ -46,7 +48,7 @@ class CompanyService:
 
     # GET TOTAL COUNT
     async def get_total_count(self):
-        count = await self.repository.get_count()
+        count = await self.repository.get_cached_count()
 
         return count
 
@@ -59,6 +61,18 @@ class CompanyService:
 
             return [CompanySchema.model_validate(company) for company in companies]
 
+    # GET COMPANIES PAGE
+    async def get_companies_page(
+        self, cursor: Optional[str], limit: int, current_user: UserSchema
+    ) -> Tuple[List[CompanySchema], Optional[str]]:
+        companies, next_cursor = await self.repository.get_page(
+            cursor=cursor, limit=limit
+        )
+
+        return [
+            CompanySchema.model_validate(company) for company in companies
+        ], next_cursor
+
     # GET COMPANY BY ID
     async def get_company_by_id(
         self, company_id: uuid.UUID, current_user: UserSchema
@@ -92,6 +106,8 @@ class CompanyService:
     ) -> CompanyResponseSchema:
         company = await self.validate_company(current_user_id, company_id)
         await self.repository.delete_company(company_id)
+        await leaderboard.drop_company(company_id)
+        await invalidate_latest_results(company_id)
 
         return CompanyResponseSchema(
             id=company.id,
@@ -1,10 +1,14 @@
 import uuid
-from typing import List
+from typing import List, Optional, Tuple
 
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.conf.detail import Messages
+from app.conf.notification_template import (
+    NOTIFICATION_TEMPLATES,
+    NotificationTemplate,
+)
 from app.exept.custom_exceptions import NotFound, NotPermission
 from app.repository.company_repository import CompanyRepository
 from app.repository.notification_repository import NotificationRepository
@@ -34,22 +38,54 @@ class NotificationService:
             )
         )
 
-        notification_schemas = [
+        return self._make_notification_schemas(unread_notifications)
+
+    async def get_my_notifications_page(
+        self, current_user_id: uuid.UUID, cursor: str, limit: int
+    ) -> Tuple[List[NotificationSchema], Optional[str]]:
+        unread_notifications, next_cursor = (
+            await self.notification_repository.get_unread_page(
+                current_user_id, cursor, limit
+            )
+        )
+
+        return self._make_notification_schemas(unread_notifications), next_cursor
+
+    @staticmethod
+    def _render_text(notification) -> str:
+        if notification.text is not None:
+            return notification.text
+
+        if notification.message is not None:
+            template = NotificationTemplate(notification.message.template)
+
+            return NOTIFICATION_TEMPLATES[template].format(
+                **notification.message.params
+            )
+
+        return NOTIFICATION_TEMPLATES[NotificationTemplate.QUIZ_REMINDER].format(
+            quiz_name=notification.quiz.name
+        )
+
+    def _make_notification_schemas(
+        self, notifications: List
+    ) -> List[NotificationSchema]:
+        return [
             NotificationSchema(
                 id=field.id,
-                text=field.text,
+                text=self._render_text(field),
                 is_read=field.is_read,
                 user_id=field.user_id,
             )
-            for field in unread_notifications
+            for field in notifications
         ]
 
-        return notification_schemas
-
     async def mark_as_read(
         self, current_user_id: uuid.UUID, notification_id: uuid.UUID
     ) -> NotificationSchema:
-        notification = await self.notification_repository.get_one(id=notification_id)
+        notification = await self.notification_repository.get_notification(
+            notification_id
+        )
 
         if not notification:
             logger.info(Messages.NOT_FOUND)
@@ -65,4 +101,6 @@ class NotificationService:
         await self.notification_repository.update_one(
             notification.id, {"is_read": True}
         )
-        return notification
+        (notification_schema,) = self._make_notification_schemas([notification])
+
+        return notification_schema
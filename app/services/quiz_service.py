@@ -1,7 +1,7 @@
 import aiofiles
 import os
 import uuid
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 
 from fastapi import UploadFile
 from loguru import logger
@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.conf.detail import Messages
 from app.conf.invite import MemberStatus
+from app.conf.notification_template import NotificationTemplate
 from app.exept.custom_exceptions import NotFound, NotPermission, BadRequest
 from app.models.quiz_model import Question
 from app.repository.action_repository import ActionRepository
@@ -23,11 +24,14 @@ from app.schemas.quizzes import (
     QuizUpdateSchema,
     QuestionSchema,
     QuizResponseSchema,
-    QuizzesListResponse,
     QuizByIdSchema,
     QuestionByIdSchema,
 )
+from app.utils.answer_key_cache import answer_key_cache
+from app.utils.latest_result_cache import invalidate_latest_results
+from app.utils.leaderboard import leaderboard
 from app.utils.parse_excel import parse_excel
+from app.utils.quiz_due import DueQuiz, next_due, quiz_due_index
 
 
 class QuizService:
@@ -62,10 +66,9 @@ class QuizService:
 
         return count
 
-    # GET QUIZZES
-    async def get_quizzes(self, company_id: uuid.UUID) -> QuizzesListResponse:
-        quizzes = await self.quiz_repository.get_many(company_id=company_id)
-        quiz_responses = [
+    @staticmethod
+    def _make_quiz_responses(quizzes: List) -> List[QuizResponseSchema]:
+        return [
             QuizResponseSchema(
                 id=quiz.id,
                 name=quiz.name,
@@ -75,7 +78,15 @@ class QuizService:
             for quiz in quizzes
         ]
 
-        return quiz_responses
+    # GET QUIZZES PAGE
+    async def get_quizzes_page(
+        self, company_id: uuid.UUID, cursor: Optional[str], limit: int
+    ) -> Tuple[List[QuizResponseSchema], Optional[str]]:
+        quizzes, next_cursor = await self.quiz_repository.get_page(
+            cursor=cursor, limit=limit, company_id=company_id
+        )
+
+        return self._make_quiz_responses(quizzes), next_cursor
 
     # GET VALIDATE QUIZ DATA
     @staticmethod
@@ -127,13 +138,10 @@ class QuizService:
         await self._validate_quiz_data(quiz_data)
         await self.quiz_repository.create_quiz(quiz_data, company_id=company_id)
 
-        members = await self.company_repository.get_all_company_members(company_id)
-        user_ids = [member.user_id for member in members]
-        users = await self.user_repository.get_users_by_ids(user_ids)
-        message = f"In {company.name} company, a new quiz '{quiz_data.name}' has been created. Take it now!"
-
-        await self.notification_repository.create_notifications_for_users(
-            users, message
+        await self.notification_repository.create_company_notifications(
+            company_id,
+            NotificationTemplate.NEW_QUIZ,
+            {"company_name": company.name, "quiz_name": quiz_data.name},
         )
 
         quiz_dict = quiz_data.model_dump(exclude={"questions"})
@@ -167,6 +175,10 @@ class QuizService:
         current_user_id: uuid.UUID,
     ) -> QuizByIdSchema:
         quiz = await self._validate_quiz(quiz_id, current_user_id)
+        frequency_changed = (
+            quiz_data.frequency_days is not None
+            and quiz_data.frequency_days != quiz.frequency_days
+        )
 
         if quiz_data.name is not None:
             quiz.name = quiz_data.name
@@ -194,6 +206,13 @@ class QuizService:
 
         await self.session.commit()
         await self.session.refresh(quiz)
+        await answer_key_cache.invalidate(quiz_id)
+        if frequency_changed:
+            attempts = await self.quiz_repository.get_latest_attempts(quiz_id)
+            await quiz_due_index.schedule(
+                DueQuiz(user_id, quiz_id, next_due(created_at, quiz.frequency_days))
+                for user_id, created_at in attempts
+            )
 
         updated_quiz = await self.quiz_repository.quiz_by_id(quiz_id)
 
@@ -205,6 +224,10 @@ class QuizService:
     ) -> QuizResponseSchema:
         quiz = await self._validate_quiz(quiz_id, current_user_id)
         await self.quiz_repository.delete_quiz(quiz_id)
+        await answer_key_cache.invalidate(quiz_id)
+        await leaderboard.drop_quiz(quiz.company_id, quiz_id)
+        await invalidate_latest_results(quiz.company_id)
+
         return QuizResponseSchema(
             id=quiz.id,
             name=quiz.name,
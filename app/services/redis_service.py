@@ -1,5 +1,47 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from redis.asyncio.client import Pipeline, PubSub
+
 from app.conf.config import settings
-from app.db.redis import redis_connection
+from app.db.redis import redis_connection, redis_binary_connection
+
+
+# sorted sets missing from Redis are rebuilt in full, so they are only
+# updated in place while they exist
+ZADD_IF_EXISTS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('ZADD', KEYS[1], ARGV[1], ARGV[2])
+end
+return 0
+"""
+ZPOP_BY_SCORE_SCRIPT = """
+local items = redis.call(
+    'ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, ARGV[2]
+)
+for index = 1, #items, 2 do
+    redis.call('ZREM', KEYS[1], items[index])
+end
+return items
+"""
+# a cache fill is only written if no invalidation bumped the version since
+# the fill read it; a missing version reads as ""
+SET_IF_VERSION_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+ZSET_CHUNK_SIZE = 5000
+
+
+class IndexedRecord(NamedTuple):
+    key: str
+    serialized_result: bytes
+    expiration: int
+    index_keys: List[str]
+    score: float
 
 
 class RedisService:
@@ -7,13 +49,222 @@ class RedisService:
         self.port = settings.REDIS_PORT
         self.host = settings.REDIS_HOST
         self.connection = redis_connection
+        self.binary_connection = redis_binary_connection
+        self.zadd_if_exists_script = self.connection.register_script(
+            ZADD_IF_EXISTS_SCRIPT
+        )
+        self.zpop_by_score_script = self.connection.register_script(
+            ZPOP_BY_SCORE_SCRIPT
+        )
+        self.set_if_version_script = self.connection.register_script(
+            SET_IF_VERSION_SCRIPT
+        )
+
+    def redis_pipeline(self) -> Pipeline:
+        # helpers given this pipeline queue their commands on it, and all of
+        # them are sent in one round trip by execute()
+        return self.connection.pipeline(transaction=False)
+
+    @asynccontextmanager
+    async def _queue(
+        self, pipe: Optional[Pipeline], transaction: bool
+    ) -> AsyncIterator[Pipeline]:
+        if pipe is not None:
+            yield pipe
+            return
+
+        async with self.connection.pipeline(transaction=transaction) as own_pipe:
+            yield own_pipe
+            await own_pipe.execute()
 
     async def redis_set(self, key, serialized_result, expiration):
         await self.connection.set(key, serialized_result, ex=expiration)
 
+    async def redis_set_if_version(
+        self,
+        key: str,
+        version_key: str,
+        version: Optional[str],
+        serialized_result: str,
+        expiration: int,
+    ) -> bool:
+        stored = await self.set_if_version_script(
+            keys=[key, version_key], args=[version or "", serialized_result, expiration]
+        )
+
+        return bool(stored)
+
+    async def redis_delete_versioned(
+        self, key: str, version_key: str, expiration: int
+    ) -> None:
+        async with self.connection.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.incr(version_key)
+            pipe.expire(version_key, expiration)
+            await pipe.execute()
+
+    async def redis_set_indexed_many(self, records: List[IndexedRecord]) -> None:
+        async with self.connection.pipeline(transaction=False) as pipe:
+            for record in records:
+                pipe.set(record.key, record.serialized_result, ex=record.expiration)
+                for index_key in record.index_keys:
+                    pipe.zadd(index_key, {record.key: record.score})
+                    # drop members whose data keys have already expired
+                    pipe.zremrangebyscore(
+                        index_key, "-inf", f"({record.score - record.expiration}"
+                    )
+                    pipe.expire(index_key, record.expiration)
+            await pipe.execute()
+
+    async def redis_zrange_by_score(
+        self,
+        index_key: str,
+        min_score: float | str,
+        max_score: float | str,
+        count: int,
+    ) -> AsyncIterator[List[str]]:
+        offset = 0
+        while True:
+            keys = await self.connection.zrangebyscore(
+                index_key, min_score, max_score, start=offset, num=count
+            )
+            if keys:
+                yield keys
+            if len(keys) < count:
+                break
+            offset += count
+
     async def redis_get(self, key):
         result = await self.connection.get(key)
         return result if result else None
 
+    async def redis_hget(self, key: str, field: str) -> Optional[str]:
+        return await self.connection.hget(key, field)
+
+    async def redis_hset(self, key: str, field: str, value, expiration: int) -> None:
+        async with self.connection.pipeline(transaction=True) as pipe:
+            pipe.hset(key, field, value)
+            pipe.expire(key, expiration)
+            await pipe.execute()
+
+    async def redis_hset_keep_ttl(
+        self,
+        key: str,
+        field: str,
+        value,
+        expiration: int,
+        pipe: Optional[Pipeline] = None,
+    ) -> None:
+        async with self._queue(pipe, transaction=True) as queue:
+            queue.hset(key, field, value)
+            queue.expire(key, expiration, nx=True)
+
+    async def redis_hset_missing(
+        self, key: str, mapping: Dict, expiration: int
+    ) -> Dict[str, str]:
+        async with self.connection.pipeline(transaction=True) as pipe:
+            for field, value in mapping.items():
+                pipe.hsetnx(key, field, value)
+            pipe.expire(key, expiration)
+            pipe.hgetall(key)
+            *_, merged = await pipe.execute()
+
+        return merged
+
+    async def redis_hgetall(self, key: str) -> Dict[str, str]:
+        return await self.connection.hgetall(key)
+
+    async def redis_delete(self, *keys, pipe: Optional[Pipeline] = None):
+        await (self.connection if pipe is None else pipe).delete(*keys)
+
+    async def redis_scan(self, match: str, count: int) -> AsyncIterator[List[str]]:
+        cursor = 0
+        while True:
+            cursor, keys = await self.connection.scan(
+                cursor=cursor, match=match, count=count
+            )
+            if keys:
+                yield keys
+            if cursor == 0:
+                break
+
+    async def redis_mget(self, keys: List[str]) -> List[Optional[str]]:
+        return await self.connection.mget(keys)
+
+    async def redis_mget_raw(self, keys: List[str]) -> List[Optional[bytes]]:
+        return await self.binary_connection.mget(keys)
+
+    async def redis_exists(self, key: str) -> bool:
+        return bool(await self.connection.exists(key))
+
+    async def redis_zadd_if_exists(
+        self, key: str, member: str, score: float, pipe: Optional[Pipeline] = None
+    ) -> None:
+        await self.zadd_if_exists_script(keys=[key], args=[score, member], client=pipe)
+
+    async def redis_zadd(
+        self,
+        key: str,
+        mapping: Dict[str, float],
+        nx: bool = False,
+        pipe: Optional[Pipeline] = None,
+    ) -> None:
+        items = list(mapping.items())
+        async with self._queue(pipe, transaction=False) as queue:
+            for start in range(0, len(items), ZSET_CHUNK_SIZE):
+                queue.zadd(key, dict(items[start : start + ZSET_CHUNK_SIZE]), nx=nx)
+
+    async def redis_zpop_by_score(
+        self, key: str, max_score: float, count: int
+    ) -> List[Tuple[str, float]]:
+        items = await self.zpop_by_score_script(keys=[key], args=[max_score, count])
+
+        return [
+            (member, float(score)) for member, score in zip(items[::2], items[1::2])
+        ]
+
+    async def redis_zset_replace(self, key: str, mapping: Dict[str, float]) -> None:
+        items = list(mapping.items())
+        async with self.connection.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            for start in range(0, len(items), ZSET_CHUNK_SIZE):
+                pipe.zadd(key, dict(items[start : start + ZSET_CHUNK_SIZE]))
+            await pipe.execute()
+
+    async def redis_zrevrange(
+        self, key: str, start: int, stop: int
+    ) -> List[Tuple[str, float]]:
+        return await self.connection.zrevrange(key, start, stop, withscores=True)
+
+    async def redis_zrevrank(self, key: str, member: str) -> Optional[int]:
+        return await self.connection.zrevrank(key, member)
+
+    async def redis_zscore(self, key: str, member: str) -> Optional[float]:
+        return await self.connection.zscore(key, member)
+
+    async def redis_zcard(self, key: str) -> int:
+        return await self.connection.zcard(key)
+
+    async def redis_zrem_many(self, keys: List[str], member: str) -> None:
+        async with self.connection.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.zrem(key, member)
+            await pipe.execute()
+
+    async def redis_publish(self, channel: str, message: str) -> None:
+        await self.connection.publish(channel, message)
+
+    def redis_pubsub(self) -> PubSub:
+        return self.connection.pubsub()
+
+    async def redis_sadd(self, key: str, *members: str) -> None:
+        await self.connection.sadd(key, *members)
+
+    async def redis_srem(self, key: str, *members: str) -> None:
+        await self.connection.srem(key, *members)
+
+    async def redis_smembers(self, key: str) -> Set[str]:
+        return await self.connection.smembers(key)
+
 
 redis_service = RedisService()
@@ -1,13 +1,14 @@
-import json
 import uuid
-from datetime import timedelta
-from typing import List, Dict
+from datetime import datetime
+from typing import List, Dict, Optional
 
 from loguru import logger
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.conf.detail import Messages
 from app.conf.file_format import FileFormat
+from app.conf.time_bucket import TimeBucket
 from app.exept.custom_exceptions import (
     NotFound,
     NotPermission,
@@ -28,10 +29,36 @@ from app.schemas.results import (
     ExportedFile,
     UserQuizResultSchema,
     CompanyMemberResultSchema,
+    CompanyMemberLastResultSchema,
     QuizResultSchema,
+    LeaderboardEntrySchema,
+    LeaderboardSchema,
 )
-from app.services.redis_service import redis_service
-from app.utils.export_data import export_redis_data
+from app.repository.result_answer_repository import ResultAnswerRecord
+from app.services.redis_service import IndexedRecord, redis_service
+from app.utils.answer_detail_buffer import answer_detail_buffer
+from app.utils.answer_key_cache import AnswerKey, answer_key_cache, compile_answer_key
+from app.utils.answer_detail_codec import encode_answer_detail
+from app.utils.export_data import export_result_answers
+from app.utils.leaderboard import LeaderboardEntry, leaderboard
+from app.utils.quiz_due import DueQuiz, next_due, quiz_due_index
+from app.utils.redis_keys import (
+    QUIZ_RESULT_TTL,
+    RATING_CACHE_TTL,
+    ANALYTICS_CACHE_TTL,
+    LATEST_RESULT_TTL,
+    LATEST_RESULT_COMPLETE_FIELD,
+    quiz_result_key,
+    company_index_key,
+    user_index_key,
+    quiz_index_key,
+    company_rating_key,
+    global_rating_key,
+    company_analytics_key,
+    latest_result_key,
+    latest_result_field,
+)
+from app.utils.result_answer_writer import result_answer_writer
 
 
 class ResultService:
@@ -67,48 +94,46 @@ class ResultService:
 
         return company
 
+    async def _get_answer_key(self, quiz_id: uuid.UUID) -> AnswerKey:
+        cached = await answer_key_cache.get(quiz_id)
+        if cached.value is not None:
+            return cached.value
+
+        questions = await self.quiz_repository.get_questions_by_quiz_id(quiz_id)
+        answer_key = compile_answer_key(questions)
+        await answer_key_cache.set(quiz_id, answer_key, cached)
+
+        return answer_key
+
     async def create_result(
         self, quiz_id: uuid.UUID, current_user_id: uuid.UUID, quiz_request: QuizRequest
     ) -> ResultSchema:
-        quiz = await self.quiz_repository.get_one(id=quiz_id)
-        company_id = quiz.company_id
+        quiz = await self.quiz_repository.get_quiz_for_member(quiz_id, current_user_id)
         if quiz is None:
             logger.info(Messages.NOT_FOUND)
             raise NotFound()
 
-        member = await self._validate_is_company_member(current_user_id, company_id)
-        questions = await self.quiz_repository.get_questions_by_quiz_id(quiz_id)
-
-        redis_result = {
-            "user_id": str(current_user_id),
-            "company_id": str(company_id),
-            "quiz_id": str(quiz_id),
-            "questions": [],
-        }
-
-        total_questions = 0
-        correct_answers = 0
-
-        for question in questions:
-            total_questions += 1
-            answer = quiz_request.answers.get(question.id)
+        if quiz.company_member_id is None:
+            logger.info(Messages.NOT_PERMISSION)
+            raise NotPermission()
 
-            question_data = {
-                "question": question.question_text,
-                "user_answer": answer,
-                "is_correct": answer == question.correct_answer,
-            }
-            redis_result["questions"].append(question_data)
+        company_id = quiz.company_id
+        company_member_id = quiz.company_member_id
+        answer_key = await self._get_answer_key(quiz_id)
 
-            is_correct = set(answer) == set(question.correct_answer)
-            if is_correct:
-                correct_answers += 1
+        correct_flags = [
+            frozenset(quiz_request.answers.get(question_id) or ())
+            == question.correct_answer
+            for question_id, question in answer_key.items()
+        ]
+        total_questions = len(correct_flags)
+        correct_answers = sum(correct_flags)
 
         score = correct_answers / total_questions
         rounded_score = round(score, 2)
 
         result = Result(
-            company_member_id=member.id,
+            company_member_id=company_member_id,
             quiz_id=quiz_id,
             correct_answers=correct_answers,
             total_questions=total_questions,
@@ -116,58 +141,138 @@ class ResultService:
         )
         result_schema = ResultSchema.from_orm(result)
 
-        result = await self.result_repository.create_one(result_schema.dict())
-        result_id = str(result.id)
+        result, scores = await self.result_repository.create_result(
+            result_schema.dict()
+        )
 
-        key = f"quiz_result:{current_user_id}:{company_id}:{quiz_id}:{result_id}"
-        serialized_result = json.dumps(redis_result)
-        expiration_time_seconds = int(timedelta(hours=48).total_seconds())
-        await redis_service.redis_set(key, serialized_result, expiration_time_seconds)
+        result_answer_writer.add(
+            ResultAnswerRecord(
+                result.id,
+                question_id,
+                result.created_at,
+                position,
+                current_user_id,
+                company_id,
+                quiz_id,
+                question.question_text,
+                quiz_request.answers.get(question_id),
+                correct_flags[position],
+            )
+            for position, (question_id, question) in enumerate(answer_key.items())
+        )
+        answer_detail_buffer.add(
+            [
+                IndexedRecord(
+                    quiz_result_key(current_user_id, company_id, quiz_id, result.id),
+                    encode_answer_detail(
+                        answer_key, quiz_request.answers, correct_flags
+                    ),
+                    QUIZ_RESULT_TTL,
+                    [
+                        company_index_key(company_id),
+                        user_index_key(current_user_id),
+                        quiz_index_key(quiz_id),
+                    ],
+                    result.created_at.timestamp(),
+                )
+            ]
+        )
+        try:
+            async with redis_service.redis_pipeline() as pipe:
+                await redis_service.redis_delete(
+                    company_rating_key(current_user_id, company_id),
+                    global_rating_key(current_user_id),
+                    *(
+                        company_analytics_key(company_id, bucket.value)
+                        for bucket in TimeBucket
+                    ),
+                    pipe=pipe,
+                )
+                await redis_service.redis_hset_keep_ttl(
+                    latest_result_key(company_id),
+                    latest_result_field(company_member_id, quiz_id),
+                    result.created_at.isoformat(),
+                    LATEST_RESULT_TTL,
+                    pipe=pipe,
+                )
+                await leaderboard.record(
+                    company_id,
+                    quiz_id,
+                    current_user_id,
+                    scores.company_score,
+                    scores.quiz_score,
+                    pipe=pipe,
+                )
+                await quiz_due_index.schedule(
+                    [
+                        DueQuiz(
+                            current_user_id,
+                            quiz_id,
+                            next_due(result.created_at, quiz.frequency_days),
+                        )
+                    ],
+                    pipe=pipe,
+                )
+                await pipe.execute()
+        except RedisError as error:
+            logger.warning(f"Result caches not updated: {error}")
 
         return ResultSchema.from_orm(result)
 
+    @staticmethod
+    async def _get_cached_rating(key: str) -> Optional[float]:
+        cached_rating = await redis_service.redis_get(key)
+
+        return float(cached_rating) if cached_rating is not None else None
+
     async def get_company_rating(
-        self, current_user_id: uuid.UUID, company_id: uuid.UUID
+        self,
+        current_user_id: uuid.UUID,
+        company_id: uuid.UUID,
+        use_cache: bool = True,
     ) -> float:
         company = await self.company_repository.get_one(id=company_id)
         if not company:
             logger.info(Messages.NOT_FOUND)
             raise NotFound()
-        member = await self._validate_is_company_member(current_user_id, company.id)
-        results = await self.result_repository.get_many(company_member_id=member.id)
-        if not results:
-            logger.info(Messages.NOT_FOUND)
-            raise NotFound()
-
-        total_score = sum(result.score for result in results)
-        average_score = (
-            (round(total_score / len(results)), 2) if len(results) > 0 else 0.0
-        )
+        await self._validate_is_company_member(current_user_id, company.id)
 
-        return average_score
+        key = company_rating_key(current_user_id, company.id)
+        if use_cache:
+            cached_rating = await self._get_cached_rating(key)
+            if cached_rating is not None:
+                return cached_rating
 
-    async def get_global_rating(self, current_user_id: uuid.UUID) -> float:
-        members = await self.user_repository.get_company_members_by_user_id(
-            current_user_id
+        average_score = await self.result_repository.get_member_rating(
+            current_user_id, company.id
         )
-        if not members:
+        if average_score is None:
             logger.info(Messages.NOT_FOUND)
             raise NotFound()
-        total_average_score = 0
-        total_count = 0
-        for member in members:
-            results = await self.result_repository.get_many(company_member_id=member.id)
-            if results:
-                total_score = sum(result.score for result in results)
-                average_score = total_score / len(results)
-                total_average_score += average_score
-                total_count += 1
-        if total_count == 0:
+
+        rating = round(average_score, 2)
+        await redis_service.redis_set(key, rating, RATING_CACHE_TTL)
+
+        return rating
+
+    async def get_global_rating(
+        self, current_user_id: uuid.UUID, use_cache: bool = True
+    ) -> float:
+        key = global_rating_key(current_user_id)
+        if use_cache:
+            cached_rating = await self._get_cached_rating(key)
+            if cached_rating is not None:
+                return cached_rating
+
+        average_score = await self.result_repository.get_global_rating(current_user_id)
+        if average_score is None:
             logger.info(Messages.NOT_FOUND)
             raise NotFound()
-        global_average_score = round((total_average_score / total_count), 2)
 
-        return global_average_score
+        rating = round(average_score, 2)
+        await redis_service.redis_set(key, rating, RATING_CACHE_TTL)
+
+        return rating
 
     async def _validate_export(
         self, company_id: uuid.UUID, current_user_id: uuid.UUID
@@ -192,12 +297,19 @@ class ResultService:
             raise BadRequest()
 
     async def company_answers_list(
-        self, company_id: uuid.UUID, file_format: FileFormat, current_user_id: uuid.UUID
+        self,
+        company_id: uuid.UUID,
+        file_format: FileFormat,
+        current_user_id: uuid.UUID,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
     ) -> ExportedFile:
+        await self._check_export_format(file_format)
         await self._validate_export(company_id, current_user_id)
-        query = f"quiz_result:*:{company_id}:*"
 
-        return await export_redis_data(query=query, file_format=file_format)
+        return await export_result_answers(
+            file_format, company_id=company_id, start=start, end=end
+        )
 
     async def user_answers_list(
         self,
@@ -205,51 +317,53 @@ class ResultService:
         user_id: uuid.UUID,
         file_format: FileFormat,
         current_user_id: uuid.UUID,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
     ) -> ExportedFile:
+        await self._check_export_format(file_format)
         await self._validate_export(company_id, current_user_id)
         user = await self.user_repository.get_one(id=user_id)
         if not user:
             logger.info(Messages.USER_NOT_FOUND)
             raise UserNotFound()
-        query = f"quiz_result:{user_id}:{company_id}:*"
 
-        return await export_redis_data(query=query, file_format=file_format)
+        return await export_result_answers(
+            file_format, company_id=company_id, user_id=user_id, start=start, end=end
+        )
 
-    async def my_answers_list(self, current_user_id, file_format) -> ExportedFile:
+    async def my_answers_list(
+        self,
+        current_user_id: uuid.UUID,
+        file_format: FileFormat,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> ExportedFile:
         await self._check_export_format(file_format)
         await self.user_repository.get_one(id=current_user_id)
-        query = f"quiz_result:{current_user_id}:*:*"
 
-        return await export_redis_data(query=query, file_format=file_format)
+        return await export_result_answers(
+            file_format, user_id=current_user_id, start=start, end=end
+        )
 
     @staticmethod
-    async def _make_chart_data(results: List) -> Dict:
-        chart_data = {}
-        current_total_questions = 0
-        current_correct_answers = 0
-        for result in results:
-            current_total_questions += result.total_questions
-            current_correct_answers += result.correct_answers
-            chart_data[result.created_at] = round(
-                (current_correct_answers / current_total_questions), 2
-            )
-
-        return chart_data
+    def _make_chart_data(rows: List) -> Dict:
+        return {row.created_at: round(row.score, 2) for row in rows}
 
     async def my_quiz_results(
-        self, current_user_id, quiz_id: uuid.UUID
+        self, current_user_id, quiz_id: uuid.UUID, points: Optional[int] = None
     ) -> QuizResultSchema:
         quiz = await self.quiz_repository.get_one(id=quiz_id)
-        company_id = quiz.company_id
         if not quiz:
             logger.info(Messages.NOT_FOUND)
             raise NotFound()
 
-        member = await self._validate_is_company_member(current_user_id, company_id)
-        results = await self.result_repository.get_many(
-            company_member_id=member.id, quiz_id=quiz_id
+        member = await self._validate_is_company_member(
+            current_user_id, quiz.company_id
+        )
+        rows = await self.result_repository.get_cumulative_scores(
+            member.id, quiz_id=quiz_id, points=points
         )
-        chart_data = await self._make_chart_data(results)
+        chart_data = self._make_chart_data(rows)
 
         result_data = QuizResultSchema(
             data=chart_data,
@@ -257,7 +371,6 @@ class ResultService:
 
         return result_data
 
-      
     async def my_quizzes_latest_results(
         self, current_user_id: uuid.UUID
     ) -> QuizResultSchema:
@@ -313,8 +426,12 @@ class ResultService:
             raise NotPermission()
 
     async def company_member_results(
-        self, company_id: uuid.UUID, company_member_id, current_user_id: uuid.UUID
-    ) -> CompanyMemberResultSchema:
+        self,
+        company_id: uuid.UUID,
+        company_member_id,
+        current_user_id: uuid.UUID,
+        points: Optional[int] = None,
+    ) -> QuizResultSchema:
 
         await self._get_company_or_raise(company_id)
         await self._validate_company_owner_analytics(current_user_id, company_id)
@@ -325,34 +442,168 @@ class ResultService:
             logger.info(Messages.NOT_FOUND)
             raise NotFound
 
-        results = await self.result_repository.get_many(company_member_id=member.id)
-        chart_data = await self._make_chart_data(results)
-        result_data = CompanyMemberResultSchema(
+        rows = await self.result_repository.get_cumulative_scores(
+            member.id, points=points
+        )
+        chart_data = self._make_chart_data(rows)
+        result_data = QuizResultSchema(
             data=chart_data,
         )
 
         return result_data
 
+    async def company_members_results(
+        self,
+        current_user_id: uuid.UUID,
+        company_id: uuid.UUID,
+        bucket: TimeBucket = TimeBucket.DAY,
+    ) -> CompanyMemberResultSchema:
+        await self._get_company_or_raise(company_id)
+        await self._validate_company_owner_analytics(current_user_id, company_id)
+
+        key = company_analytics_key(company_id, bucket.value)
+        cached_data = await redis_service.redis_get(key)
+        if cached_data is not None:
+            return CompanyMemberResultSchema.model_validate_json(cached_data)
+
+        rows = await self.result_repository.get_company_bucketed_scores(
+            company_id, bucket.value
+        )
+        results_dict = {}
+        for row in rows:
+            member_data = results_dict.setdefault(str(row.user_id), {})
+            member_data[row.bucket] = round(row.average_score, 2)
+
+        result_data = CompanyMemberResultSchema(data=results_dict)
+        await redis_service.redis_set(
+            key, result_data.model_dump_json(), ANALYTICS_CACHE_TTL
+        )
+
+        return result_data
+
+    async def _get_latest_results(self, company_id: uuid.UUID) -> Dict[str, str]:
+        key = latest_result_key(company_id)
+        latest_results = await redis_service.redis_hgetall(key)
+        # a hash without the marker only holds fields written by create_result
+        if latest_results.pop(LATEST_RESULT_COMPLETE_FIELD, None) is not None:
+            return latest_results
+
+        rows = await self.result_repository.get_latest_results_for_company(company_id)
+        latest_results = {
+            latest_result_field(row.company_member_id, row.quiz_id): (
+                row.created_at.isoformat()
+            )
+            for row in rows
+        }
+        # fields written by create_result meanwhile are newer than the snapshot
+        latest_results = await redis_service.redis_hset_missing(
+            key,
+            {**latest_results, LATEST_RESULT_COMPLETE_FIELD: 1},
+            LATEST_RESULT_TTL,
+        )
+        latest_results.pop(LATEST_RESULT_COMPLETE_FIELD, None)
+
+        return latest_results
+
     async def company_members_result_last(
         self, company_id: uuid.UUID, current_user_id: uuid.UUID
-    ) -> CompanyMemberResultSchema:
+    ) -> CompanyMemberLastResultSchema:
 
         await self._get_company_or_raise(company_id)
         await self._validate_company_owner_analytics(current_user_id, company_id)
 
-        latest_results = await self.result_repository.get_latest_results_for_company(
-            company_id
-        )
+        latest_results = await self._get_latest_results(company_id)
         results_dict = {}
 
-        for result in latest_results:
-            user_id = result.company_member_id
-            if user_id not in results_dict:
-                results_dict[user_id] = {}
-            results_dict[user_id][result.quiz_id] = result.created_at
+        for field, created_at in latest_results.items():
+            company_member_id, quiz_id = field.split(":")
+            results_dict.setdefault(company_member_id, {})[quiz_id] = created_at
 
-        result_data = CompanyMemberResultSchema(
+        result_data = CompanyMemberLastResultSchema(
             data=results_dict,
         )
 
         return result_data
+
+    async def rebuild_leaderboard(
+        self, company_id: uuid.UUID, quiz_id: Optional[uuid.UUID] = None
+    ) -> None:
+        rows = await self.result_repository.get_leaderboard_scores(company_id, quiz_id)
+        await leaderboard.replace(
+            company_id, quiz_id, {row.user_id: row.score for row in rows}
+        )
+
+    async def _prepare_leaderboard(
+        self,
+        current_user_id: uuid.UUID,
+        company_id: uuid.UUID,
+        quiz_id: Optional[uuid.UUID],
+    ) -> None:
+        await self._get_company_or_raise(company_id)
+        await self._validate_is_company_member(current_user_id, company_id)
+        if quiz_id is not None:
+            quiz = await self.quiz_repository.get_one(id=quiz_id)
+            if not quiz or quiz.company_id != company_id:
+                logger.info(Messages.NOT_FOUND)
+                raise NotFound()
+
+        if not await leaderboard.exists(company_id, quiz_id):
+            await self.rebuild_leaderboard(company_id, quiz_id)
+
+    @staticmethod
+    def _make_leaderboard_entry(entry: LeaderboardEntry) -> LeaderboardEntrySchema:
+        return LeaderboardEntrySchema(
+            user_id=entry.user_id, rank=entry.rank, score=round(entry.score, 2)
+        )
+
+    def _make_leaderboard(
+        self, total: int, entries: List[LeaderboardEntry]
+    ) -> LeaderboardSchema:
+        return LeaderboardSchema(
+            total=total,
+            entries=[self._make_leaderboard_entry(entry) for entry in entries],
+        )
+
+    async def leaderboard_top(
+        self,
+        current_user_id: uuid.UUID,
+        company_id: uuid.UUID,
+        quiz_id: Optional[uuid.UUID] = None,
+        limit: int = 10,
+    ) -> LeaderboardSchema:
+        await self._prepare_leaderboard(current_user_id, company_id, quiz_id)
+        entries = await leaderboard.top(company_id, quiz_id, limit)
+        total = await leaderboard.size(company_id, quiz_id)
+
+        return self._make_leaderboard(total, entries)
+
+    async def leaderboard_around_me(
+        self,
+        current_user_id: uuid.UUID,
+        company_id: uuid.UUID,
+        quiz_id: Optional[uuid.UUID] = None,
+        radius: int = 5,
+    ) -> LeaderboardSchema:
+        await self._prepare_leaderboard(current_user_id, company_id, quiz_id)
+        entries = await leaderboard.around(company_id, quiz_id, current_user_id, radius)
+        if not entries:
+            logger.info(Messages.NOT_FOUND)
+            raise NotFound()
+        total = await leaderboard.size(company_id, quiz_id)
+
+        return self._make_leaderboard(total, entries)
+
+    async def leaderboard_member_rank(
+        self,
+        current_user_id: uuid.UUID,
+        company_id: uuid.UUID,
+        user_id: uuid.UUID,
+        quiz_id: Optional[uuid.UUID] = None,
+    ) -> LeaderboardEntrySchema:
+        await self._prepare_leaderboard(current_user_id, company_id, quiz_id)
+        entry = await leaderboard.rank(company_id, quiz_id, user_id)
+        if entry is None:
+            logger.info(Messages.NOT_FOUND)
+            raise NotFound()
+
+        return self._make_leaderboard_entry(entry)
@@ -1,5 +1,5 @@
 import uuid
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -16,6 +16,7 @@ from app.exept.custom_exceptions import (
     IncorrectPassword,
 )
 from app.utils import password_utils
+from app.utils.user_cache import user_cache
 
 
 class UserService:
@@ -41,7 +42,7 @@ class UserService:
 
     # GET TOTAL COUNT
     async def get_total_count(self):
-        count = await self.repository.get_count()
+        count = await self.repository.get_cached_count()
 
         return count
 
@@ -51,6 +52,14 @@ class UserService:
 
         return [UserSchema.model_validate(user) for user in users]
 
+    # GET USERS PAGE
+    async def get_users_page(
+        self, cursor: Optional[str], limit: int
+    ) -> Tuple[List[UserSchema], Optional[str]]:
+        users, next_cursor = await self.repository.get_page(cursor=cursor, limit=limit)
+
+        return [UserSchema.model_validate(user) for user in users], next_cursor
+
     # GET USER BY ID
     async def get_user_by_id(
         self, user_id: uuid.UUID, current_user: UserSchema
@@ -82,13 +91,15 @@ class UserService:
             update_dict["username"] = update_data.username
 
         if update_data.password and update_data.new_password:
-            if not password_utils.validate_password(
+            if not await password_utils.validate_password(
                 update_data.password, user.password
             ):
                 logger.info(Messages.INCORRECT_PASSWORD)
                 raise IncorrectPassword()
 
-            hashed_password = password_utils.hash_password(update_data.new_password)
+            hashed_password = await password_utils.hash_password(
+                update_data.new_password
+            )
             update_dict["password"] = hashed_password.decode("utf-8")
 
         if not update_dict:
@@ -96,6 +107,7 @@ class UserService:
             raise NotFound()
 
         updated_user = await self.repository.update_one(user_id, update_dict)
+        await user_cache.invalidate(user.email)
 
         return UserSchema.model_validate(updated_user)
 
@@ -104,6 +116,8 @@ class UserService:
         self, user_id: uuid.UUID, current_user: UserSchema
     ) -> BaseUserSchema:
         await self.check_user_permission(user_id, current_user)
-        await self._get_user_or_raise(user_id)
+        user = await self._get_user_or_raise(user_id)
+        deleted_user = await self.repository.delete_one(user_id)
+        await user_cache.invalidate(user.email)
 
-        return await self.repository.delete_one(user_id)
+        return deleted_user
@@ -0,0 +1,22 @@
+from typing import List
+
+from redis.exceptions import RedisError
+
+from app.conf.config import settings
+from app.services.redis_service import IndexedRecord, redis_service
+from app.utils.write_behind import WriteBehindBuffer
+
+
+class AnswerDetailBuffer(WriteBehindBuffer[IndexedRecord]):
+    name = "answer_detail"
+    retry_errors = (RedisError,)
+
+    async def _write(self, batch: List[IndexedRecord]) -> None:
+        await redis_service.redis_set_indexed_many(batch)
+
+
+answer_detail_buffer = AnswerDetailBuffer(
+    batch_size=settings.ANSWER_DETAIL_BATCH_SIZE,
+    flush_interval=settings.ANSWER_DETAIL_FLUSH_INTERVAL,
+    max_pending=settings.ANSWER_DETAIL_MAX_PENDING,
+)
@@ -0,0 +1,107 @@
+import json
+import uuid
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import msgpack
+
+from app.utils.answer_key_cache import AnswerKey
+
+ENCODING_VERSION = 1
+# first byte of an encoded value; legacy JSON values start with "{"
+RAW_FORMAT = b"\x01"
+ZLIB_FORMAT = b"\x02"
+
+
+def _encode_answer(
+    answer: Optional[List[str]], answer_options: Tuple[str, ...]
+) -> Optional[int | List[str]]:
+    if answer is None:
+        return None
+
+    if not all(option in answer_options for option in answer):
+        return list(answer)
+
+    mask = 0
+    for option in answer:
+        mask |= 1 << answer_options.index(option)
+
+    return mask
+
+
+def _decode_answer(
+    answer: Optional[int | List[str]], answer_options: Tuple[str, ...]
+) -> Optional[List[str]]:
+    if not isinstance(answer, int):
+        return answer
+
+    return [
+        option for index, option in enumerate(answer_options) if answer & (1 << index)
+    ]
+
+
+def encode_answer_detail(
+    answer_key: AnswerKey,
+    answers: Dict[uuid.UUID, List[str]],
+    correct_flags: Sequence[bool],
+) -> bytes:
+    entries = []
+    correct_mask = 0
+    for position, (question_id, question) in enumerate(answer_key.items()):
+        entries.append(
+            [
+                question_id.bytes,
+                _encode_answer(answers.get(question_id), question.answer_options),
+            ]
+        )
+        if correct_flags[position]:
+            correct_mask |= 1 << position
+
+    payload = msgpack.packb([ENCODING_VERSION, entries, correct_mask])
+    compressed_payload = zlib.compress(payload)
+    if len(compressed_payload) < len(payload):
+        return ZLIB_FORMAT + compressed_payload
+
+    return RAW_FORMAT + payload
+
+
+def parse_quiz_result_key(key: str) -> Tuple[str, str, str]:
+    _, user_id, company_id, quiz_id, _ = key.split(":")
+
+    return user_id, company_id, quiz_id
+
+
+def decode_answer_detail(
+    key: str, serialized_data: bytes, answer_key: Optional[AnswerKey]
+) -> Dict:
+    if serialized_data[:1] == b"{":
+        return json.loads(serialized_data)
+
+    payload = serialized_data[1:]
+    if serialized_data[:1] == ZLIB_FORMAT:
+        payload = zlib.decompress(payload)
+    _, entries, correct_mask = msgpack.unpackb(payload)
+
+    user_id, company_id, quiz_id = parse_quiz_result_key(key)
+    questions = []
+    for position, (question_id, answer) in enumerate(entries):
+        # the quiz may have been edited or deleted since the attempt
+        question = (answer_key or {}).get(uuid.UUID(bytes=question_id))
+        questions.append(
+            {
+                "question": question.question_text if question else None,
+                "user_answer": (
+                    _decode_answer(answer, question.answer_options)
+                    if question
+                    else None
+                ),
+                "is_correct": bool(correct_mask & (1 << position)),
+            }
+        )
+
+    return {
+        "user_id": user_id,
+        "company_id": company_id,
+        "quiz_id": quiz_id,
+        "questions": questions,
+    }
@@ -0,0 +1,75 @@
+import json
+import uuid
+from typing import Dict, FrozenSet, List, NamedTuple, Tuple
+
+from app.conf.config import settings
+from app.utils.cache_invalidation import cache_invalidation
+from app.utils.redis_keys import answer_key_key
+from app.utils.two_tier_cache import TwoTierCache
+
+ANSWER_KEY_CACHE_NAME = "answer_key"
+
+
+class AnswerKeyEntry(NamedTuple):
+    question_text: str
+    correct_answer: FrozenSet[str]
+    answer_options: Tuple[str, ...]
+
+
+AnswerKey = Dict[uuid.UUID, AnswerKeyEntry]
+
+
+def compile_answer_key(questions: List) -> AnswerKey:
+    return {
+        question.id: AnswerKeyEntry(
+            question.question_text,
+            frozenset(question.correct_answer),
+            tuple(question.answer_options),
+        )
+        for question in questions
+    }
+
+
+def _serialize(answer_key: AnswerKey) -> str:
+    return json.dumps(
+        {
+            str(question_id): [
+                entry.question_text,
+                sorted(entry.correct_answer),
+                entry.answer_options,
+            ]
+            for question_id, entry in answer_key.items()
+        }
+    )
+
+
+def _deserialize(serialized_answer_key: str) -> AnswerKey:
+    return {
+        uuid.UUID(question_id): AnswerKeyEntry(
+            question_text, frozenset(correct), tuple(answer_options)
+        )
+        for question_id, (question_text, correct, answer_options) in json.loads(
+            serialized_answer_key
+        ).items()
+    }
+
+
+class AnswerKeyCache(TwoTierCache[uuid.UUID, AnswerKey]):
+    name = ANSWER_KEY_CACHE_NAME
+
+    def _key(self, quiz_id: uuid.UUID) -> str:
+        return answer_key_key(quiz_id)
+
+    def _serialize(self, answer_key: AnswerKey) -> str:
+        return _serialize(answer_key)
+
+    def _deserialize(self, serialized_answer_key: str) -> AnswerKey:
+        return _deserialize(serialized_answer_key)
+
+
+answer_key_cache = AnswerKeyCache(
+    max_size=settings.ANSWER_KEY_CACHE_SIZE,
+    local_ttl=settings.ANSWER_KEY_CACHE_LOCAL_TTL,
+    ttl=settings.ANSWER_KEY_CACHE_TTL,
+)
+cache_invalidation.register(ANSWER_KEY_CACHE_NAME, answer_key_cache)
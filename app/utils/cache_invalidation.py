@@ -0,0 +1,80 @@
+import asyncio
+import contextlib
+from typing import Dict, Protocol
+
+from loguru import logger
+from redis.exceptions import RedisError
+
+from app.conf.config import settings
+from app.services.redis_service import redis_service
+from app.utils.redis_keys import CACHE_INVALIDATION_CHANNEL
+
+
+class LocallyCached(Protocol):
+    def evict_local(self, key: str) -> None: ...
+
+    def clear_local(self) -> None: ...
+
+
+class CacheInvalidation:
+    def __init__(self):
+        # bumped on every eviction, so a value read from Redis while an
+        # invalidation arrived is not kept locally
+        self.generation = 0
+        self.is_listening = False
+        self._caches: Dict[str, LocallyCached] = {}
+        self._task = None
+
+    def register(self, name: str, cache: LocallyCached) -> None:
+        self._caches[name] = cache
+
+    async def publish(self, name: str, key: str) -> None:
+        await redis_service.redis_publish(CACHE_INVALIDATION_CHANNEL, f"{name}:{key}")
+
+    def _evict(self, message: str) -> None:
+        name, key = message.split(":", 1)
+        self.generation += 1
+        cache = self._caches.get(name)
+        if cache is not None:
+            cache.evict_local(key)
+
+    def _reset(self) -> None:
+        # invalidations are missed while unsubscribed, so local entries are
+        # dropped and not used again until the subscription is back
+        self.is_listening = False
+        self.generation += 1
+        for cache in self._caches.values():
+            cache.clear_local()
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = redis_service.redis_pubsub()
+            try:
+                await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        self.is_listening = True
+                    elif message["type"] == "message":
+                        self._evict(message["data"])
+            except (RedisError, OSError) as error:
+                logger.warning(f"Cache invalidation unavailable: {error}")
+            finally:
+                self._reset()
+                await pubsub.aclose()
+
+            await asyncio.sleep(settings.CACHE_INVALIDATION_RETRY_SECONDS)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+
+cache_invalidation = CacheInvalidation()
@@ -1,17 +1,84 @@
 import asyncio
+import random
+from datetime import datetime, timedelta, timezone
 
 from celery import Celery
 from celery.schedules import crontab
 
 from app.conf.config import settings
-from app.core.celery_tasks import notifications_quiz_task
+from app.core.celery_tasks import (
+    pending_reminder_shards_task,
+    quiz_reminders_shard_task,
+    send_due_quiz_reminders_task,
+    rebuild_quiz_due_task,
+    backfill_member_ratings_task,
+    maintain_result_answer_partitions_task,
+    maintain_results_partitions_task,
+    rebuild_leaderboards_task,
+)
+from app.db.connection import engine
+from app.db.redis import redis_connection
 
 celery = Celery("tasks", broker=settings.CELERY_BROKER_URL)
 
 
+def run_async(coroutine):
+    async def run():
+        try:
+            return await coroutine
+        finally:
+            # every task gets a new event loop, and pooled connections are
+            # bound to the loop that opened them
+            await engine.dispose()
+            await redis_connection.connection_pool.disconnect()
+
+    return asyncio.run(run())
+
+
 @celery.task
 def send_notifications():
-    asyncio.run(notifications_quiz_task())
+    run_date = datetime.now(timezone.utc).date().isoformat()
+    # shards finished earlier in the day are skipped, so a rerun resumes
+    for shard in run_async(pending_reminder_shards_task(run_date)):
+        send_quiz_reminders_shard.apply_async(
+            (run_date, shard),
+            countdown=random.uniform(0, settings.REMINDER_WINDOW_SECONDS),
+        )
+
+
+@celery.task(acks_late=True, reject_on_worker_lost=True)
+def send_quiz_reminders_shard(run_date: str, shard: int):
+    run_async(quiz_reminders_shard_task(run_date, shard))
+
+
+@celery.task
+def send_due_quiz_reminders():
+    run_async(send_due_quiz_reminders_task())
+
+
+@celery.task
+def rebuild_quiz_due():
+    run_async(rebuild_quiz_due_task())
+
+
+@celery.task
+def backfill_member_ratings():
+    run_async(backfill_member_ratings_task())
+
+
+@celery.task
+def maintain_result_answer_partitions():
+    run_async(maintain_result_answer_partitions_task())
+
+
+@celery.task
+def maintain_results_partitions():
+    run_async(maintain_results_partitions_task())
+
+
+@celery.task
+def rebuild_leaderboards():
+    run_async(rebuild_leaderboards_task())
 
 
 celery.conf.beat_schedule = {
@@ -19,4 +86,20 @@ celery.conf.beat_schedule = {
         "task": "app.utils.celery_service.send_notifications",
         "schedule": crontab(hour="0", minute="0"),
     },
+    "send-due-quiz-reminders": {
+        "task": "app.utils.celery_service.send_due_quiz_reminders",
+        "schedule": timedelta(seconds=settings.QUIZ_DUE_POLL_SECONDS),
+    },
+    "rebuild-quiz-due": {
+        "task": "app.utils.celery_service.rebuild_quiz_due",
+        "schedule": crontab(hour="0", minute="0"),
+    },
+    "maintain-result-answer-partitions": {
+        "task": "app.utils.celery_service.maintain_result_answer_partitions",
+        "schedule": crontab(hour="1", minute="0"),
+    },
+    "maintain-results-partitions": {
+        "task": "app.utils.celery_service.maintain_results_partitions",
+        "schedule": crontab(hour="1", minute="30"),
+    },
 }
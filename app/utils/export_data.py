@@ -1,64 +1,195 @@
-import json
 import csv
-import tempfile
-from fastapi.responses import FileResponse
+import io
+import json
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from fastapi.responses import StreamingResponse
 
 from app.conf.file_format import FileFormat
-from app.services.redis_service import RedisService
+from app.db.connection import async_session
+from app.repository.result_answer_repository import ResultAnswerRepository
 from app.schemas.results import ExportedFile
+from app.services.redis_service import redis_service
+from app.utils.answer_detail_codec import decode_answer_detail, parse_quiz_result_key
+from app.utils.answer_key_cache import AnswerKey
 
+EXPORT_BATCH_SIZE = 500
 
-async def export_redis_data(query: str, file_format: FileFormat) -> ExportedFile:
-    redis_service = RedisService()
-    keys = await redis_service.connection.keys(query)
-    data = []
+AnswerKeyLoader = Callable[[uuid.UUID], Awaitable[AnswerKey]]
 
-    for key in keys:
-        serialized_data = await redis_service.redis_get(key)
-        data.append(json.loads(serialized_data))
+CSV_FIELDNAMES = [
+    "user_id",
+    "company_id",
+    "quiz_id",
+    "question",
+    "answer",
+    "is_true",
+]
 
-    if file_format == FileFormat.JSON:
-        temp_json_file = tempfile.NamedTemporaryFile(
-            delete=False, mode="w", suffix=".json"
+
+async def _iter_redis_records(
+    key_batches: AsyncIterator[List[str]], load_answer_key: AnswerKeyLoader
+) -> AsyncIterator[Dict]:
+    answer_keys = {}
+    async for keys in key_batches:
+        values = await redis_service.redis_mget_raw(keys)
+        for key, serialized_data in zip(keys, values):
+            # key may have expired between listing and MGET
+            if not serialized_data:
+                continue
+
+            quiz_id = uuid.UUID(parse_quiz_result_key(key)[2])
+            if quiz_id not in answer_keys:
+                answer_keys[quiz_id] = await load_answer_key(quiz_id)
+
+            yield decode_answer_detail(key, serialized_data, answer_keys[quiz_id])
+
+
+async def _iter_result_records(
+    company_id: Optional[uuid.UUID] = None,
+    user_id: Optional[uuid.UUID] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> AsyncIterator[Dict]:
+    # the request session is already closed while the response streams
+    async with async_session() as session:
+        rows = ResultAnswerRepository(session).stream_answers(
+            EXPORT_BATCH_SIZE, company_id, user_id, start, end
         )
-        json.dump(data, temp_json_file, indent=2)
-        temp_json_file.close()
+        record = None
+        async for row in rows:
+            if record is None or record["result_id"] != row.result_id:
+                if record is not None:
+                    del record["result_id"]
+                    yield record
+                record = {
+                    "result_id": row.result_id,
+                    "user_id": str(row.user_id),
+                    "company_id": str(row.company_id),
+                    "quiz_id": str(row.quiz_id),
+                    "questions": [],
+                }
+
+            record["questions"].append(
+                {
+                    "question": row.question_text,
+                    "user_answer": row.user_answer,
+                    "is_correct": row.is_correct,
+                }
+            )
+
+        if record is not None:
+            del record["result_id"]
+            yield record
+
+
+async def _stream_json(records: AsyncIterator[Dict]) -> AsyncIterator[str]:
+    yield "["
+    separator = ""
+    async for item in records:
+        yield separator + json.dumps(item)
+        separator = ","
+    yield "]"
+
+
+def _drain(buffer: io.StringIO) -> str:
+    chunk = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+
+    return chunk
+
 
-        return FileResponse(temp_json_file.name, filename="quiz_results.json")
+async def _stream_csv(records: AsyncIterator[Dict]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDNAMES)
+    writer.writeheader()
+    yield _drain(buffer)
+
+    async for item in records:
+        for question_data in item["questions"]:
+            writer.writerow(
+                {
+                    "user_id": item["user_id"],
+                    "company_id": item["company_id"],
+                    "quiz_id": item["quiz_id"],
+                    "question": question_data["question"],
+                    "answer": question_data["user_answer"],
+                    "is_true": question_data["is_correct"],
+                }
+            )
+        yield _drain(buffer)
+
+
+def _stream_response(
+    records: AsyncIterator[Dict], file_format: FileFormat
+) -> StreamingResponse:
+    if file_format == FileFormat.JSON:
+        content = _stream_json(records)
+        media_type = "application/json"
+        filename = "quiz_results.json"
 
     elif file_format == FileFormat.CSV:
-        with tempfile.NamedTemporaryFile(
-            delete=False, mode="w", suffix=".csv"
-        ) as temp_csv_file:
-            fieldnames = [
-                "user_id",
-                "company_id",
-                "quiz_id",
-                "question",
-                "answer",
-                "is_true",
-            ]
-            writer = csv.DictWriter(temp_csv_file, fieldnames=fieldnames)
-            writer.writeheader()
-            for item in data:
-                user_id = item["user_id"]
-                company_id = item["company_id"]
-                quiz_id = item["quiz_id"]
-                questions = item["questions"]
-                for question_data in questions:
-                    question = question_data["question"]
-                    answer = question_data["user_answer"]
-                    is_true = question_data["is_correct"]
-
-                    writer.writerow(
-                        {
-                            "user_id": user_id,
-                            "company_id": company_id,
-                            "quiz_id": quiz_id,
-                            "question": question,
-                            "answer": answer,
-                            "is_true": is_true,
-                        }
-                    )
-
-        return FileResponse(temp_csv_file.name, filename="quiz_results.csv")
+        content = _stream_csv(records)
+        media_type = "text/csv"
+        filename = "quiz_results.csv"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def _filter_prefix(
+    key_batches: AsyncIterator[List[str]], key_prefix: str
+) -> AsyncIterator[List[str]]:
+    async for keys in key_batches:
+        keys = [key for key in keys if key.startswith(key_prefix)]
+        if keys:
+            yield keys
+
+
+async def export_redis_data(
+    query: str, file_format: FileFormat, load_answer_key: AnswerKeyLoader
+) -> ExportedFile:
+    key_batches = redis_service.redis_scan(query, EXPORT_BATCH_SIZE)
+
+    return _stream_response(
+        _iter_redis_records(key_batches, load_answer_key), file_format
+    )
+
+
+async def export_redis_index(
+    index_key: str,
+    file_format: FileFormat,
+    load_answer_key: AnswerKeyLoader,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    key_prefix: Optional[str] = None,
+) -> ExportedFile:
+    min_score = start.timestamp() if start else "-inf"
+    max_score = end.timestamp() if end else "+inf"
+    key_batches = redis_service.redis_zrange_by_score(
+        index_key, min_score, max_score, EXPORT_BATCH_SIZE
+    )
+    if key_prefix:
+        key_batches = _filter_prefix(key_batches, key_prefix)
+
+    return _stream_response(
+        _iter_redis_records(key_batches, load_answer_key), file_format
+    )
+
+
+async def export_result_answers(
+    file_format: FileFormat,
+    company_id: Optional[uuid.UUID] = None,
+    user_id: Optional[uuid.UUID] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> ExportedFile:
+    records = _iter_result_records(company_id, user_id, start, end)
+
+    return _stream_response(records, file_format)
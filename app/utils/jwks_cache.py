@@ -0,0 +1,87 @@
+import asyncio
+import time
+from typing import Callable, Dict, Optional
+
+from jwt import PyJWK, PyJWKClient, PyJWKClientError, PyJWKSet
+from loguru import logger
+
+from app.conf.config import settings
+
+
+class JWKSCache:
+    def __init__(
+        self,
+        fetch_jwk_set: Callable[[], PyJWKSet],
+        ttl: int,
+        refresh_margin: int,
+        min_refetch_interval: int,
+    ):
+        self.fetch_jwk_set = fetch_jwk_set
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.min_refetch_interval = min_refetch_interval
+        self._keys: Dict[str, PyJWK] = {}
+        self._fetched_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def _refresh(self) -> None:
+        fetched_at = self._fetched_at
+        async with self._lock:
+            # another request refreshed the keys while this one waited
+            if self._fetched_at != fetched_at:
+                return
+
+            # the fetch is blocking HTTP, keep it off the event loop
+            jwk_set = await asyncio.to_thread(self.fetch_jwk_set)
+            self._keys = {key.key_id: key for key in jwk_set.keys if key.key_id}
+            self._fetched_at = time.monotonic()
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self._refresh()
+        except Exception as error:
+            logger.warning(f"JWKS background refresh failed: {error}")
+
+    def _age(self) -> float:
+        if self._fetched_at is None:
+            return float("inf")
+
+        return time.monotonic() - self._fetched_at
+
+    async def get_signing_key(self, kid: str) -> PyJWK:
+        age = self._age()
+        if age >= self.ttl:
+            await self._refresh()
+
+        elif age >= self.ttl - self.refresh_margin and (
+            self._refresh_task is None or self._refresh_task.done()
+        ):
+            self._refresh_task = asyncio.create_task(self._background_refresh())
+
+        signing_key = self._keys.get(kid)
+        # keys may have rotated since the last fetch
+        if signing_key is None and self._age() >= self.min_refetch_interval:
+            await self._refresh()
+            signing_key = self._keys.get(kid)
+
+        if signing_key is None:
+            raise PyJWKClientError(
+                f'Unable to find a signing key that matches: "{kid}"'
+            )
+
+        return signing_key
+
+
+def _fetch_auth0_jwk_set() -> PyJWKSet:
+    url = f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json"
+
+    return PyJWKClient(url, cache_jwk_set=False, cache_keys=False).get_jwk_set()
+
+
+auth0_jwks_cache = JWKSCache(
+    fetch_jwk_set=_fetch_auth0_jwk_set,
+    ttl=settings.AUTH0_JWKS_TTL,
+    refresh_margin=settings.AUTH0_JWKS_REFRESH_MARGIN,
+    min_refetch_interval=settings.AUTH0_JWKS_MIN_REFETCH_INTERVAL,
+)
@@ -2,10 +2,10 @@ from datetime import datetime, timedelta
 from typing import Any, Dict
 
 import jwt
-from jwt import PyJWKClient
 from loguru import logger
 
 from app.conf.config import settings
+from app.utils.jwks_cache import auth0_jwks_cache
 
 
 async def encode_jwt(
@@ -47,15 +47,12 @@ def decode_jwt_token(token: str) -> Dict:
     return decoded
 
 
-def decode_auth0_token(token: str) -> Any | None:
+async def decode_auth0_token(token: str, header: Dict | None = None) -> Any | None:
     try:
-        url = f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json"
-        jwks_client = PyJWKClient(url)
-        header = jwt.get_unverified_header(token)
+        header = header or jwt.get_unverified_header(token)
         logger.debug(f"Token header: {header}")
-        signing_key = jwks_client.get_signing_key_from_jwt(token).key
+        signing_key = (await auth0_jwks_cache.get_signing_key(header.get("kid"))).key
 
-        logger.debug(f"Signing key: {signing_key}")
         payload = jwt.decode(
             token,
             signing_key,
@@ -79,10 +76,29 @@ def decode_auth0_token(token: str) -> Any | None:
         return None
 
 
-def decode_jwt(token: str) -> Dict:
+def _is_auth0_token(header: Dict, claims: Dict) -> bool:
+    issuer = claims.get("iss")
+    if issuer:
+        return issuer == f"https://{settings.AUTH0_DOMAIN}/"
+
+    return header.get("alg") == settings.AUTH0_ALGORITHM and "kid" in header
+
+
+async def decode_jwt(token: str) -> Dict | None:
+    try:
+        header = jwt.get_unverified_header(token)
+        claims = jwt.decode(token, options={"verify_signature": False})
+
+    except jwt.InvalidTokenError as e:
+        logger.info(f"Malformed token {e}")
+        return None
+
+    if _is_auth0_token(header, claims):
+        return await decode_auth0_token(token, header)
+
     try:
         return decode_jwt_token(token)
 
-    except Exception as e:
+    except jwt.InvalidTokenError as e:
         logger.info(f"Exception occurred own token {e}")
-        return decode_auth0_token(token)
+        return None
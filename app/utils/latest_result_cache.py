@@ -0,0 +1,14 @@
+import uuid
+
+from loguru import logger
+from redis.exceptions import RedisError
+
+from app.services.redis_service import redis_service
+from app.utils.redis_keys import latest_result_key
+
+
+async def invalidate_latest_results(company_id: uuid.UUID) -> None:
+    try:
+        await redis_service.redis_delete(latest_result_key(company_id))
+    except RedisError as error:
+        logger.warning(f"Latest result cache unavailable: {error}")
@@ -0,0 +1,164 @@
+import uuid
+from typing import Dict, List, NamedTuple, Optional
+
+from loguru import logger
+from redis.asyncio.client import Pipeline
+from redis.exceptions import RedisError
+
+from app.services.redis_service import redis_service
+from app.utils.redis_keys import (
+    company_leaderboard_key,
+    quiz_leaderboard_key,
+    quiz_leaderboards_key,
+)
+
+
+class LeaderboardEntry(NamedTuple):
+    user_id: uuid.UUID
+    rank: int
+    score: float
+
+
+def _leaderboard_key(company_id: uuid.UUID, quiz_id: Optional[uuid.UUID]) -> str:
+    if quiz_id is None:
+        return company_leaderboard_key(company_id)
+
+    return quiz_leaderboard_key(company_id, quiz_id)
+
+
+def _make_entries(rows: List, first_rank: int) -> List[LeaderboardEntry]:
+    return [
+        LeaderboardEntry(uuid.UUID(member), first_rank + offset, score)
+        for offset, (member, score) in enumerate(rows)
+    ]
+
+
+class Leaderboard:
+    async def exists(
+        self, company_id: uuid.UUID, quiz_id: Optional[uuid.UUID] = None
+    ) -> bool:
+        return await redis_service.redis_exists(_leaderboard_key(company_id, quiz_id))
+
+    async def replace(
+        self,
+        company_id: uuid.UUID,
+        quiz_id: Optional[uuid.UUID],
+        scores: Dict[uuid.UUID, float],
+    ) -> None:
+        await redis_service.redis_zset_replace(
+            _leaderboard_key(company_id, quiz_id),
+            {str(user_id): score for user_id, score in scores.items()},
+        )
+        if quiz_id is not None:
+            await redis_service.redis_sadd(
+                quiz_leaderboards_key(company_id), str(quiz_id)
+            )
+
+    async def record(
+        self,
+        company_id: uuid.UUID,
+        quiz_id: uuid.UUID,
+        user_id: uuid.UUID,
+        company_score: float,
+        quiz_score: float,
+        pipe: Optional[Pipeline] = None,
+    ) -> None:
+        try:
+            await redis_service.redis_zadd_if_exists(
+                company_leaderboard_key(company_id),
+                str(user_id),
+                company_score,
+                pipe=pipe,
+            )
+            await redis_service.redis_zadd_if_exists(
+                quiz_leaderboard_key(company_id, quiz_id),
+                str(user_id),
+                quiz_score,
+                pipe=pipe,
+            )
+        except RedisError as error:
+            logger.warning(f"Leaderboard unavailable: {error}")
+
+    async def size(
+        self, company_id: uuid.UUID, quiz_id: Optional[uuid.UUID] = None
+    ) -> int:
+        return await redis_service.redis_zcard(_leaderboard_key(company_id, quiz_id))
+
+    async def top(
+        self, company_id: uuid.UUID, quiz_id: Optional[uuid.UUID], limit: int
+    ) -> List[LeaderboardEntry]:
+        rows = await redis_service.redis_zrevrange(
+            _leaderboard_key(company_id, quiz_id), 0, limit - 1
+        )
+
+        return _make_entries(rows, 1)
+
+    async def rank(
+        self,
+        company_id: uuid.UUID,
+        quiz_id: Optional[uuid.UUID],
+        user_id: uuid.UUID,
+    ) -> Optional[LeaderboardEntry]:
+        key = _leaderboard_key(company_id, quiz_id)
+        position = await redis_service.redis_zrevrank(key, str(user_id))
+        if position is None:
+            return None
+
+        score = await redis_service.redis_zscore(key, str(user_id))
+
+        return LeaderboardEntry(user_id, position + 1, score)
+
+    async def around(
+        self,
+        company_id: uuid.UUID,
+        quiz_id: Optional[uuid.UUID],
+        user_id: uuid.UUID,
+        radius: int,
+    ) -> List[LeaderboardEntry]:
+        key = _leaderboard_key(company_id, quiz_id)
+        position = await redis_service.redis_zrevrank(key, str(user_id))
+        if position is None:
+            return []
+
+        start = max(position - radius, 0)
+        rows = await redis_service.redis_zrevrange(key, start, position + radius)
+
+        return _make_entries(rows, start + 1)
+
+    async def remove_member(self, company_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        try:
+            quiz_ids = await redis_service.redis_smembers(
+                quiz_leaderboards_key(company_id)
+            )
+            await redis_service.redis_zrem_many(
+                [company_leaderboard_key(company_id)]
+                + [quiz_leaderboard_key(company_id, quiz_id) for quiz_id in quiz_ids],
+                str(user_id),
+            )
+        except RedisError as error:
+            logger.warning(f"Leaderboard unavailable: {error}")
+
+    async def drop_quiz(self, company_id: uuid.UUID, quiz_id: uuid.UUID) -> None:
+        try:
+            await redis_service.redis_delete(quiz_leaderboard_key(company_id, quiz_id))
+            await redis_service.redis_srem(
+                quiz_leaderboards_key(company_id), str(quiz_id)
+            )
+        except RedisError as error:
+            logger.warning(f"Leaderboard unavailable: {error}")
+
+    async def drop_company(self, company_id: uuid.UUID) -> None:
+        try:
+            quiz_ids = await redis_service.redis_smembers(
+                quiz_leaderboards_key(company_id)
+            )
+            await redis_service.redis_delete(
+                company_leaderboard_key(company_id),
+                quiz_leaderboards_key(company_id),
+                *(quiz_leaderboard_key(company_id, quiz_id) for quiz_id in quiz_ids),
+            )
+        except RedisError as error:
+            logger.warning(f"Leaderboard unavailable: {error}")
+
+
+leaderboard = Leaderboard()
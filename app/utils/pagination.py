@@ -0,0 +1,28 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Tuple
+
+from loguru import logger
+
+from app.conf.detail import Messages
+from app.exept.custom_exceptions import BadRequest
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    payload = json.dumps({"created_at": created_at.isoformat(), "id": str(row_id)})
+
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("utf-8")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("utf-8")))
+
+        return datetime.fromisoformat(payload["created_at"]), uuid.UUID(payload["id"])
+
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        logger.info(Messages.INVALID_CURSOR)
+        raise BadRequest(Messages.INVALID_CURSOR)
@@ -1,20 +1,45 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 
+from app.conf.config import settings
 
-def hash_password(
-    password: str,
-) -> bytes:
-    salt = bcrypt.gensalt()
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt",
+)
+
+
+def _hash_password(password: str) -> bytes:
+    salt = bcrypt.gensalt(rounds=settings.PASSWORD_HASH_ROUNDS)
     pwd_bytes: bytes = password.encode("utf-8")
 
     return bcrypt.hashpw(pwd_bytes, salt)
 
 
-def validate_password(
-    password: str,
-    hashed_password: str,
-) -> bool:
+def _validate_password(password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(
         password=password.encode("utf-8"),
         hashed_password=hashed_password.encode("utf-8"),
     )
+
+
+async def hash_password(
+    password: str,
+) -> bytes:
+    loop = asyncio.get_running_loop()
+
+    return await loop.run_in_executor(password_executor, _hash_password, password)
+
+
+async def validate_password(
+    password: str,
+    hashed_password: str,
+) -> bool:
+    loop = asyncio.get_running_loop()
+
+    return await loop.run_in_executor(
+        password_executor, _validate_password, password, hashed_password
+    )
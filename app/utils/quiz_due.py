@@ -0,0 +1,53 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable, List, NamedTuple, Optional
+
+from loguru import logger
+from redis.asyncio.client import Pipeline
+from redis.exceptions import RedisError
+
+from app.services.redis_service import redis_service
+from app.utils.redis_keys import QUIZ_DUE_KEY
+
+
+class DueQuiz(NamedTuple):
+    user_id: uuid.UUID
+    quiz_id: uuid.UUID
+    due_at: float
+
+
+def next_due(attempted_at: datetime, frequency_days: int) -> float:
+    return (attempted_at + timedelta(days=frequency_days)).timestamp()
+
+
+class QuizDueIndex:
+    async def schedule(
+        self,
+        entries: Iterable[DueQuiz],
+        only_new: bool = False,
+        pipe: Optional[Pipeline] = None,
+    ) -> None:
+        mapping = {
+            f"{entry.user_id}:{entry.quiz_id}": entry.due_at for entry in entries
+        }
+        if not mapping:
+            return
+
+        try:
+            await redis_service.redis_zadd(
+                QUIZ_DUE_KEY, mapping, nx=only_new, pipe=pipe
+            )
+        except RedisError as error:
+            logger.warning(f"Quiz due index unavailable: {error}")
+
+    async def pop_due(self, now: float, limit: int) -> List[DueQuiz]:
+        items = await redis_service.redis_zpop_by_score(QUIZ_DUE_KEY, now, limit)
+        due_quizzes = []
+        for member, due_at in items:
+            user_id, quiz_id = member.split(":")
+            due_quizzes.append(DueQuiz(uuid.UUID(user_id), uuid.UUID(quiz_id), due_at))
+
+        return due_quizzes
+
+
+quiz_due_index = QuizDueIndex()
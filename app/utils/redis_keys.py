@@ -0,0 +1,96 @@
+import uuid
+from datetime import timedelta
+from typing import Dict
+
+QUIZ_RESULT_TTL = int(timedelta(hours=48).total_seconds())
+RATING_CACHE_TTL = int(timedelta(minutes=10).total_seconds())
+ANALYTICS_CACHE_TTL = int(timedelta(minutes=10).total_seconds())
+LATEST_RESULT_TTL = int(timedelta(hours=1).total_seconds())
+# marks a latest-result hash that was rebuilt from the database in full
+LATEST_RESULT_COMPLETE_FIELD = "_complete"
+REMINDER_RUN_TTL = int(timedelta(days=2).total_seconds())
+CACHE_INVALIDATION_CHANNEL = "cache_invalidation"
+# (user, quiz) pairs scored by the unix time their next attempt is due
+QUIZ_DUE_KEY = "quiz_due"
+
+
+def quiz_result_key(
+    user_id: uuid.UUID,
+    company_id: uuid.UUID,
+    quiz_id: uuid.UUID,
+    result_id: uuid.UUID,
+) -> str:
+    return f"quiz_result:{user_id}:{company_id}:{quiz_id}:{result_id}"
+
+
+def quiz_result_prefix(user_id: uuid.UUID, company_id: uuid.UUID) -> str:
+    return f"quiz_result:{user_id}:{company_id}:"
+
+
+def company_index_key(company_id: uuid.UUID) -> str:
+    return f"quiz_result_index:company:{company_id}"
+
+
+def user_index_key(user_id: uuid.UUID) -> str:
+    return f"quiz_result_index:user:{user_id}"
+
+
+def quiz_index_key(quiz_id: uuid.UUID) -> str:
+    return f"quiz_result_index:quiz:{quiz_id}"
+
+
+def count_key(table_name: str) -> str:
+    return f"count:{table_name}"
+
+
+def count_field(params: Dict) -> str:
+    return ",".join(f"{name}={value}" for name, value in sorted(params.items()))
+
+
+def company_rating_key(user_id: uuid.UUID, company_id: uuid.UUID) -> str:
+    return f"rating:company:{company_id}:user:{user_id}"
+
+
+def global_rating_key(user_id: uuid.UUID) -> str:
+    return f"rating:global:{user_id}"
+
+
+def company_analytics_key(company_id: uuid.UUID, bucket: str) -> str:
+    return f"analytics:company:{company_id}:{bucket}"
+
+
+def latest_result_key(company_id: uuid.UUID) -> str:
+    return f"latest_result:company:{company_id}"
+
+
+def latest_result_field(company_member_id: uuid.UUID, quiz_id: uuid.UUID) -> str:
+    return f"{company_member_id}:{quiz_id}"
+
+
+def company_leaderboard_key(company_id: uuid.UUID) -> str:
+    return f"leaderboard:company:{company_id}"
+
+
+def quiz_leaderboard_key(company_id: uuid.UUID, quiz_id: uuid.UUID) -> str:
+    return f"leaderboard:company:{company_id}:quiz:{quiz_id}"
+
+
+def quiz_leaderboards_key(company_id: uuid.UUID) -> str:
+    return f"leaderboard:company:{company_id}:quizzes"
+
+
+def reminder_run_key(run_date: str) -> str:
+    return f"reminder_run:{run_date}"
+
+
+def answer_key_key(quiz_id: uuid.UUID) -> str:
+    # bumped whenever the serialized entry format changes
+    return f"answer_key:v2:{quiz_id}"
+
+
+def auth_user_key(email: str) -> str:
+    return f"auth_user:{email}"
+
+
+def cache_version_key(key: str) -> str:
+    return f"{key}:version"
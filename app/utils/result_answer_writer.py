@@ -0,0 +1,49 @@
+from typing import List
+
+from asyncpg.exceptions import (
+    InsufficientResourcesError,
+    InterfaceError,
+    OperatorInterventionError,
+    PostgresConnectionError,
+    TransactionRollbackError,
+)
+from sqlalchemy.exc import DisconnectionError, OperationalError
+from sqlalchemy.exc import InterfaceError as SQLAlchemyInterfaceError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.conf.config import settings
+from app.db.connection import async_session
+from app.repository.result_answer_repository import (
+    ResultAnswerRecord,
+    ResultAnswerRepository,
+)
+from app.utils.write_behind import WriteBehindBuffer
+
+
+class ResultAnswerWriter(WriteBehindBuffer[ResultAnswerRecord]):
+    name = "result_answers"
+    # connection and server availability errors; data and integrity errors,
+    # such as a missing partition, would fail the same way again
+    retry_errors = (
+        OperationalError,
+        SQLAlchemyInterfaceError,
+        DisconnectionError,
+        PoolTimeoutError,
+        PostgresConnectionError,
+        InterfaceError,
+        OperatorInterventionError,
+        InsufficientResourcesError,
+        TransactionRollbackError,
+        OSError,
+    )
+
+    async def _write(self, batch: List[ResultAnswerRecord]) -> None:
+        async with async_session() as session:
+            await ResultAnswerRepository(session).copy_answers(batch)
+
+
+result_answer_writer = ResultAnswerWriter(
+    batch_size=settings.RESULT_ANSWERS_BATCH_SIZE,
+    flush_interval=settings.RESULT_ANSWERS_FLUSH_INTERVAL,
+    max_pending=settings.RESULT_ANSWERS_MAX_PENDING,
+)
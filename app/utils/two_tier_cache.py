@@ -0,0 +1,104 @@
+from typing import Any, Generic, Hashable, NamedTuple, Optional, TypeVar
+
+from loguru import logger
+from redis.exceptions import RedisError
+
+from app.services.redis_service import redis_service
+from app.utils.cache_invalidation import cache_invalidation
+from app.utils.local_cache import LocalTTLCache
+from app.utils.redis_keys import cache_version_key
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheLookup(NamedTuple):
+    value: Optional[Any]
+    # state seen before the caller loads a missing value, set() only keeps
+    # the loaded value if no invalidation happened since
+    version: Optional[str]
+    generation: int
+
+
+class TwoTierCache(Generic[K, V]):
+    # invalidations are published under this name
+    name = "cache"
+
+    def __init__(self, max_size: int, local_ttl: int, ttl: int):
+        self.ttl = ttl
+        self._local = LocalTTLCache(max_size=max_size, ttl=local_ttl)
+
+    def _key(self, key: K) -> str:
+        raise NotImplementedError
+
+    def _serialize(self, value: V) -> str:
+        raise NotImplementedError
+
+    def _deserialize(self, serialized_value: str) -> V:
+        raise NotImplementedError
+
+    async def get(self, key: K) -> CacheLookup:
+        generation = cache_invalidation.generation
+        if cache_invalidation.is_listening:
+            value = self._local.get(str(key))
+            if value is not None:
+                return CacheLookup(value, None, generation)
+
+        redis_key = self._key(key)
+        try:
+            serialized_value, version = await redis_service.redis_mget(
+                [redis_key, cache_version_key(redis_key)]
+            )
+        except RedisError as error:
+            logger.warning(f"{self.name} cache unavailable: {error}")
+            return CacheLookup(None, None, generation)
+
+        if serialized_value is None:
+            return CacheLookup(None, version, generation)
+
+        value = self._deserialize(serialized_value)
+        self._set_local(key, value, generation)
+
+        return CacheLookup(value, version, generation)
+
+    def _set_local(self, key: K, value: V, generation: int) -> None:
+        # an eviction received meanwhile may be for this very value
+        if (
+            cache_invalidation.is_listening
+            and cache_invalidation.generation == generation
+        ):
+            self._local.set(str(key), value)
+
+    async def set(self, key: K, value: V, lookup: CacheLookup) -> None:
+        redis_key = self._key(key)
+        try:
+            stored = await redis_service.redis_set_if_version(
+                redis_key,
+                cache_version_key(redis_key),
+                lookup.version,
+                self._serialize(value),
+                self.ttl,
+            )
+        except RedisError as error:
+            logger.warning(f"{self.name} cache unavailable: {error}")
+            return
+
+        if stored:
+            self._set_local(key, value, lookup.generation)
+
+    async def invalidate(self, key: K) -> None:
+        self._local.pop(str(key))
+        redis_key = self._key(key)
+        try:
+            await redis_service.redis_delete_versioned(
+                redis_key, cache_version_key(redis_key), self.ttl
+            )
+            await cache_invalidation.publish(self.name, str(key))
+        except RedisError as error:
+            logger.warning(f"{self.name} cache unavailable: {error}")
+
+    def evict_local(self, key: str) -> None:
+        self._local.pop(key)
+
+    def clear_local(self) -> None:
+        self._local.clear()
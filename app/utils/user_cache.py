@@ -0,0 +1,28 @@
+from app.conf.config import settings
+from app.schemas.users import BaseUserSchema
+from app.utils.cache_invalidation import cache_invalidation
+from app.utils.redis_keys import auth_user_key
+from app.utils.two_tier_cache import TwoTierCache
+
+USER_CACHE_NAME = "user"
+
+
+class UserCache(TwoTierCache[str, BaseUserSchema]):
+    name = USER_CACHE_NAME
+
+    def _key(self, email: str) -> str:
+        return auth_user_key(email)
+
+    def _serialize(self, user: BaseUserSchema) -> str:
+        return user.model_dump_json()
+
+    def _deserialize(self, serialized_user: str) -> BaseUserSchema:
+        return BaseUserSchema.model_validate_json(serialized_user)
+
+
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_SIZE,
+    local_ttl=settings.USER_CACHE_LOCAL_TTL,
+    ttl=settings.USER_CACHE_TTL,
+)
+cache_invalidation.register(USER_CACHE_NAME, user_cache)
@@ -0,0 +1,92 @@
+import asyncio
+from collections import deque
+from typing import Deque, Generic, Iterable, List, Optional, Tuple, Type, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+
+class WriteBehindBuffer(Generic[T]):
+    name = "write-behind"
+    # transient errors after which a batch is kept and retried on the next
+    # flush, any other error discards the batch so it cannot block the buffer
+    retry_errors: Tuple[Type[BaseException], ...] = ()
+
+    def __init__(self, batch_size: int, flush_interval: float, max_pending: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # the oldest items are dropped once max_pending is reached
+        self._pending: Deque[T] = deque(maxlen=max_pending)
+        self._dropped = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def _write(self, batch: List[T]) -> None:
+        raise NotImplementedError
+
+    def add(self, items: Iterable[T]) -> None:
+        for item in items:
+            if len(self._pending) == self._pending.maxlen:
+                self._dropped += 1
+            self._pending.append(item)
+
+        self._ensure_started()
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def _ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        while self._pending:
+            batch_size = min(self.batch_size, len(self._pending))
+            batch = [self._pending.popleft() for _ in range(batch_size)]
+            try:
+                await self._write(batch)
+            except self.retry_errors as error:
+                logger.warning(f"{self.name} flush failed: {error}")
+                self._requeue(batch)
+                break
+            except Exception as error:
+                logger.error(
+                    f"{self.name} discarded {len(batch)} items after {error!r}: {batch}"
+                )
+
+        if self._dropped:
+            logger.warning(f"{self.name} dropped {self._dropped} buffered items")
+            self._dropped = 0
+
+    def _requeue(self, batch: List[T]) -> None:
+        # retry on the next flush, keeping the original order; items added
+        # meanwhile are newer, so the oldest of the batch make room for them
+        overflow = len(self._pending) + len(batch) - self._pending.maxlen
+        if overflow > 0:
+            self._dropped += min(overflow, len(batch))
+            batch = batch[overflow:]
+        self._pending.extendleft(reversed(batch))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._closing = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            self._closing = False
+
+        await self.flush()
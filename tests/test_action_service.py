@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
 from app.services.action_service import ActionService
@@ -19,6 +19,20 @@ from app.exept.custom_exceptions import (
 )
 
 
+@pytest.fixture(autouse=True)
+def leaderboard_mock():
+    with patch("app.services.action_service.leaderboard", new=AsyncMock()) as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def invalidate_latest_results_mock():
+    with patch(
+        "app.services.action_service.invalidate_latest_results", new=AsyncMock()
+    ) as mock:
+        yield mock
+
+
 @pytest.fixture
 def action_service():
     session = AsyncMock()
@@ -331,7 +345,9 @@ async def test_create_request_already_in_company(action_service):
 
 
 @pytest.mark.asyncio
-async def test_leave_from_company_success(action_service):
+async def test_leave_from_company_success(
+    action_service, invalidate_latest_results_mock
+):
     action_id = uuid4()
     current_user_id = uuid4()
     company_id = uuid4()
@@ -357,6 +373,7 @@ async def test_leave_from_company_success(action_service):
     action_service.company_repository.delete_company_member.assert_called_once_with(
         company_id, current_user_id
     )
+    invalidate_latest_results_mock.assert_awaited_once_with(company_id)
     action_service.action_repository.delete_one.assert_called_once_with(action_id)
     assert result.id == action_id
 
@@ -379,7 +396,9 @@ async def test_leave_from_company_not_allowed(action_service):
 
 
 @pytest.mark.asyncio
-async def test_kick_from_company_success(action_service):
+async def test_kick_from_company_success(
+    action_service, leaderboard_mock, invalidate_latest_results_mock
+):
     action_id = uuid4()
     current_user_id = uuid4()
     company_id = uuid4()
@@ -405,6 +424,10 @@ async def test_kick_from_company_success(action_service):
     action_service.company_repository.delete_company_member.assert_called_once_with(
         company_id, action_service.action_repository.get_one.return_value.user_id
     )
+    leaderboard_mock.remove_member.assert_awaited_once_with(
+        company_id, action_service.action_repository.get_one.return_value.user_id
+    )
+    invalidate_latest_results_mock.assert_awaited_once_with(company_id)
     action_service.action_repository.delete_one.assert_called_once_with(action_id)
     assert result.id == action_id
 
@@ -418,3 +441,38 @@ async def test_kick_from_company_action_not_found(action_service):
 
     with pytest.raises(ActionNotFound):
         await action_service.kick_from_company(action_id, current_user_id)
+
+
+@pytest.mark.asyncio
+async def test_get_my_invites_uses_projected_rows(action_service):
+    current_user_id = uuid4()
+    invite = {
+        "id": uuid4(),
+        "user_id": current_user_id,
+        "company_id": uuid4(),
+        "user_username": "testuser",
+        "company_name": "Test Company",
+    }
+    action_service.action_repository.get_relatives.return_value = [invite]
+
+    invites = await action_service.get_my_invites(current_user_id)
+
+    assert invites[0].user_username == "testuser"
+    assert invites[0].company_name == "Test Company"
+    action_service.action_repository.get_relatives.assert_awaited_once_with(
+        current_user_id, InvitationStatus.INVITED, False
+    )
+    action_service.user_repository.get_user_username.assert_not_awaited()
+    action_service.company_repository.get_company_name.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_admins_uses_projected_rows(action_service):
+    company_id = uuid4()
+    admin = {"id": uuid4(), "user_id": uuid4(), "user_username": "admin"}
+    action_service.company_repository.get_admins.return_value = [admin]
+
+    admins = await action_service.get_admins(uuid4(), company_id)
+
+    assert admins[0].user_username == "admin"
+    action_service.user_repository.get_user_username.assert_not_awaited()
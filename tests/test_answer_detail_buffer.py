@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services.redis_service import IndexedRecord
+from app.utils.answer_detail_buffer import AnswerDetailBuffer
+
+
+def make_record(number):
+    return IndexedRecord(f"quiz_result:{number}", "{}", 60, ["index"], float(number))
+
+
+@pytest.fixture
+def redis_mock():
+    with patch("app.utils.answer_detail_buffer.redis_service") as redis_service:
+        redis_service.redis_set_indexed_many = AsyncMock()
+        yield redis_service
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_in_batches(redis_mock):
+    buffer = AnswerDetailBuffer(batch_size=2, flush_interval=60, max_pending=10)
+    for number in range(3):
+        buffer.add([make_record(number)])
+
+    await buffer.stop()
+
+    batches = [
+        call.args[0] for call in redis_mock.redis_set_indexed_many.await_args_list
+    ]
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert [record.key for batch in batches for record in batch] == [
+        "quiz_result:0",
+        "quiz_result:1",
+        "quiz_result:2",
+    ]
+    assert len(buffer) == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_records(redis_mock):
+    buffer = AnswerDetailBuffer(batch_size=10, flush_interval=60, max_pending=10)
+    redis_mock.redis_set_indexed_many.side_effect = RedisConnectionError()
+    buffer.add([make_record(1)])
+
+    await buffer.stop()
+
+    assert len(buffer) == 1
+
+
+@pytest.mark.asyncio
+async def test_pending_records_are_bounded(redis_mock):
+    buffer = AnswerDetailBuffer(batch_size=10, flush_interval=60, max_pending=2)
+    for number in range(3):
+        buffer.add([make_record(number)])
+
+    assert len(buffer) == 2
+
+    await buffer.stop()
+
+    (batch,) = redis_mock.redis_set_indexed_many.await_args.args
+    assert [record.key for record in batch] == ["quiz_result:1", "quiz_result:2"]
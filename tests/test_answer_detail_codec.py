@@ -0,0 +1,93 @@
+import json
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from app.utils.answer_detail_codec import decode_answer_detail, encode_answer_detail
+from app.utils.answer_key_cache import compile_answer_key
+
+
+def make_questions(count):
+    return [
+        MagicMock(
+            id=uuid4(),
+            question_text=f"Which options are right in question number {number}?",
+            correct_answer=["first option", "third option"],
+            answer_options=["first option", "second option", "third option"],
+        )
+        for number in range(count)
+    ]
+
+
+def test_round_trip_rehydrates_text():
+    questions = make_questions(3)
+    answer_key = compile_answer_key(questions)
+    answers = {
+        questions[0].id: ["third option", "first option"],
+        questions[1].id: ["free text"],
+    }
+    key = "quiz_result:user:company:quiz:result"
+
+    encoded = encode_answer_detail(answer_key, answers, [True, False, False])
+    decoded = decode_answer_detail(key, encoded, answer_key)
+
+    assert decoded["user_id"] == "user"
+    assert decoded["quiz_id"] == "quiz"
+    assert decoded["questions"] == [
+        {
+            "question": questions[0].question_text,
+            "user_answer": ["first option", "third option"],
+            "is_correct": True,
+        },
+        {
+            "question": questions[1].question_text,
+            "user_answer": ["free text"],
+            "is_correct": False,
+        },
+        {
+            "question": questions[2].question_text,
+            "user_answer": None,
+            "is_correct": False,
+        },
+    ]
+
+
+def test_encoding_is_smaller_than_json():
+    questions = make_questions(20)
+    answer_key = compile_answer_key(questions)
+    answers = {question.id: list(question.correct_answer) for question in questions}
+    legacy = json.dumps(
+        {
+            "user_id": str(uuid4()),
+            "company_id": str(uuid4()),
+            "quiz_id": str(uuid4()),
+            "questions": [
+                {
+                    "question": question.question_text,
+                    "user_answer": answers[question.id],
+                    "is_correct": True,
+                }
+                for question in questions
+            ],
+        }
+    )
+
+    encoded = encode_answer_detail(answer_key, answers, [True] * 20)
+
+    assert len(encoded) * 5 < len(legacy)
+
+
+def test_decodes_legacy_json_and_unknown_questions():
+    legacy = {"user_id": "u", "company_id": "c", "quiz_id": "q", "questions": []}
+    assert (
+        decode_answer_detail("quiz_result:u:c:q:r", json.dumps(legacy).encode(), None)
+        == legacy
+    )
+
+    questions = make_questions(1)
+    encoded = encode_answer_detail(
+        compile_answer_key(questions), {questions[0].id: ["first option"]}, [False]
+    )
+    decoded = decode_answer_detail("quiz_result:u:c:q:r", encoded, {})
+    assert decoded["questions"] == [
+        {"question": None, "user_answer": None, "is_correct": False}
+    ]
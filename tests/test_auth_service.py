@@ -4,8 +4,13 @@ from uuid import uuid4
 from datetime import datetime, timedelta
 
 from fastapi.security import HTTPAuthorizationCredentials
-from app.schemas.users import UserSchema
+from app.schemas.users import BaseUserSchema, UserSchema
 from app.services.auth_service import AuthService
+from app.utils import password_utils
+from app.utils.cache_invalidation import CacheInvalidation
+from app.utils.redis_keys import auth_user_key, cache_version_key
+from app.utils.two_tier_cache import CacheLookup
+from app.utils.user_cache import USER_CACHE_NAME, UserCache
 from app.exept.custom_exceptions import (
     UserWithEmailNotFound,
     EmailAlreadyExists,
@@ -22,7 +27,11 @@ def auth_service():
 
 @pytest.mark.asyncio
 @patch("app.utils.jwt_utils.encode_jwt", return_value="test_token")
-@patch("app.utils.password_utils.validate_password", return_value=True)
+@patch(
+    "app.utils.password_utils.validate_password",
+    new_callable=AsyncMock,
+    return_value=True,
+)
 async def test_login_success(mock_validate_password, mock_encode_jwt, auth_service):
     login_data = {
         "email": "testuser@example.com",
@@ -55,7 +64,11 @@ async def test_login_user_not_found(auth_service):
 
 @pytest.mark.asyncio
 @patch("app.utils.jwt_utils.encode_jwt", return_value="test_token")
-@patch("app.utils.password_utils.hash_password", return_value=b"hashedpassword")
+@patch(
+    "app.utils.password_utils.hash_password",
+    new_callable=AsyncMock,
+    return_value=b"hashedpassword",
+)
 async def test_signup_success(mock_hash_password, mock_encode_jwt, auth_service):
     user_data = {
         "email": "newuser@example.com",
@@ -91,6 +104,7 @@ async def test_signup_email_exists(auth_service):
 @pytest.mark.asyncio
 @patch(
     "app.utils.jwt_utils.decode_jwt",
+    new_callable=AsyncMock,
     return_value={
         "email": "testuser@example.com",
         "exp": (datetime.utcnow() - timedelta(minutes=5)).timestamp(),
@@ -101,3 +115,203 @@ async def test_get_current_user_token_expired(mock_decode_jwt, auth_service):
 
     with pytest.raises(UnAuthorized):
         await auth_service.get_current_user(token=token, session=auth_service.session)
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.utils.jwt_utils.decode_jwt",
+    new_callable=AsyncMock,
+    return_value={
+        "email": "testuser@example.com",
+        "exp": (datetime.utcnow() + timedelta(minutes=5)).timestamp(),
+    },
+)
+@patch("app.services.auth_service.UserRepository")
+@patch("app.services.auth_service.user_cache", new_callable=AsyncMock)
+async def test_get_current_user_from_cache(
+    mock_user_cache, mock_user_repository, mock_decode_jwt, auth_service
+):
+    cached_user = BaseUserSchema(
+        id=uuid4(), email="testuser@example.com", username="testuser"
+    )
+    mock_user_cache.get.return_value = CacheLookup(cached_user, None, 0)
+    token = HTTPAuthorizationCredentials(scheme="Bearer", credentials="valid_token")
+
+    current_user = await auth_service.get_current_user(
+        token=token, session=auth_service.session
+    )
+    assert current_user == cached_user
+    mock_user_repository.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.utils.jwt_utils.decode_jwt",
+    new_callable=AsyncMock,
+    return_value={
+        "email": "testuser@example.com",
+        "exp": (datetime.utcnow() + timedelta(minutes=5)).timestamp(),
+    },
+)
+@patch("app.services.auth_service.UserRepository")
+@patch("app.services.auth_service.user_cache", new_callable=AsyncMock)
+async def test_get_current_user_populates_cache(
+    mock_user_cache, mock_user_repository, mock_decode_jwt, auth_service
+):
+    db_user = UserSchema(
+        id=uuid4(),
+        email="testuser@example.com",
+        username="testuser",
+        password="hashedpassword",
+    )
+    lookup = CacheLookup(None, "3", 0)
+    mock_user_cache.get.return_value = lookup
+    mock_user_repository.return_value.get_one = AsyncMock(return_value=db_user)
+    token = HTTPAuthorizationCredentials(scheme="Bearer", credentials="valid_token")
+
+    current_user = await auth_service.get_current_user(
+        token=token, session=auth_service.session
+    )
+    assert current_user.id == db_user.id
+    assert not hasattr(current_user, "password")
+    mock_user_cache.set.assert_awaited_once_with(
+        "testuser@example.com", current_user, lookup
+    )
+
+
+@pytest.fixture
+def listening_invalidation():
+    invalidation = CacheInvalidation()
+    invalidation.is_listening = True
+    with patch("app.utils.two_tier_cache.cache_invalidation", invalidation):
+        yield invalidation
+
+
+@pytest.mark.asyncio
+@patch("app.utils.two_tier_cache.redis_service")
+async def test_user_cache_local_lru(mock_redis_service, listening_invalidation):
+    mock_redis_service.redis_set_if_version = AsyncMock(return_value=True)
+    mock_redis_service.redis_mget = AsyncMock(return_value=[None, None])
+    cache = UserCache(max_size=1, local_ttl=60, ttl=60)
+    first = BaseUserSchema(id=uuid4(), email="first@example.com", username="first")
+    second = BaseUserSchema(id=uuid4(), email="second@example.com", username="second")
+
+    await cache.set(first.email, first, await cache.get(first.email))
+    assert (await cache.get("first@example.com")).value == first
+
+    await cache.set(second.email, second, await cache.get(second.email))
+    assert (await cache.get("first@example.com")).value is None
+    assert (await cache.get("second@example.com")).value == second
+
+
+@pytest.mark.asyncio
+@patch("app.utils.two_tier_cache.redis_service")
+async def test_user_cache_evicted_by_other_worker(
+    mock_redis_service, listening_invalidation
+):
+    mock_redis_service.redis_set_if_version = AsyncMock(return_value=True)
+    mock_redis_service.redis_mget = AsyncMock(return_value=[None, None])
+    cache = UserCache(max_size=8, local_ttl=60, ttl=60)
+    listening_invalidation.register(USER_CACHE_NAME, cache)
+    user = BaseUserSchema(id=uuid4(), email="user@example.com", username="user")
+    await cache.set(user.email, user, await cache.get(user.email))
+
+    listening_invalidation._evict(f"{USER_CACHE_NAME}:user@example.com")
+
+    assert (await cache.get("user@example.com")).value is None
+
+
+@pytest.mark.asyncio
+@patch("app.utils.two_tier_cache.redis_service")
+async def test_user_cache_skips_local_entries_without_subscription(
+    mock_redis_service, listening_invalidation
+):
+    user = BaseUserSchema(id=uuid4(), email="user@example.com", username="user")
+    mock_redis_service.redis_set_if_version = AsyncMock(return_value=True)
+    mock_redis_service.redis_mget = AsyncMock(
+        return_value=[user.model_dump_json(), "1"]
+    )
+    cache = UserCache(max_size=8, local_ttl=60, ttl=60)
+    listening_invalidation.register(USER_CACHE_NAME, cache)
+    await cache.set(user.email, user, CacheLookup(None, "1", 0))
+
+    listening_invalidation._reset()
+
+    assert (await cache.get("user@example.com")).value == user
+    mock_redis_service.redis_mget.assert_awaited_once()
+    assert (await cache.get("user@example.com")).value == user
+    assert mock_redis_service.redis_mget.await_count == 2
+
+
+@pytest.mark.asyncio
+@patch("app.utils.two_tier_cache.redis_service")
+async def test_user_cache_fill_checks_version(
+    mock_redis_service, listening_invalidation
+):
+    user = BaseUserSchema(id=uuid4(), email="user@example.com", username="user")
+    mock_redis_service.redis_mget = AsyncMock(return_value=[None, "4"])
+    # an invalidation bumped the version while the user was loaded
+    mock_redis_service.redis_set_if_version = AsyncMock(return_value=False)
+    cache = UserCache(max_size=8, local_ttl=60, ttl=60)
+
+    lookup = await cache.get(user.email)
+    await cache.set(user.email, user, lookup)
+
+    mock_redis_service.redis_mget.assert_awaited_once_with(
+        [auth_user_key(user.email), cache_version_key(auth_user_key(user.email))]
+    )
+    mock_redis_service.redis_set_if_version.assert_awaited_once_with(
+        auth_user_key(user.email),
+        cache_version_key(auth_user_key(user.email)),
+        "4",
+        user.model_dump_json(),
+        60,
+    )
+    assert cache._local.get(user.email) is None
+
+
+@pytest.mark.asyncio
+@patch("app.utils.two_tier_cache.redis_service")
+async def test_user_cache_fill_skips_local_after_eviction(
+    mock_redis_service, listening_invalidation
+):
+    user = BaseUserSchema(id=uuid4(), email="user@example.com", username="user")
+    mock_redis_service.redis_mget = AsyncMock(return_value=[None, None])
+    mock_redis_service.redis_set_if_version = AsyncMock(return_value=True)
+    cache = UserCache(max_size=8, local_ttl=60, ttl=60)
+    listening_invalidation.register(USER_CACHE_NAME, cache)
+
+    lookup = await cache.get(user.email)
+    listening_invalidation._evict(f"{USER_CACHE_NAME}:{user.email}")
+    await cache.set(user.email, user, lookup)
+
+    assert cache._local.get(user.email) is None
+
+
+@pytest.mark.asyncio
+@patch("app.utils.two_tier_cache.redis_service")
+async def test_user_cache_invalidate_bumps_version(
+    mock_redis_service, listening_invalidation
+):
+    mock_redis_service.redis_delete_versioned = AsyncMock()
+    cache = UserCache(max_size=8, local_ttl=60, ttl=60)
+
+    with patch.object(listening_invalidation, "publish", AsyncMock()) as publish:
+        await cache.invalidate("user@example.com")
+
+    mock_redis_service.redis_delete_versioned.assert_awaited_once_with(
+        auth_user_key("user@example.com"),
+        cache_version_key(auth_user_key("user@example.com")),
+        60,
+    )
+    publish.assert_awaited_once_with(USER_CACHE_NAME, "user@example.com")
+
+
+@pytest.mark.asyncio
+@patch("app.utils.password_utils.settings.PASSWORD_HASH_ROUNDS", 4)
+async def test_password_hash_round_trip():
+    hashed_password = await password_utils.hash_password("secret")
+
+    assert hashed_password.startswith(b"$2b$04$")
+    assert await password_utils.validate_password("secret", hashed_password.decode())
+    assert not await password_utils.validate_password("wrong", hashed_password.decode())
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
 from app.schemas.companies import CompanySchema, CompanyResponseSchema
@@ -8,6 +8,20 @@ from app.services.company_service import CompanyService
 from app.exept.custom_exceptions import CompanyNotFound
 
 
+@pytest.fixture(autouse=True)
+def leaderboard_mock():
+    with patch("app.services.company_service.leaderboard", new=AsyncMock()) as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def invalidate_latest_results_mock():
+    with patch(
+        "app.services.company_service.invalidate_latest_results", new=AsyncMock()
+    ) as mock:
+        yield mock
+
+
 @pytest.fixture
 def company_service():
     session = AsyncMock()
@@ -136,7 +150,9 @@ async def test_update_company_success(company_service):
 
 
 @pytest.mark.asyncio
-async def test_delete_company_success(company_service):
+async def test_delete_company_success(
+    company_service, leaderboard_mock, invalidate_latest_results_mock
+):
     company_id = uuid4()
     user_id = uuid4()
     company_service.repository.get_one.return_value = CompanySchema(
@@ -160,3 +176,5 @@ async def test_delete_company_success(company_service):
     )
     company = await company_service.delete_company(company_id, user_id)
     assert company == response
+    leaderboard_mock.drop_company.assert_awaited_once_with(company_id)
+    invalidate_latest_results_mock.assert_awaited_once_with(company_id)
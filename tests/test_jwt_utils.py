@@ -0,0 +1,140 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt import PyJWKClientError, PyJWKSet
+from jwt.algorithms import RSAAlgorithm
+
+from app.conf.config import settings
+from app.utils import jwt_utils
+from app.utils.jwks_cache import JWKSCache
+
+
+class LocalJWKS:
+    def __init__(self):
+        self.private_keys = {}
+        self.fetch_count = 0
+
+    def add_key(self, kid):
+        self.private_keys[kid] = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048
+        )
+
+    def fetch(self):
+        self.fetch_count += 1
+        keys = []
+        for kid, private_key in self.private_keys.items():
+            jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+            keys.append({**jwk, "kid": kid, "alg": "RS256", "use": "sig"})
+
+        return PyJWKSet.from_dict({"keys": keys})
+
+    def sign(self, kid, payload):
+        return jwt.encode(
+            payload, self.private_keys[kid], algorithm="RS256", headers={"kid": kid}
+        )
+
+
+@pytest.fixture
+def local_jwks():
+    jwks = LocalJWKS()
+    jwks.add_key("key-1")
+    return jwks
+
+
+def make_cache(local_jwks, ttl=600, min_refetch_interval=0):
+    return JWKSCache(
+        fetch_jwk_set=local_jwks.fetch,
+        ttl=ttl,
+        refresh_margin=0,
+        min_refetch_interval=min_refetch_interval,
+    )
+
+
+def auth0_payload():
+    return {
+        "email": "auth0user@example.com",
+        "iss": f"https://{settings.AUTH0_DOMAIN}/",
+        "aud": settings.AUTH0_API_AUDIENCE,
+        "exp": datetime.utcnow() + timedelta(minutes=5),
+    }
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_fetches_once(local_jwks):
+    cache = make_cache(local_jwks)
+
+    for _ in range(3):
+        await cache.get_signing_key("key-1")
+
+    assert local_jwks.fetch_count == 1
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_refetches_on_unknown_kid(local_jwks):
+    cache = make_cache(local_jwks)
+    await cache.get_signing_key("key-1")
+
+    local_jwks.add_key("key-2")
+    assert (await cache.get_signing_key("key-2")).key_id == "key-2"
+    assert local_jwks.fetch_count == 2
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_limits_refetch_on_unknown_kid(local_jwks):
+    cache = make_cache(local_jwks, min_refetch_interval=60)
+    await cache.get_signing_key("key-1")
+
+    with pytest.raises(PyJWKClientError):
+        await cache.get_signing_key("missing")
+    assert local_jwks.fetch_count == 1
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_refetches_after_ttl(local_jwks):
+    cache = make_cache(local_jwks, ttl=0)
+
+    await cache.get_signing_key("key-1")
+    await cache.get_signing_key("key-1")
+
+    assert local_jwks.fetch_count == 2
+
+
+@pytest.mark.asyncio
+async def test_decode_jwt_routes_auth0_token(local_jwks):
+    token = local_jwks.sign("key-1", auth0_payload())
+
+    with patch.object(jwt_utils, "auth0_jwks_cache", make_cache(local_jwks)):
+        decoded = await jwt_utils.decode_jwt(token)
+
+    assert decoded["email"] == "auth0user@example.com"
+    assert local_jwks.fetch_count == 1
+
+
+@pytest.mark.asyncio
+async def test_decode_jwt_own_token_skips_jwks(local_jwks):
+    token = await jwt_utils.encode_jwt(payload={"email": "testuser@example.com"})
+
+    with patch.object(jwt_utils, "auth0_jwks_cache", make_cache(local_jwks)):
+        decoded = await jwt_utils.decode_jwt(token)
+
+    assert decoded["email"] == "testuser@example.com"
+    assert local_jwks.fetch_count == 0
+
+
+@pytest.mark.asyncio
+async def test_decode_jwt_malformed_token():
+    assert await jwt_utils.decode_jwt("not-a-token") is None
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_concurrent_requests_fetch_once(local_jwks):
+    cache = make_cache(local_jwks)
+
+    keys = await asyncio.gather(*(cache.get_signing_key("key-1") for _ in range(5)))
+
+    assert {key.key_id for key in keys} == {"key-1"}
+    assert local_jwks.fetch_count == 1
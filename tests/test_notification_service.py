@@ -1,7 +1,8 @@
 import uuid
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
+from app.conf.notification_template import NotificationTemplate
 from app.services.notification_service import NotificationService
 from app.exept.custom_exceptions import NotFound, NotPermission
 from app.schemas.notifications import NotificationSchema
@@ -73,7 +74,7 @@ async def test_mark_as_read_success():
         user_id=user_id,
     )
 
-    mock_notification_repo.get_one.return_value = notification
+    mock_notification_repo.get_notification.return_value = notification
 
     mock_user = AsyncMock()
     mock_user.id = user_id
@@ -108,9 +109,63 @@ async def test_mark_as_read_not_found():
     notification_id = uuid.uuid4()
     current_user_id = uuid.uuid4()
 
-    mock_notification_repo.get_one.return_value = None
+    mock_notification_repo.get_notification.return_value = None
 
     with pytest.raises(NotFound):
         await service.mark_as_read(
             current_user_id=current_user_id, notification_id=notification_id
         )
+
+
+@pytest.mark.asyncio
+async def test_get_my_notifications_page_success():
+    mock_notification_repo = AsyncMock()
+    service = NotificationService(
+        session=AsyncMock(),
+        notification_repository=mock_notification_repo,
+        company_repository=AsyncMock(),
+        user_repository=AsyncMock(),
+    )
+
+    user_id = uuid.uuid4()
+    notification = NotificationSchema(
+        id=uuid.uuid4(), text="You have a new message", is_read=False, user_id=user_id
+    )
+    mock_notification_repo.get_unread_page.return_value = ([notification], "next")
+
+    result, next_cursor = await service.get_my_notifications_page(user_id, "", 10)
+
+    assert len(result) == 1
+    assert next_cursor == "next"
+    mock_notification_repo.get_unread_page.assert_awaited_once_with(user_id, "", 10)
+
+
+@pytest.mark.asyncio
+async def test_get_my_notifications_renders_messages_and_reminders():
+    mock_notification_repo = AsyncMock()
+    service = NotificationService(
+        session=AsyncMock(),
+        notification_repository=mock_notification_repo,
+        company_repository=AsyncMock(),
+        user_repository=AsyncMock(),
+    )
+
+    user_id = uuid.uuid4()
+    announcement = MagicMock(id=uuid.uuid4(), text=None, is_read=False, user_id=user_id)
+    announcement.message.template = NotificationTemplate.NEW_QUIZ.value
+    announcement.message.params = {"company_name": "Acme", "quiz_name": "Safety"}
+    reminder = MagicMock(
+        id=uuid.uuid4(), text=None, message=None, is_read=False, user_id=user_id
+    )
+    reminder.quiz.name = "Safety"
+    mock_notification_repo.get_unread_notifications_for_user.return_value = [
+        announcement,
+        reminder,
+    ]
+
+    result = await service.get_my_notifications(user_id)
+
+    assert [notification.text for notification in result] == [
+        "In Acme company, a new quiz 'Safety' has been created. Take it now!",
+        "You should complete Safety quiz again!",
+    ]
@@ -0,0 +1,188 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.celery_tasks import maintain_results_partitions_task
+from app.repository.partition_repository import add_months, month_start
+from app.repository.result_repository import ResultRepository
+
+
+@pytest.fixture
+def repositories():
+    async def get_session():
+        yield AsyncMock()
+
+    current_month = month_start(datetime.now(timezone.utc))
+    months = {
+        f"results_{offset}": add_months(current_month, -offset)
+        for offset in (14, 13, 12, 1, 0)
+    }
+    with patch("app.core.celery_tasks.get_session", get_session), patch(
+        "app.core.celery_tasks.PartitionRepository"
+    ) as partition_repository, patch(
+        "app.core.celery_tasks.ResultRepository"
+    ) as result_repository, patch(
+        "app.core.celery_tasks.settings"
+    ) as settings:
+        settings.RESULTS_PARTITIONS_AHEAD = 2
+        settings.RESULTS_HOT_MONTHS = 12
+        settings.RESULTS_DETACH_ROLLED_UP = False
+        partition_repository.return_value = AsyncMock()
+        partition_repository.return_value.get_partition_months.return_value = months
+        result_repository.return_value = AsyncMock()
+        result_repository.return_value.get_rolled_up_months.return_value = {
+            add_months(current_month, -14)
+        }
+        yield (
+            partition_repository.return_value,
+            result_repository.return_value,
+            settings,
+        )
+
+
+@pytest.mark.asyncio
+async def test_rolls_up_cold_months_once(repositories):
+    partition_repository, result_repository, _ = repositories
+    current_month = month_start(datetime.now(timezone.utc))
+
+    await maintain_results_partitions_task()
+
+    partition_repository.ensure_monthly_partitions.assert_awaited_once_with(
+        "results", 2
+    )
+    rolled_up = [
+        call.args[0] for call in result_repository.rollup_month.await_args_list
+    ]
+    assert rolled_up == [add_months(current_month, -13)]
+    partition_repository.detach_partitions_before.assert_not_awaited()
+    result_repository.mark_rollups_detached.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_detaches_cold_partitions_when_enabled(repositories):
+    partition_repository, result_repository, settings = repositories
+    settings.RESULTS_DETACH_ROLLED_UP = True
+    cutoff = add_months(month_start(datetime.now(timezone.utc)), -12)
+
+    await maintain_results_partitions_task()
+
+    result_repository.mark_rollups_detached.assert_awaited_once_with(cutoff)
+    partition_repository.detach_partitions_before.assert_awaited_once_with(
+        "results", cutoff
+    )
+
+
+@pytest.mark.asyncio
+async def test_mark_rollups_detached_leaves_commit_to_detach():
+    session = AsyncMock()
+    cutoff = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    await ResultRepository(session).mark_rollups_detached(cutoff)
+
+    (query,) = session.execute.await_args.args
+    compiled = query.compile(dialect=postgresql.dialect())
+    sql = " ".join(str(compiled).split())
+    assert sql.startswith("UPDATE result_rollups SET detached=%(detached)s")
+    assert "result_rollups.month < %(month_1)s" in sql
+    assert compiled.params["month_1"] == cutoff
+    session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_readers_take_only_detached_rollups():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+
+    await ResultRepository(session).get_latest_results_for_company_member(uuid4())
+
+    # no separate lookup of the rolled-up months
+    session.execute.assert_awaited_once()
+    (query,) = session.execute.await_args.args
+    sql = " ".join(str(query.compile(dialect=postgresql.dialect())).split())
+    assert "UNION ALL" in sql
+    assert "results.created_at >=" not in sql
+    assert "AND result_rollups.detached" in sql
+
+
+@pytest.mark.asyncio
+async def test_latest_results_take_distinct_on_over_the_union():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+    repository = ResultRepository(session)
+
+    await repository.get_latest_results_for_company(uuid4())
+    await repository.get_latest_results_for_company_member(uuid4())
+
+    company_query, member_query = [
+        " ".join(str(call.args[0].compile(dialect=postgresql.dialect())).split())
+        for call in session.execute.await_args_list
+    ]
+    assert company_query.startswith(
+        "SELECT DISTINCT ON (anon_1.company_member_id, anon_1.quiz_id)"
+    )
+    assert member_query.startswith("SELECT DISTINCT ON (anon_1.quiz_id)")
+    for sql in (company_query, member_query):
+        assert "UNION ALL" in sql
+        assert "GROUP BY" not in sql
+        assert sql.endswith("anon_1.created_at DESC")
+
+
+@pytest.mark.asyncio
+async def test_rollup_month_aggregates_one_partition():
+    session = AsyncMock()
+    month = datetime(2024, 12, 1, tzinfo=timezone.utc)
+
+    await ResultRepository(session).rollup_month(month)
+
+    (query,) = session.execute.await_args.args
+    compiled = query.compile(dialect=postgresql.dialect())
+    sql = " ".join(str(compiled).split())
+    assert sql.startswith("INSERT INTO result_rollups (id, company_member_id")
+    assert (
+        "WHERE results.company_member_id IS NOT NULL "
+        "AND results.created_at >= %(created_at_1)s "
+        "AND results.created_at < %(created_at_2)s "
+        "GROUP BY results.company_member_id, results.quiz_id "
+        "ON CONFLICT (company_member_id, quiz_id, month) DO UPDATE"
+    ) in sql
+    assert compiled.params["created_at_1"] == month
+    assert compiled.params["created_at_2"] == add_months(month, 1)
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_backfill_member_ratings_counts_detached_rollups():
+    session = AsyncMock()
+
+    await ResultRepository(session).backfill_member_ratings()
+
+    _, company_insert, quiz_insert = [
+        " ".join(str(call.args[0].compile(dialect=postgresql.dialect())).split())
+        for call in session.execute.await_args_list
+    ]
+    for sql in (company_insert, quiz_insert):
+        assert sql.startswith("INSERT INTO member_ratings")
+        assert "UNION ALL" in sql
+        assert "FROM result_rollups WHERE result_rollups.detached" in sql
+    assert company_insert.endswith("GROUP BY anon_1.company_member_id")
+    assert quiz_insert.endswith("GROUP BY anon_1.company_member_id, anon_1.quiz_id")
+
+
+@pytest.mark.asyncio
+async def test_member_rating_takes_attempt_time_from_result():
+    session = AsyncMock()
+    created_at = datetime(2024, 3, 5, 12, 30, tzinfo=timezone.utc)
+    result = MagicMock(quiz_id=uuid4(), score=0.5, created_at=created_at)
+    session.scalars.return_value = MagicMock(one=MagicMock(return_value=result))
+    session.execute.return_value = MagicMock(scalar_one=MagicMock(return_value=0.5))
+
+    await ResultRepository(session).create_result({})
+
+    for call in session.execute.await_args_list:
+        compiled = call.args[0].compile(dialect=postgresql.dialect())
+        sql = " ".join(str(compiled).split())
+        assert "now()" not in sql.split("ON CONFLICT")[0]
+        assert compiled.params["last_attempt_at"] == created_at
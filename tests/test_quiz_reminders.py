@@ -0,0 +1,240 @@
+import pytest
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+
+from app.core.celery_tasks import (
+    pending_reminder_shards_task,
+    quiz_reminders_shard_task,
+    reminder_shard_range,
+    send_due_quiz_reminders_task,
+)
+from app.repository.notification_repository import NotificationRepository
+from app.utils.quiz_due import DueQuiz
+
+
+@pytest.fixture
+def redis_mock():
+    with patch("app.core.celery_tasks.redis_service") as redis_service:
+        redis_service.redis_hgetall = AsyncMock(return_value={})
+        redis_service.redis_hget = AsyncMock(return_value=None)
+        redis_service.redis_hset = AsyncMock()
+        yield redis_service
+
+
+@pytest.fixture
+def notification_repository_mock():
+    async def get_session():
+        yield AsyncMock()
+
+    with patch("app.core.celery_tasks.get_session", get_session), patch(
+        "app.core.celery_tasks.NotificationRepository"
+    ) as notification_repository:
+        notification_repository.return_value = AsyncMock()
+        notification_repository.return_value.create_quiz_reminders.return_value = 3
+        yield notification_repository.return_value
+
+
+@pytest.fixture
+def quiz_due_index_mock():
+    with patch("app.core.celery_tasks.quiz_due_index", new=AsyncMock()) as mock:
+        yield mock
+
+
+def test_reminder_shards_cover_all_user_ids():
+    ranges = [reminder_shard_range(shard, 5) for shard in range(5)]
+
+    assert ranges[0][0] == uuid.UUID(int=0)
+    assert ranges[-1][1] is None
+    for (_, max_user_id), (min_user_id, _) in zip(ranges, ranges[1:]):
+        assert max_user_id == min_user_id
+
+
+@pytest.mark.asyncio
+async def test_pending_shards_skip_finished(redis_mock):
+    redis_mock.redis_hgetall.return_value = {"0": "4", "2": "0"}
+
+    with patch("app.core.celery_tasks.settings") as settings:
+        settings.REMINDER_SHARDS = 4
+        shards = await pending_reminder_shards_task("2024-01-01")
+
+    assert shards == [1, 3]
+
+
+@pytest.mark.asyncio
+async def test_shard_records_progress(redis_mock, notification_repository_mock):
+    with patch("app.core.celery_tasks.settings") as settings:
+        settings.REMINDER_SHARDS = 4
+        await quiz_reminders_shard_task("2024-01-01", 3)
+
+    notification_repository_mock.create_quiz_reminders.assert_awaited_once_with(
+        uuid.UUID(int=3 * 2**126), None
+    )
+    assert redis_mock.redis_hset.await_args.args[:3] == (
+        "reminder_run:2024-01-01",
+        "3",
+        3,
+    )
+
+
+@pytest.mark.asyncio
+async def test_finished_shard_is_skipped(redis_mock, notification_repository_mock):
+    redis_mock.redis_hget.return_value = "3"
+
+    await quiz_reminders_shard_task("2024-01-01", 1)
+
+    notification_repository_mock.create_quiz_reminders.assert_not_awaited()
+    redis_mock.redis_hset.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_due_reminders_reschedule_reminded_pairs(
+    notification_repository_mock, quiz_due_index_mock
+):
+    reminded_user, retaken_user, quiz_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    quiz_due_index_mock.pop_due.side_effect = [
+        [DueQuiz(reminded_user, quiz_id, 1.0), DueQuiz(retaken_user, quiz_id, 2.0)],
+        [],
+    ]
+    notification_repository_mock.create_due_quiz_reminders.return_value = [
+        (reminded_user, quiz_id)
+    ]
+
+    with patch("app.core.celery_tasks.settings") as settings:
+        settings.QUIZ_DUE_BATCH_SIZE = 2
+        settings.QUIZ_REMINDER_REPEAT_HOURS = 24
+        sent = await send_due_quiz_reminders_task()
+
+    assert sent == 1
+    assert quiz_due_index_mock.pop_due.await_count == 2
+    notification_repository_mock.create_due_quiz_reminders.assert_awaited_once_with(
+        [(reminded_user, quiz_id), (retaken_user, quiz_id)]
+    )
+    (entry,) = quiz_due_index_mock.schedule.await_args.args[0]
+    assert (entry.user_id, entry.quiz_id) == (reminded_user, quiz_id)
+    now = quiz_due_index_mock.pop_due.await_args_list[0].args[0]
+    assert entry.due_at == now + 24 * 3600
+    assert quiz_due_index_mock.schedule.await_args.kwargs == {"only_new": True}
+
+
+@pytest.mark.asyncio
+async def test_due_reminders_restore_entries_on_database_error(
+    notification_repository_mock, quiz_due_index_mock
+):
+    due_quizzes = [DueQuiz(uuid.uuid4(), uuid.uuid4(), 1.0)]
+    quiz_due_index_mock.pop_due.return_value = due_quizzes
+    notification_repository_mock.create_due_quiz_reminders.side_effect = (
+        OperationalError("insert", {}, Exception())
+    )
+
+    with pytest.raises(OperationalError):
+        await send_due_quiz_reminders_task()
+
+    quiz_due_index_mock.schedule.assert_awaited_once_with(due_quizzes, only_new=True)
+
+
+@pytest.mark.asyncio
+async def test_due_reminders_are_inserted_in_one_statement():
+    session = AsyncMock()
+    user_id, quiz_id = uuid.uuid4(), uuid.uuid4()
+    session.execute.return_value = MagicMock(
+        all=MagicMock(return_value=[(user_id, quiz_id)])
+    )
+
+    reminded = await NotificationRepository(session).create_due_quiz_reminders(
+        [(user_id, quiz_id)]
+    )
+
+    assert reminded == [(user_id, quiz_id)]
+    session.execute.assert_awaited_once()
+    session.commit.assert_awaited_once()
+    (query,) = session.execute.await_args.args
+    compiled = query.compile(dialect=postgresql.dialect())
+    sql = " ".join(str(compiled).split())
+    assert sql.startswith(
+        "INSERT INTO user_notifications (id, user_id, quiz_id, is_read) SELECT"
+    )
+    assert "FROM results JOIN company_members" in sql
+    assert "FROM result_rollups JOIN company_members" in sql
+    assert "make_interval" in sql
+    assert "NOT (EXISTS (SELECT user_notifications.id" in sql
+    assert sql.endswith(
+        "RETURNING user_notifications.user_id, user_notifications.quiz_id"
+    )
+    assert [(user_id, quiz_id)] in compiled.params.values()
+
+
+@pytest.mark.asyncio
+async def test_due_reminders_filter_each_source_by_pairs():
+    user_ids = [uuid.uuid4(), uuid.uuid4()]
+    quiz_id = uuid.uuid4()
+    pairs = [(user_id, quiz_id) for user_id in user_ids]
+
+    query = NotificationRepository._quiz_reminders_insert(pairs)
+
+    params = query.compile(dialect=postgresql.dialect()).params
+    assert list(params.values()).count(pairs) == 2
+    assert list(params.values()).count([quiz_id]) == 2
+
+
+@pytest.mark.asyncio
+async def test_reminder_sweep_filters_both_sources_by_user_range():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(rowcount=4)
+    min_user_id, max_user_id = reminder_shard_range(1, 4)
+
+    created = await NotificationRepository(session).create_quiz_reminders(
+        min_user_id, max_user_id
+    )
+
+    assert created == 4
+    session.commit.assert_awaited_once()
+    (query,) = session.execute.await_args.args
+    compiled = query.compile(dialect=postgresql.dialect())
+    sql = " ".join(str(compiled).split())
+    assert sql.startswith(
+        "INSERT INTO user_notifications (id, user_id, quiz_id, is_read) "
+        "SELECT gen_random_uuid()"
+    )
+    results_branch, rollups_branch = sql.split(" UNION ALL ")
+    assert "FROM results JOIN company_members" in results_branch
+    assert "FROM result_rollups JOIN company_members" in rollups_branch
+    for branch in (results_branch, rollups_branch):
+        assert "company_members.user_id >= %(user_id_" in branch
+        assert "company_members.user_id < %(user_id_" in branch
+    assert "AND result_rollups.detached" in rollups_branch
+    assert list(compiled.params.values()).count(min_user_id) == 2
+    assert list(compiled.params.values()).count(max_user_id) == 2
+
+
+def test_reminders_take_latest_attempt_of_each_pair():
+    query = NotificationRepository._quiz_reminders_insert()
+
+    compiled = query.compile(dialect=postgresql.dialect())
+    sql = " ".join(str(compiled).split())
+    # one DISTINCT ON row per (user, quiz) over both sources
+    assert "SELECT DISTINCT ON (anon_3.user_id, anon_3.quiz_id)" in sql
+    assert "ORDER BY anon_3.user_id, anon_3.quiz_id, anon_3.created_at DESC" in sql
+    assert "GROUP BY" not in sql
+    assert "company_members.user_id >=" not in sql
+    # only overdue pairs, measured from the latest attempt
+    assert (
+        "WHERE anon_1.created_at <= now() - make_interval(%(make_interval_1)s, "
+        "%(make_interval_2)s, %(make_interval_3)s, quizzes.frequency_days)"
+    ) in sql
+
+
+def test_reminders_skip_members_reminded_today():
+    query = NotificationRepository._quiz_reminders_insert()
+
+    compiled = query.compile(dialect=postgresql.dialect())
+    sql = " ".join(str(compiled).split())
+    assert sql.endswith(
+        "AND NOT (EXISTS (SELECT user_notifications.id FROM user_notifications "
+        "WHERE user_notifications.user_id = anon_1.user_id "
+        "AND user_notifications.quiz_id = anon_1.quiz_id "
+        "AND user_notifications.created_at >= date_trunc(%(date_trunc_1)s, now())))"
+    )
+    assert compiled.params["date_trunc_1"] == "day"
@@ -1,9 +1,12 @@
 import uuid
 import pytest
-from unittest.mock import AsyncMock
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.conf.invite import MemberStatus
+from app.conf.notification_template import NotificationTemplate
 from app.services.quiz_service import QuizService
 from app.repository.quizzes_repository import QuizRepository
 from app.repository.company_repository import CompanyRepository
@@ -13,7 +16,9 @@ from app.repository.action_repository import ActionRepository
 from app.schemas.quizzes import (
     QuizSchema,
     QuestionSchema,
+    QuizUpdateSchema,
 )
+from app.utils.quiz_due import DueQuiz
 
 
 @pytest.fixture
@@ -35,6 +40,32 @@ def setup_quiz_service():
     )
 
 
+@pytest.fixture(autouse=True)
+def leaderboard_mock():
+    with patch("app.services.quiz_service.leaderboard", new=AsyncMock()) as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def invalidate_latest_results_mock():
+    with patch(
+        "app.services.quiz_service.invalidate_latest_results", new=AsyncMock()
+    ) as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def quiz_due_index_mock():
+    with patch("app.services.quiz_service.quiz_due_index", new=AsyncMock()) as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def answer_key_cache_mock():
+    with patch("app.services.quiz_service.answer_key_cache", new=AsyncMock()) as mock:
+        yield mock
+
+
 @pytest.mark.asyncio
 async def test_create_quiz_success(setup_quiz_service):
     service = setup_quiz_service
@@ -68,10 +99,17 @@ async def test_create_quiz_success(setup_quiz_service):
     service.company_repository.get_company_member.return_value = member
 
     service.quiz_repository.create_quiz.return_value = None
-    service.notification_repository.create_notifications_for_users.return_value = None
+    service.notification_repository.create_company_notifications.return_value = 3
 
     result = await service.create_quiz(quiz_data, company_id, current_user_id)
 
+    service.notification_repository.create_company_notifications.assert_awaited_once_with(
+        company_id,
+        NotificationTemplate.NEW_QUIZ,
+        {"company_name": "Company Name", "quiz_name": "New Quiz"},
+    )
+    service.company_repository.get_all_company_members.assert_not_awaited()
+
     assert result.name == "New Quiz"
     assert result.description == "Quiz Description"
     assert result.frequency_days == 7
@@ -79,7 +117,12 @@ async def test_create_quiz_success(setup_quiz_service):
 
 
 @pytest.mark.asyncio
-async def test_delete_quiz_success(setup_quiz_service):
+async def test_delete_quiz_success(
+    setup_quiz_service,
+    answer_key_cache_mock,
+    leaderboard_mock,
+    invalidate_latest_results_mock,
+):
     service = setup_quiz_service
     quiz_id = uuid.uuid4()
     current_user_id = uuid.uuid4()
@@ -97,6 +140,81 @@ async def test_delete_quiz_success(setup_quiz_service):
     result = await service.delete_quiz(quiz_id, current_user_id)
 
     assert result.id == quiz_id
+    answer_key_cache_mock.invalidate.assert_awaited_once_with(quiz_id)
+    leaderboard_mock.drop_quiz.assert_awaited_once_with(quiz.company_id, quiz_id)
+    invalidate_latest_results_mock.assert_awaited_once_with(quiz.company_id)
+
+
+@pytest.mark.asyncio
+async def test_update_quiz_frequency_reschedules_members(
+    setup_quiz_service, quiz_due_index_mock
+):
+    service = setup_quiz_service
+    quiz_id = uuid.uuid4()
+    user_id = uuid.uuid4()
+    attempted_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+    quiz = AsyncMock(name="Quiz")
+    quiz.id = quiz_id
+    quiz.name = "Quiz Name"
+    quiz.description = "Quiz Description"
+    quiz.frequency_days = 7
+    quiz.questions = []
+    service.quiz_repository.get_one.return_value = quiz
+    service.quiz_repository.quiz_by_id.return_value = quiz
+    service.quiz_repository.get_latest_attempts.return_value = [(user_id, attempted_at)]
+
+    result = await service.update_quiz(
+        quiz_id, QuizUpdateSchema(id=quiz_id, frequency_days=3), uuid.uuid4()
+    )
+
+    assert result.frequency_days == 3
+    (entries,) = quiz_due_index_mock.schedule.await_args.args
+    assert list(entries) == [
+        DueQuiz(user_id, quiz_id, datetime(2024, 5, 4, tzinfo=timezone.utc).timestamp())
+    ]
+
+
+@pytest.mark.asyncio
+async def test_latest_attempts_include_detached_rollups():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+    quiz_id = uuid.uuid4()
+
+    await QuizRepository(session).get_latest_attempts(quiz_id)
+
+    (query,) = session.execute.await_args.args
+    compiled = query.compile(dialect=postgresql.dialect())
+    sql = " ".join(str(compiled).split())
+    assert sql.startswith("SELECT DISTINCT ON (anon_1.company_member_id)")
+    assert "UNION ALL SELECT result_rollups.company_member_id" in sql
+    assert "AND result_rollups.detached" in sql
+    assert sql.endswith("ORDER BY anon_1.company_member_id, anon_1.created_at DESC")
+    assert list(compiled.params.values()).count(quiz_id) == 2
+
+
+@pytest.mark.asyncio
+async def test_update_quiz_same_frequency_keeps_schedule(
+    setup_quiz_service, quiz_due_index_mock
+):
+    service = setup_quiz_service
+    quiz_id = uuid.uuid4()
+
+    quiz = AsyncMock(name="Quiz")
+    quiz.id = quiz_id
+    quiz.name = "Quiz Name"
+    quiz.description = "Quiz Description"
+    quiz.frequency_days = 7
+    quiz.questions = []
+    service.quiz_repository.get_one.return_value = quiz
+    service.quiz_repository.quiz_by_id.return_value = quiz
+
+    await service.update_quiz(
+        quiz_id, QuizUpdateSchema(id=quiz_id, frequency_days=7), uuid.uuid4()
+    )
+
+    service.quiz_repository.get_latest_attempts.assert_not_awaited()
+    quiz_due_index_mock.schedule.assert_not_awaited()
 
 
 @pytest.mark.asyncio
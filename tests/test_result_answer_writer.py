@@ -0,0 +1,188 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DataError, OperationalError
+
+from app.repository.partition_repository import (
+    PartitionRepository,
+    add_months,
+    partition_name,
+)
+from app.repository.result_answer_repository import (
+    ResultAnswerRecord,
+    ResultAnswerRepository,
+)
+from app.schemas.results import QuizRequest
+from app.utils.result_answer_writer import ResultAnswerWriter
+
+
+def make_record(position):
+    return ResultAnswerRecord(
+        result_id=uuid4(),
+        question_id=uuid4(),
+        created_at=datetime.now(timezone.utc),
+        question_position=position,
+        user_id=uuid4(),
+        company_id=uuid4(),
+        quiz_id=uuid4(),
+        question_text="Q?",
+        user_answer=["a"],
+        is_correct=True,
+    )
+
+
+@pytest.fixture
+def write_mock():
+    with patch.object(ResultAnswerWriter, "_write", new_callable=AsyncMock) as write:
+        yield write
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_in_batches(write_mock):
+    writer = ResultAnswerWriter(batch_size=2, flush_interval=60, max_pending=10)
+    writer.add(make_record(position) for position in range(3))
+
+    await writer.stop()
+
+    batches = [call.args[0] for call in write_mock.await_args_list]
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert [record.question_position for batch in batches for record in batch] == [
+        0,
+        1,
+        2,
+    ]
+    assert len(writer) == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_records(write_mock):
+    writer = ResultAnswerWriter(batch_size=10, flush_interval=60, max_pending=10)
+    write_mock.side_effect = OperationalError("COPY", {}, Exception("down"))
+    writer.add([make_record(1)])
+
+    await writer.stop()
+
+    assert len(writer) == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_is_discarded(write_mock):
+    writer = ResultAnswerWriter(batch_size=1, flush_interval=60, max_pending=10)
+    write_mock.side_effect = [DataError("COPY", {}, Exception("too long")), None]
+    writer.add(make_record(position) for position in range(2))
+
+    await writer.stop()
+
+    (batch,) = write_mock.await_args.args
+    assert [record.question_position for record in batch] == [1]
+    assert len(writer) == 0
+
+
+@pytest.mark.asyncio
+async def test_requeue_counts_dropped_records(write_mock):
+    writer = ResultAnswerWriter(batch_size=2, flush_interval=60, max_pending=5)
+
+    async def fail_after_new_records(batch):
+        if write_mock.await_count == 1:
+            writer.add(make_record(position) for position in range(3, 6))
+            raise OperationalError("COPY", {}, Exception("down"))
+
+    write_mock.side_effect = fail_after_new_records
+    writer.add(make_record(position) for position in range(3))
+
+    with patch("app.utils.write_behind.logger") as logger_mock:
+        await writer.flush()
+
+    assert [record.question_position for record in writer._pending] == [1, 2, 3, 4, 5]
+    logger_mock.warning.assert_called_with("result_answers dropped 1 buffered items")
+
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_pending_records_are_bounded(write_mock):
+    writer = ResultAnswerWriter(batch_size=10, flush_interval=60, max_pending=2)
+    writer.add(make_record(position) for position in range(3))
+
+    assert len(writer) == 2
+
+    await writer.stop()
+
+    (batch,) = write_mock.await_args.args
+    assert [record.question_position for record in batch] == [1, 2]
+
+
+def test_monthly_partition_bounds():
+    month = datetime(2024, 11, 1, tzinfo=timezone.utc)
+
+    assert add_months(month, 2) == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert add_months(month, -11) == datetime(2023, 12, 1, tzinfo=timezone.utc)
+    assert partition_name("result_answers", month) == "result_answers_y2024m11"
+
+
+@pytest.mark.asyncio
+async def test_partition_ddl():
+    session = AsyncMock()
+    repository = PartitionRepository(session)
+    month = datetime(2024, 12, 1, tzinfo=timezone.utc)
+
+    name = await repository.create_partition("result_answers", month)
+    with patch.object(
+        repository,
+        "get_partition_months",
+        AsyncMock(return_value={name: month}),
+    ):
+        detached = await repository.detach_partitions_before(
+            "result_answers", add_months(month, 1)
+        )
+
+    statements = [str(call.args[0]) for call in session.execute.await_args_list]
+    assert statements == [
+        'CREATE TABLE IF NOT EXISTS "result_answers_y2024m12" '
+        'PARTITION OF "result_answers" '
+        "FOR VALUES FROM ('2024-12-01T00:00:00+00:00') "
+        "TO ('2025-01-01T00:00:00+00:00')",
+        'ALTER TABLE "result_answers" DETACH PARTITION "result_answers_y2024m12"',
+    ]
+    assert detached == [name]
+
+
+@pytest.mark.asyncio
+async def test_stream_answers_reads_question_text_snapshot():
+    session = MagicMock()
+    row = MagicMock(question_text="Q?")
+
+    async def rows():
+        yield row
+
+    session.stream = AsyncMock(return_value=rows())
+    company_id = uuid4()
+
+    streamed = [
+        row
+        async for row in ResultAnswerRepository(session).stream_answers(
+            500, company_id=company_id
+        )
+    ]
+
+    assert streamed == [row]
+    (query,) = session.stream.await_args.args
+    compiled = query.compile(dialect=postgresql.dialect())
+    sql = " ".join(str(compiled).split())
+    assert "result_answers.question_text" in sql
+    assert "FROM result_answers WHERE result_answers.company_id =" in sql
+    assert "questions" not in sql
+    assert sql.endswith(
+        "ORDER BY result_answers.created_at, result_answers.result_id, "
+        "result_answers.question_position"
+    )
+    assert company_id in compiled.params.values()
+
+
+def test_quiz_request_rejects_long_answers():
+    with pytest.raises(ValidationError):
+        QuizRequest(answers={uuid4(): ["a" * 256]})
@@ -1,13 +1,37 @@
+import json
 import pytest
-from unittest.mock import AsyncMock
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
+from redis.exceptions import ConnectionError as RedisConnectionError
+
 from app.conf.file_format import FileFormat
-from app.schemas.results import (
-    ResultSchema,
-    QuizRequest,
-)
+from app.conf.time_bucket import TimeBucket
+from app.repository.result_repository import MemberScores
+from app.schemas.results import QuizRequest
+from app.utils.leaderboard import LeaderboardEntry
+from app.utils.quiz_due import DueQuiz
 from app.services.result_service import ResultService
+from app.utils.answer_key_cache import (
+    ANSWER_KEY_CACHE_NAME,
+    AnswerKeyCache,
+    compile_answer_key,
+)
+from app.utils.answer_detail_codec import decode_answer_detail, encode_answer_detail
+from app.utils.cache_invalidation import CacheInvalidation
+from app.utils.two_tier_cache import CacheLookup
+from app.utils.export_data import export_redis_index
+from app.utils.redis_keys import (
+    LATEST_RESULT_COMPLETE_FIELD,
+    answer_key_key,
+    cache_version_key,
+    company_analytics_key,
+    company_index_key,
+    quiz_index_key,
+    quiz_result_key,
+    user_index_key,
+)
 from app.exept.custom_exceptions import (
     NotFound,
     NotPermission,
@@ -15,6 +39,63 @@ from app.exept.custom_exceptions import (
 )
 
 
+@pytest.fixture(autouse=True)
+def redis_mock():
+    with patch("app.services.result_service.redis_service") as redis_service:
+        redis_service.redis_get = AsyncMock(return_value=None)
+        redis_service.redis_set = AsyncMock()
+        redis_service.redis_delete = AsyncMock()
+        redis_service.redis_hset_keep_ttl = AsyncMock()
+        redis_service.redis_hset_missing = AsyncMock(
+            side_effect=lambda key, mapping, expiration: dict(mapping)
+        )
+        redis_service.redis_hgetall = AsyncMock(return_value={})
+        redis_service.redis_pipeline.return_value.__aenter__.return_value = AsyncMock()
+        yield redis_service
+
+
+@pytest.fixture(autouse=True)
+def result_answer_writer_mock():
+    with patch(
+        "app.services.result_service.result_answer_writer"
+    ) as result_answer_writer:
+        yield result_answer_writer
+
+
+@pytest.fixture(autouse=True)
+def answer_detail_buffer_mock():
+    with patch(
+        "app.services.result_service.answer_detail_buffer"
+    ) as answer_detail_buffer:
+        yield answer_detail_buffer
+
+
+@pytest.fixture(autouse=True)
+def leaderboard_mock():
+    with patch(
+        "app.services.result_service.leaderboard", new=AsyncMock()
+    ) as leaderboard:
+        leaderboard.exists.return_value = True
+        yield leaderboard
+
+
+@pytest.fixture(autouse=True)
+def quiz_due_index_mock():
+    with patch(
+        "app.services.result_service.quiz_due_index", new=AsyncMock()
+    ) as quiz_due_index:
+        yield quiz_due_index
+
+
+@pytest.fixture(autouse=True)
+def answer_key_cache_mock():
+    with patch(
+        "app.services.result_service.answer_key_cache", new=AsyncMock()
+    ) as answer_key_cache:
+        answer_key_cache.get.return_value = CacheLookup(None, None, 0)
+        yield answer_key_cache
+
+
 @pytest.fixture
 def setup_result_service():
     session = AsyncMock()
@@ -32,33 +113,44 @@ def setup_result_service():
 
 
 @pytest.mark.asyncio
-async def test_get_global_rating_success(setup_result_service):
+async def test_get_global_rating_success(setup_result_service, redis_mock):
     service = setup_result_service
     current_user_id = uuid4()
 
-    members = [AsyncMock(id=uuid4()), AsyncMock(id=uuid4())]
-    service.user_repository.get_company_members_by_user_id.return_value = members
-
-    results = [
-        ResultSchema(
-            company_member_id=members[0].id,
-            quiz_id=uuid4(),
-            score=0.75,
-            total_questions=10,
-            correct_answers=7,
-        ),
-        ResultSchema(
-            company_member_id=members[1].id,
-            quiz_id=uuid4(),
-            score=0.85,
-            total_questions=10,
-            correct_answers=8,
-        ),
-    ]
-    service.result_repository.get_many.side_effect = [results, results]
+    service.result_repository.get_global_rating.return_value = 0.8049
 
     global_rating = await service.get_global_rating(current_user_id)
     assert global_rating == 0.80
+    service.result_repository.get_global_rating.assert_awaited_once_with(
+        current_user_id
+    )
+    redis_mock.redis_set.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_global_rating_cached(setup_result_service, redis_mock):
+    service = setup_result_service
+    redis_mock.redis_get.return_value = "0.75"
+
+    global_rating = await service.get_global_rating(uuid4())
+    assert global_rating == 0.75
+    service.result_repository.get_global_rating.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_company_rating_success(setup_result_service):
+    service = setup_result_service
+    company_id = uuid4()
+    current_user_id = uuid4()
+
+    service.company_repository.get_one.return_value = AsyncMock(id=company_id)
+    service.company_repository.get_company_member.return_value = AsyncMock(id=uuid4())
+    service.result_repository.get_member_rating.return_value = 0.666
+
+    rating = await service.get_company_rating(
+        current_user_id, company_id, use_cache=False
+    )
+    assert rating == 0.67
 
 
 @pytest.mark.asyncio
@@ -86,18 +178,107 @@ async def test_create_result_permission_denied(setup_result_service):
     current_user_id = uuid4()
     quiz_request = QuizRequest(answers={uuid4(): ["answer"]})
 
-    quiz = AsyncMock()
-    quiz.company_id = uuid4()
+    service.quiz_repository.get_quiz_for_member.return_value = MagicMock(
+        id=quiz_id, company_id=uuid4(), company_member_id=None
+    )
+
+    with pytest.raises(NotPermission):
+        await service.create_result(quiz_id, current_user_id, quiz_request)
+    service.quiz_repository.get_questions_by_quiz_id.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_result_updates_ratings_and_index(
+    setup_result_service,
+    redis_mock,
+    result_answer_writer_mock,
+    answer_detail_buffer_mock,
+    leaderboard_mock,
+    quiz_due_index_mock,
+):
+    service = setup_result_service
+    quiz_id = uuid4()
+    current_user_id = uuid4()
+    question_id = uuid4()
+    quiz_request = QuizRequest(answers={question_id: ["answer"]})
+
+    member = AsyncMock(id=uuid4())
+    quiz = MagicMock(
+        id=quiz_id, company_id=uuid4(), company_member_id=member.id, frequency_days=7
+    )
     questions = [
-        AsyncMock(id=uuid4(), question_text="What?", correct_answer=["answer"])
+        AsyncMock(
+            id=question_id,
+            question_text="What?",
+            correct_answer=["answer"],
+            answer_options=["answer", "other"],
+        )
     ]
-
-    service.quiz_repository.get_one.return_value = quiz
+    result_id = uuid4()
+    service.quiz_repository.get_quiz_for_member.return_value = quiz
     service.quiz_repository.get_questions_by_quiz_id.return_value = questions
-    service.company_repository.get_company_member.return_value = None
+    service.result_repository.create_result.return_value = (
+        MagicMock(
+            id=result_id,
+            company_member_id=member.id,
+            quiz_id=quiz_id,
+            created_at=datetime(2024, 5, 1, tzinfo=timezone.utc),
+            score=1.0,
+            total_questions=1,
+            correct_answers=1,
+        ),
+        MemberScores(company_score=0.75, quiz_score=1.0),
+    )
 
-    with pytest.raises(NotPermission):
-        await service.create_result(quiz_id, current_user_id, quiz_request)
+    result = await service.create_result(quiz_id, current_user_id, quiz_request)
+
+    assert result.score == 1.0
+    service.result_repository.create_result.assert_awaited_once()
+    service.result_repository.create_one.assert_not_awaited()
+    (records,) = result_answer_writer_mock.add.call_args.args
+    (record,) = list(records)
+    assert record.question_id == question_id
+    assert record.question_text == "What?"
+    assert record.user_answer == ["answer"]
+    assert record.is_correct is True
+    ((indexed_record,),) = answer_detail_buffer_mock.add.call_args.args
+    assert indexed_record.key == quiz_result_key(
+        current_user_id, quiz.company_id, quiz_id, result_id
+    )
+    assert indexed_record.index_keys == [
+        company_index_key(quiz.company_id),
+        user_index_key(current_user_id),
+        quiz_index_key(quiz_id),
+    ]
+    detail = decode_answer_detail(
+        indexed_record.key,
+        indexed_record.serialized_result,
+        compile_answer_key(questions),
+    )
+    assert detail["questions"] == [
+        {"question": "What?", "user_answer": ["answer"], "is_correct": True}
+    ]
+    redis_mock.redis_delete.assert_awaited_once()
+    deleted_keys = redis_mock.redis_delete.await_args.args
+    assert company_analytics_key(quiz.company_id, "week") in deleted_keys
+    pipe = redis_mock.redis_pipeline.return_value.__aenter__.return_value
+    assert redis_mock.redis_delete.await_args.kwargs["pipe"] is pipe
+    leaderboard_mock.record.assert_awaited_once_with(
+        quiz.company_id, quiz_id, current_user_id, 0.75, 1.0, pipe=pipe
+    )
+    redis_mock.redis_hset_keep_ttl.assert_awaited_once()
+    assert redis_mock.redis_hset_keep_ttl.await_args.kwargs["pipe"] is pipe
+    pipe.execute.assert_awaited_once()
+    quiz_due_index_mock.schedule.assert_awaited_once_with(
+        [
+            DueQuiz(
+                current_user_id,
+                quiz_id,
+                datetime(2024, 5, 8, tzinfo=timezone.utc).timestamp(),
+            )
+        ],
+        pipe=pipe,
+    )
 
 
 @pytest.mark.asyncio
@@ -112,7 +293,7 @@ async def test_get_company_rating_no_results(setup_result_service):
     member = AsyncMock(id=uuid4())
     service.company_repository.get_company_member.return_value = member
 
-    service.result_repository.get_many.return_value = []
+    service.result_repository.get_member_rating.return_value = None
 
     with pytest.raises(NotFound):
         await service.get_company_rating(current_user_id, company_id)
@@ -123,10 +304,7 @@ async def test_get_global_rating_no_results(setup_result_service):
     service = setup_result_service
     current_user_id = uuid4()
 
-    members = [AsyncMock(id=uuid4()), AsyncMock(id=uuid4())]
-    service.user_repository.get_company_members_by_user_id.return_value = members
-
-    service.result_repository.get_many.side_effect = [[], []]
+    service.result_repository.get_global_rating.return_value = None
 
     with pytest.raises(NotFound):
         await service.get_global_rating(current_user_id)
@@ -171,7 +349,402 @@ async def test_my_quiz_results_empty(setup_result_service):
     member = AsyncMock(id=uuid4())
     service.company_repository.get_company_member.return_value = member
 
-    service.result_repository.get_many.return_value = []
+    service.result_repository.get_cumulative_scores.return_value = []
 
     result_data = await service.my_quiz_results(current_user_id, quiz_id)
     assert result_data.data == {}
+
+
+@pytest.mark.asyncio
+async def test_my_quiz_results_chart(setup_result_service):
+    service = setup_result_service
+    quiz = AsyncMock()
+    quiz.company_id = uuid4()
+    service.quiz_repository.get_one.return_value = quiz
+
+    member = AsyncMock(id=uuid4())
+    service.company_repository.get_company_member.return_value = member
+
+    first, second = datetime(2024, 1, 1), datetime(2024, 1, 2)
+    service.result_repository.get_cumulative_scores.return_value = [
+        MagicMock(created_at=first, score=0.5),
+        MagicMock(created_at=second, score=0.6666),
+    ]
+
+    result_data = await service.my_quiz_results(uuid4(), uuid4(), points=2)
+    assert result_data.data == {first: 0.5, second: 0.67}
+    assert (
+        service.result_repository.get_cumulative_scores.await_args.kwargs["points"] == 2
+    )
+
+
+def export_repository_mock(rows):
+    async def stream_answers(*args):
+        for row in rows:
+            yield row
+
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__ = AsyncMock()
+    session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    repository = MagicMock()
+    repository.return_value.stream_answers = MagicMock(side_effect=stream_answers)
+
+    return (
+        patch("app.utils.export_data.async_session", session_factory),
+        patch("app.utils.export_data.ResultAnswerRepository", repository),
+        repository,
+    )
+
+
+@pytest.mark.asyncio
+async def test_company_answers_list_groups_answers_by_result(setup_result_service):
+    service = setup_result_service
+    company_id = uuid4()
+    current_user_id = uuid4()
+
+    service.company_repository.get_one.return_value = AsyncMock(id=company_id)
+    service.company_repository.is_user_company_owner.return_value = True
+
+    user_id, quiz_id = uuid4(), uuid4()
+    first_result, second_result = uuid4(), uuid4()
+    rows = [
+        MagicMock(
+            result_id=result_id,
+            user_id=user_id,
+            company_id=company_id,
+            quiz_id=quiz_id,
+            question_text=question_text,
+            user_answer=["a"],
+            is_correct=True,
+        )
+        for result_id, question_text in [
+            (first_result, "Q1?"),
+            (first_result, "Q2?"),
+            (second_result, "Q1?"),
+        ]
+    ]
+
+    session_patch, repository_patch, repository = export_repository_mock(rows)
+    with session_patch, repository_patch:
+        response = await service.company_answers_list(
+            company_id, FileFormat.JSON, current_user_id
+        )
+        body = "".join([chunk async for chunk in response.body_iterator])
+
+    records = json.loads(body)
+    assert [len(record["questions"]) for record in records] == [2, 1]
+    assert records[0]["questions"][1] == {
+        "question": "Q2?",
+        "user_answer": ["a"],
+        "is_correct": True,
+    }
+    assert repository.return_value.stream_answers.call_args.args[1:3] == (
+        company_id,
+        None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_user_answers_list_filters_by_user_and_company(setup_result_service):
+    service = setup_result_service
+    company_id = uuid4()
+    user_id = uuid4()
+    current_user_id = uuid4()
+
+    service.company_repository.get_one.return_value = AsyncMock(id=company_id)
+    service.company_repository.is_user_company_owner.return_value = True
+    service.user_repository.get_one.return_value = AsyncMock(id=user_id)
+
+    session_patch, repository_patch, repository = export_repository_mock([])
+    with session_patch, repository_patch:
+        response = await service.user_answers_list(
+            company_id, user_id, FileFormat.CSV, current_user_id
+        )
+        body = "".join([chunk async for chunk in response.body_iterator])
+
+    assert repository.return_value.stream_answers.call_args.args[1:3] == (
+        company_id,
+        user_id,
+    )
+    assert body.startswith("user_id,company_id,quiz_id")
+
+
+@pytest.mark.asyncio
+async def test_export_redis_index_streams_index_batches():
+    company_id, user_id, quiz_id = uuid4(), uuid4(), uuid4()
+    questions = [
+        MagicMock(
+            id=uuid4(),
+            question_text="Q?",
+            correct_answer=["a"],
+            answer_options=["a", "b"],
+        )
+    ]
+    answer_key = compile_answer_key(questions)
+    encoded = encode_answer_detail(answer_key, {questions[0].id: ["a"]}, [True])
+    keys = [quiz_result_key(user_id, company_id, quiz_id, uuid4()) for _ in range(3)]
+    record = {
+        "user_id": str(user_id),
+        "company_id": str(company_id),
+        "quiz_id": str(quiz_id),
+        "questions": [{"question": "Q?", "user_answer": ["a"], "is_correct": True}],
+    }
+
+    async def zrange(index_key, min_score, max_score, count):
+        assert index_key == company_index_key(company_id)
+        yield keys[:2]
+        yield keys[2:]
+
+    load_answer_key = AsyncMock(return_value=answer_key)
+    with patch("app.utils.export_data.redis_service") as redis_service:
+        redis_service.redis_zrange_by_score = zrange
+        redis_service.redis_mget_raw = AsyncMock(
+            side_effect=[[encoded, None], [json.dumps(record).encode()]]
+        )
+        response = await export_redis_index(
+            company_index_key(company_id), FileFormat.JSON, load_answer_key
+        )
+        body = "".join([chunk async for chunk in response.body_iterator])
+
+    assert json.loads(body) == [record, record]
+    assert redis_service.redis_mget_raw.await_count == 2
+    load_answer_key.assert_awaited_once_with(quiz_id)
+
+
+@pytest.mark.asyncio
+async def test_company_members_results_bucketed(setup_result_service, redis_mock):
+    service = setup_result_service
+    company_id = uuid4()
+    user_id = uuid4()
+    service.company_repository.is_user_company_owner.return_value = True
+
+    day = datetime(2024, 1, 1)
+    service.result_repository.get_company_bucketed_scores.return_value = [
+        MagicMock(user_id=user_id, bucket=day, average_score=0.6666),
+    ]
+
+    result_data = await service.company_members_results(
+        uuid4(), company_id, bucket=TimeBucket.WEEK
+    )
+    assert result_data.data == {str(user_id): {day: 0.67}}
+    service.result_repository.get_company_bucketed_scores.assert_awaited_once_with(
+        company_id, "week"
+    )
+    assert redis_mock.redis_set.await_args.args[0] == company_analytics_key(
+        company_id, "week"
+    )
+
+
+@pytest.mark.asyncio
+async def test_company_members_results_cached(setup_result_service, redis_mock):
+    service = setup_result_service
+    service.company_repository.is_user_company_owner.return_value = True
+    redis_mock.redis_get.return_value = (
+        '{"data": {"member": {"2024-01-01T00:00:00": 0.5}}}'
+    )
+
+    result_data = await service.company_members_results(uuid4(), uuid4())
+    assert result_data.data == {"member": {datetime(2024, 1, 1): 0.5}}
+    service.result_repository.get_company_bucketed_scores.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_company_members_result_last_rebuilds_cache(
+    setup_result_service, redis_mock
+):
+    service = setup_result_service
+    company_id = uuid4()
+    member_id, quiz_id = uuid4(), uuid4()
+    other_quiz_id = uuid4()
+    created_at = datetime(2024, 1, 1)
+    newer_created_at = datetime(2024, 1, 2)
+    service.company_repository.is_user_company_owner.return_value = True
+    # written by a concurrent create_result, newer than the database snapshot
+    partial = {
+        f"{member_id}:{quiz_id}": newer_created_at.isoformat(),
+        f"{member_id}:{other_quiz_id}": created_at.isoformat(),
+    }
+    redis_mock.redis_hgetall.return_value = dict(partial)
+    redis_mock.redis_hset_missing.side_effect = lambda key, mapping, expiration: {
+        **mapping,
+        **partial,
+    }
+    service.result_repository.get_latest_results_for_company.return_value = [
+        MagicMock(company_member_id=member_id, quiz_id=quiz_id, created_at=created_at)
+    ]
+
+    result_data = await service.company_members_result_last(company_id, uuid4())
+    assert result_data.data == {
+        member_id: {quiz_id: newer_created_at, other_quiz_id: created_at}
+    }
+    mapping = redis_mock.redis_hset_missing.await_args.args[1]
+    assert mapping[LATEST_RESULT_COMPLETE_FIELD] == 1
+
+
+@pytest.mark.asyncio
+async def test_company_members_result_last_cached(setup_result_service, redis_mock):
+    service = setup_result_service
+    member_id, quiz_id = uuid4(), uuid4()
+    service.company_repository.is_user_company_owner.return_value = True
+    redis_mock.redis_hgetall.return_value = {
+        LATEST_RESULT_COMPLETE_FIELD: "1",
+        f"{member_id}:{quiz_id}": "2024-01-01T00:00:00",
+    }
+
+    result_data = await service.company_members_result_last(uuid4(), uuid4())
+    assert result_data.data == {member_id: {quiz_id: datetime(2024, 1, 1)}}
+    service.result_repository.get_latest_results_for_company.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_result_uses_cached_answer_key(
+    setup_result_service, answer_key_cache_mock
+):
+    service = setup_result_service
+    quiz_id = uuid4()
+    first_question, second_question = uuid4(), uuid4()
+    answer_key = compile_answer_key(
+        [
+            MagicMock(id=first_question, question_text="A?", correct_answer=["a", "b"]),
+            MagicMock(id=second_question, question_text="B?", correct_answer=["c"]),
+        ]
+    )
+    answer_key_cache_mock.get.return_value = CacheLookup(answer_key, None, 0)
+    service.quiz_repository.get_quiz_for_member.return_value = MagicMock(
+        id=quiz_id, company_id=uuid4(), company_member_id=uuid4(), frequency_days=1
+    )
+    service.result_repository.create_result.side_effect = lambda data: (
+        MagicMock(id=uuid4(), created_at=datetime.now(timezone.utc), **data),
+        MemberScores(company_score=0.5, quiz_score=0.5),
+    )
+    quiz_request = QuizRequest(answers={first_question: ["b", "a"]})
+
+    result = await service.create_result(quiz_id, uuid4(), quiz_request)
+
+    assert result.correct_answers == 1
+    assert result.total_questions == 2
+    service.quiz_repository.get_questions_by_quiz_id.assert_not_awaited()
+    answer_key_cache_mock.set.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_result_survives_redis_outage(
+    setup_result_service, redis_mock, result_answer_writer_mock
+):
+    service = setup_result_service
+    quiz_id = uuid4()
+    service.quiz_repository.get_quiz_for_member.return_value = MagicMock(
+        id=quiz_id, company_id=uuid4(), company_member_id=uuid4(), frequency_days=1
+    )
+    service.quiz_repository.get_questions_by_quiz_id.return_value = [
+        MagicMock(id=uuid4(), question_text="A?", correct_answer=["a"])
+    ]
+    service.result_repository.create_result.side_effect = lambda data: (
+        MagicMock(id=uuid4(), created_at=datetime.now(timezone.utc), **data),
+        MemberScores(company_score=0.5, quiz_score=0.5),
+    )
+    pipe = redis_mock.redis_pipeline.return_value.__aenter__.return_value
+    pipe.execute.side_effect = RedisConnectionError()
+
+    result = await service.create_result(quiz_id, uuid4(), QuizRequest(answers={}))
+
+    assert result.total_questions == 1
+    result_answer_writer_mock.add.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_top_rebuilds_missing_board(
+    setup_result_service, leaderboard_mock
+):
+    service = setup_result_service
+    company_id = uuid4()
+    first_user, second_user = uuid4(), uuid4()
+    service.company_repository.get_one.return_value = AsyncMock(id=company_id)
+    leaderboard_mock.exists.return_value = False
+    service.result_repository.get_leaderboard_scores.return_value = [
+        MagicMock(user_id=first_user, score=0.9),
+        MagicMock(user_id=second_user, score=0.456),
+    ]
+    leaderboard_mock.top.return_value = [
+        LeaderboardEntry(first_user, 1, 0.9),
+        LeaderboardEntry(second_user, 2, 0.456),
+    ]
+    leaderboard_mock.size.return_value = 2
+
+    result = await service.leaderboard_top(uuid4(), company_id, limit=2)
+
+    leaderboard_mock.replace.assert_awaited_once_with(
+        company_id, None, {first_user: 0.9, second_user: 0.456}
+    )
+    leaderboard_mock.top.assert_awaited_once_with(company_id, None, 2)
+    assert result.total == 2
+    assert [entry.rank for entry in result.entries] == [1, 2]
+    assert result.entries[1].score == 0.46
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_rejects_quiz_of_other_company(
+    setup_result_service, leaderboard_mock
+):
+    service = setup_result_service
+    company_id = uuid4()
+    service.company_repository.get_one.return_value = AsyncMock(id=company_id)
+    service.quiz_repository.get_one.return_value = MagicMock(company_id=uuid4())
+
+    with pytest.raises(NotFound):
+        await service.leaderboard_top(uuid4(), company_id, quiz_id=uuid4())
+    leaderboard_mock.top.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_member_rank_not_ranked(
+    setup_result_service, leaderboard_mock
+):
+    service = setup_result_service
+    company_id = uuid4()
+    service.company_repository.get_one.return_value = AsyncMock(id=company_id)
+    leaderboard_mock.rank.return_value = None
+
+    with pytest.raises(NotFound):
+        await service.leaderboard_member_rank(uuid4(), company_id, uuid4())
+
+
+@pytest.mark.asyncio
+async def test_answer_key_cache_evicted_by_other_worker():
+    invalidation = CacheInvalidation()
+    invalidation.is_listening = True
+    cache = AnswerKeyCache(max_size=8, local_ttl=60, ttl=60)
+    invalidation.register(ANSWER_KEY_CACHE_NAME, cache)
+    quiz_id = uuid4()
+    answer_key = compile_answer_key(
+        [MagicMock(id=uuid4(), question_text="A?", correct_answer=["a"])]
+    )
+
+    with patch("app.utils.two_tier_cache.cache_invalidation", invalidation), patch(
+        "app.utils.two_tier_cache.redis_service"
+    ) as redis_service:
+        redis_service.redis_set_if_version = AsyncMock(return_value=True)
+        redis_service.redis_mget = AsyncMock(return_value=[None, None])
+        await cache.set(quiz_id, answer_key, await cache.get(quiz_id))
+        assert (await cache.get(quiz_id)).value == answer_key
+
+        invalidation._evict(f"{ANSWER_KEY_CACHE_NAME}:{quiz_id}")
+
+        assert (await cache.get(quiz_id)).value is None
+
+
+@pytest.mark.asyncio
+async def test_answer_key_cache_invalidate_publishes():
+    cache = AnswerKeyCache(max_size=8, local_ttl=60, ttl=60)
+    quiz_id = uuid4()
+
+    with patch(
+        "app.utils.two_tier_cache.cache_invalidation", new=AsyncMock()
+    ) as invalidation, patch("app.utils.two_tier_cache.redis_service") as redis:
+        redis.redis_delete_versioned = AsyncMock()
+        await cache.invalidate(quiz_id)
+
+    redis.redis_delete_versioned.assert_awaited_once_with(
+        answer_key_key(quiz_id), cache_version_key(answer_key_key(quiz_id)), 60
+    )
+    invalidation.publish.assert_awaited_once_with(ANSWER_KEY_CACHE_NAME, str(quiz_id))
@@ -1,10 +1,17 @@
 import pytest
-from unittest.mock import AsyncMock
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
 from app.schemas.users import UserSchema, UserUpdateRequest, BaseUserSchema
 from app.services.user_service import UserService
-from app.exept.custom_exceptions import UserNotFound, UserAlreadyExists, NotPermission
+from app.exept.custom_exceptions import (
+    UserNotFound,
+    UserAlreadyExists,
+    NotPermission,
+    BadRequest,
+)
+from app.utils.pagination import encode_cursor, decode_cursor
 
 
 @pytest.fixture
@@ -14,6 +21,12 @@ def user_service():
     return UserService(session=session, repository=repository)
 
 
+@pytest.fixture(autouse=True)
+def user_cache_mock():
+    with patch("app.services.user_service.user_cache", new=AsyncMock()) as mock:
+        yield mock
+
+
 @pytest.mark.asyncio
 async def test_get_users_success(user_service):
     user_service.repository.get_many.return_value = [
@@ -34,6 +47,42 @@ async def test_get_users_success(user_service):
     assert len(users) == 2
 
 
+@pytest.mark.asyncio
+async def test_get_users_page_success(user_service):
+    user = UserSchema(
+        id=uuid4(),
+        email="testuser1@example.com",
+        username="testuser1",
+        password="testpassword1",
+    )
+    user_service.repository.get_page.return_value = ([user], None)
+
+    users, next_cursor = await user_service.get_users_page(cursor="", limit=10)
+
+    assert [u.id for u in users] == [user.id]
+    assert next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_get_total_count_uses_cached_count(user_service):
+    user_service.repository.get_cached_count.return_value = 42
+
+    assert await user_service.get_total_count() == 42
+    user_service.repository.get_count.assert_not_awaited()
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 8, 1, 12, 30, tzinfo=timezone.utc)
+    row_id = uuid4()
+
+    assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+
+def test_decode_cursor_invalid():
+    with pytest.raises(BadRequest):
+        decode_cursor("not-a-cursor")
+
+
 @pytest.mark.asyncio
 async def test_get_user_by_id_success(user_service):
     user_id = uuid4()
@@ -146,7 +195,7 @@ async def test_update_user_username_already_exists(user_service):
 
 
 @pytest.mark.asyncio
-async def test_delete_user_success(user_service):
+async def test_delete_user_success(user_service, user_cache_mock):
     user_id = uuid4()
     current_user = UserSchema(
         id=user_id,
@@ -164,6 +213,7 @@ async def test_delete_user_success(user_service):
 
     deleted_user = await user_service.delete_user(user_id, current_user)
     assert deleted_user.id == user_id
+    user_cache_mock.invalidate.assert_awaited_once_with("testuser@example.com")
 
 
 @pytest.mark.asyncio